@@ -11,12 +11,15 @@ import webbrowser
 import time
 from utils.function import (
     CONFIG_PATH,
+    MASTER_DB_PATH,
     MASTER_JSON_PATH,
+    SYNC_STATE_PATH,
     TYPE_MAP_PATH,
     ensure_config_exists,
+    get_user_hub_codes,
+    invalidate_json_cache,
     load_config,
     load_constants,
-    load_master_data, # DITAMBAHKAN: Perlu load master data
     resource_path,
     save_json_data,
     show_error_message,
@@ -40,6 +43,7 @@ from modules.Auto_Routing_Summary.apps import main as auto_routing_summary_main
 from modules.Vehicles_Data.apps import main as vehicles_data_main
 from modules.Routing_Transaction.apps import main as routing_transaction_main
 from modules.Estimasi_Delivery import apps as estimasi_delivery_app 
+from modules.Multi_Hub.apps import main as multi_hub_main
 
 ensure_config_exists()
 # ==============================================================================
@@ -56,14 +60,20 @@ USER_GUIDE_PLANNER = CONSTANTS.get('guide_planner', '')
 USER_GUIDE_DRIVER = CONSTANTS.get('guide_driver', '')
 
 def reset_config_and_exit():
-    """Menghapus config.json, master.json, dan type_map agar setup wajib diulang, lalu keluar aplikasi."""
+    """Menghapus config.json, master store (master.db dan JSON lama), type_map, dan sync_state agar setup wajib diulang, lalu keluar aplikasi."""
     try:
         if os.path.exists(CONFIG_PATH):
             os.remove(CONFIG_PATH)
+        # JSON lama ikut dihapus agar tidak dimigrasi ulang ke master.db
+        if os.path.exists(MASTER_DB_PATH):
+            os.remove(MASTER_DB_PATH)
         if os.path.exists(MASTER_JSON_PATH):
             os.remove(MASTER_JSON_PATH)
         if os.path.exists(TYPE_MAP_PATH):
             os.remove(TYPE_MAP_PATH)
+        if os.path.exists(SYNC_STATE_PATH):
+            os.remove(SYNC_STATE_PATH)
+        invalidate_json_cache()
         show_error_message("Setup Tidak Lengkap", ERROR_MESSAGES["SETUP_CANCELED"])
         on_closing()
     except Exception:
@@ -103,6 +113,7 @@ def toggle_main_controls(is_enabled: bool):
     laporan_menu.entryconfig("Delivery Summary", state=state)
     laporan_menu.entryconfig("Routing Transaction", state=state)
     laporan_menu.entryconfig("Data Kendaraan", state=state)
+    laporan_menu.entryconfig("Semua Hub Saya", state=state)
     
     # Menambahkan Estimasi Delivery ke kontrol
     try:
@@ -128,30 +139,12 @@ def get_available_locations(is_initial_setup: bool):
         return location_id
     else:
         # 2. Jika ganti lokasi, batasi berdasarkan hub_id di config.json
-        config_data = load_config()
-        master_data = load_master_data()
-
-        # Fallback: Jika config hilang atau tidak ada data user/master, kembali ke mode awal
-        if not config_data or not config_data.get('user_checked') or not master_data:
-            return location_id 
-
-        # A. Ambil ID Mongo yang diizinkan dari config.json
-        user_hub_ids_mongo = config_data.get('user_checked', {}).get('hub_id', [])
-        hub_ids_map = master_data.get('hub_ids', {}) # {kode_lokasi: id_mongo}
-        
-        allowed_kode_lokasi = set()
-        
-        # B. Ubah ID Mongo menjadi Kode Lokasi (plck, pldm, dll.) menggunakan master.json
-        # Map: id_mongo -> kode_lokasi (dibalik dari hub_ids_map)
-        mongo_id_to_kode = {v: k for k, v in hub_ids_map.items()}
-        
-        for mongo_id in user_hub_ids_mongo:
-            if mongo_id in mongo_id_to_kode:
-                allowed_kode_lokasi.add(mongo_id_to_kode[mongo_id])
+        #    (ID Mongo -> kode lokasi lewat master.db, lihat get_user_hub_codes)
+        allowed_kode_lokasi = set(get_user_hub_codes())
         
         allowed_locations = {}
         
-        # C. Ubah Kode Lokasi menjadi Nama Tampilan (Cikarang, Daan Mogot) menggunakan constant.json
+        # Ubah Kode Lokasi menjadi Nama Tampilan (Cikarang, Daan Mogot) menggunakan constant.json
         for display_name, kode_lokasi in location_id.items():
             if kode_lokasi in allowed_kode_lokasi:
                 allowed_locations[display_name] = kode_lokasi
@@ -201,7 +194,7 @@ def pilih_lokasi(parent_window, initial_setup=False):
             config_data['lokasi'] = kode
             save_json_data(config_data, CONFIG_PATH)
             dialog.destroy()
-            sync_data_main(reset_config_and_exit)
+            sync_data_main(reset_config_and_exit, full_resync=True)
 
     # --- Tambahkan handler close ---
     def on_cancel():
@@ -371,8 +364,9 @@ def atur_visibilitas_menu(menu_bar):
         pass
 
 
-def run_sync_in_background(root_window):
-    """Menjalankan proses sinkronisasi hub dan driver di background thread."""
+def run_sync_in_background(root_window, full_resync=False):
+    """Menjalankan proses sinkronisasi hub dan driver di background thread.
+    full_resync=True mengabaikan high-water mark dan mengambil ulang semua data."""
     loading_window = tk.Toplevel(root_window)
     loading_window.title("Sinkronisasi")
     loading_window.geometry("300x120")
@@ -426,7 +420,7 @@ def run_sync_in_background(root_window):
 
     def thread_target():
         try:
-            sync_data_main(reset_config_and_exit) 
+            sync_data_main(reset_config_and_exit, full_resync=full_resync)
         finally:
             root_window.after(0, on_sync_complete)
             
@@ -456,11 +450,17 @@ laporan_menu.add_separator()
 laporan_menu.add_command(label="Routing Transaction", command=routing_transaction_main) 
 laporan_menu.add_command(label="Estimasi Delivery", command=estimasi_delivery_app.main)
 laporan_menu.add_command(label="Data Kendaraan", command=vehicles_data_main)
+laporan_menu.add_separator()
+semua_hub_menu = tk.Menu(laporan_menu, tearoff=0)
+semua_hub_menu.add_command(label="Routing Summary", command=lambda: multi_hub_main("routing-summary", "Routing Summary"))
+semua_hub_menu.add_command(label="Delivery Summary", command=lambda: multi_hub_main("delivery-summary", "Delivery Summary"))
+semua_hub_menu.add_command(label="Start-Finish Time", command=lambda: multi_hub_main("start-finish-time", "Start-Finish Time"))
+laporan_menu.add_cascade(label="Semua Hub Saya", menu=semua_hub_menu)
 menu_bar.add_cascade(label="Laporan", menu=laporan_menu)
 
 konfigurasi_menu = tk.Menu(menu_bar, tearoff=0)
 konfigurasi_menu.add_command(label="Ganti Lokasi Cabang", command=ganti_lokasi)
-konfigurasi_menu.add_command(label="Sinkronisasi Data", command=lambda: run_sync_in_background(root))
+konfigurasi_menu.add_command(label="Sinkronisasi Data", command=lambda: run_sync_in_background(root, full_resync=True))
 menu_bar.add_cascade(label="Konfigurasi", menu=konfigurasi_menu)
 
 def show_about():
@@ -0,0 +1,233 @@
+# cli.py
+"""
+Menjalankan laporan tanpa GUI (tanpa Tk sama sekali), mis. untuk membuat
+laporan semua cabang secara terjadwal di server.
+
+Contoh:
+    python cli.py delivery-summary --date 2024-05-02 --output-dir hasil
+    python cli.py routing-summary --lokasi all --date 2024-05-01..2024-05-04 --output-dir hasil
+    python cli.py delivery-summary-upload --input export_task.xlsx --lokasi plck
+    python cli.py delivery-summary-rekap --date 2024-05-01..2024-05-31 --output-dir hasil
+    python cli.py start-finish-time --lokasi all --gabung --date 2024-05-02
+    python cli.py delivery-summary --offline --date 2024-04-01..2024-04-30
+    python cli.py --list
+
+Tanggal boleh YYYY-MM-DD atau DD-MM-YYYY; rentang ditulis AWAL..AKHIR
+(inklusif). --lokasi menerima satu atau beberapa kode cabang, atau "all"
+untuk semua kode di constant.json; tanpa --lokasi dipakai config.json.
+--gabung (routing-summary, delivery-summary, start-finish-time) mengambil
+semua cabang secara paralel lalu menulis satu workbook per tanggal berisi
+sheet Konsolidasi dan satu sheet per cabang (lihat utils.multi_hub).
+--offline membuat laporan hanya dari arsip harian lokal (utils.day_archive,
+butuh pyarrow) tanpa request API; hari yang belum diarsip dilaporkan gagal.
+Routing Transaction tidak tersedia karena hasilnya hanya berupa tampilan di
+GUI (jalur datanya ada di modules/Routing_Transaction/report.py); Check User
+dan Sync Data juga hanya lewat GUI.
+Exit code 1 bila ada laporan yang gagal.
+"""
+
+from datetime import datetime, timedelta
+import argparse
+import importlib
+import os
+import sys
+import traceback
+
+from utils import day_archive, function, perf
+from utils.messages import ERROR_MESSAGES
+from utils.api_client import reset_retry_budget
+
+# =============================================================================
+# DAFTAR LAPORAN
+# =============================================================================
+
+# mode "date"   -> fungsi(dates, app_instance) per tanggal
+# mode "range"  -> fungsi(dates, app_instance) sekali untuk seluruh rentang --date
+# mode "upload" -> fungsi(input, lokasi); multi_input=True berarti semua file
+#                  --input digabung dalam satu laporan, selain itu per file
+# mode "none"   -> fungsi() tanpa tanggal
+REPORTS = {
+    "routing-summary": {
+        "module": "modules.Auto_Routing_Summary.report", "func": "process_routing_data", "mode": "date",
+        "help": "Routing Summary dari API (/results)",
+    },
+    "delivery-summary": {
+        "module": "modules.Auto_Delivery_Summary.report", "func": "panggil_api_dan_simpan", "mode": "date",
+        "help": "Delivery Summary dari API (/tasks)",
+    },
+    "delivery-summary-rekap": {
+        "module": "modules.Auto_Delivery_Summary.report", "func": "panggil_api_rentang", "mode": "range",
+        "help": "Rekap Delivery Summary per driver untuk rentang --date",
+    },
+    "start-finish-time": {
+        "module": "modules.Start_Finish_Time.report", "func": "ambil_data", "mode": "date",
+        "help": "Start-Finish Time dari API (/location-histories)",
+    },
+    "estimasi-delivery": {
+        "module": "modules.Estimasi_Delivery.report", "func": "buat_laporan", "mode": "date",
+        "help": "Estimasi Delivery (export Excel) dari API (/results)",
+    },
+    "vehicles-data": {
+        "module": "modules.Vehicles_Data.report", "func": "buat_laporan", "mode": "none",
+        "help": "Vehicle Data dari API (/vehicles)",
+    },
+    "routing-summary-upload": {
+        "module": "modules.Routing_Summary.report", "func": "proses_file_routing", "mode": "upload",
+        "multi_input": True, "help": "Routing Summary dari file Export Routing (--input)",
+    },
+    "delivery-summary-upload": {
+        "module": "modules.Delivery_Summary.report", "func": "proses_file_task", "mode": "upload",
+        "multi_input": False, "help": "Delivery Summary dari file Export Task (--input)",
+    },
+}
+
+
+# =============================================================================
+# ARGUMEN
+# =============================================================================
+def parse_date(text):
+    for fmt in ('%Y-%m-%d', '%d-%m-%Y'):
+        try:
+            return datetime.strptime(text.strip(), fmt).date()
+        except ValueError:
+            pass
+    raise argparse.ArgumentTypeError(f"Format tanggal tidak valid: {text}")
+
+
+def parse_date_range(text):
+    """'2024-05-02' atau '2024-05-01..2024-05-07' -> list tanggal (inklusif)."""
+    start_text, _, end_text = text.partition('..')
+    start = parse_date(start_text)
+    end = parse_date(end_text) if end_text else start
+    if end < start:
+        raise argparse.ArgumentTypeError(f"Tanggal akhir sebelum tanggal awal: {text}")
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def resolve_lokasi(values):
+    """Daftar kode cabang dari --lokasi ("all" = semua di constant.json)."""
+    if not values:
+        config = function.load_config() or {}
+        return [config["lokasi"]] if config.get("lokasi") else []
+    if "all" in values:
+        constants = function.load_constants() or {}
+        return list(constants.get("location_id", {}).values())
+    return list(values)
+
+
+def to_dates(day, force_refresh=False, end_day=None):
+    """Bentuk argumen tanggal yang sama dengan jendela pemilih tanggal (utils.gui)."""
+    dates = {"dmy": day.strftime('%d-%m-%Y'), "ymd": day.strftime('%Y-%m-%d'), "force_refresh": force_refresh}
+    if end_day is not None:
+        dates["dmy_akhir"] = end_day.strftime('%d-%m-%Y')
+        dates["ymd_akhir"] = end_day.strftime('%Y-%m-%d')
+    return dates
+
+
+# =============================================================================
+# EKSEKUSI
+# =============================================================================
+def run_job(func, lokasi, output_dir, label, call_args):
+    """Menjalankan satu laporan untuk satu cabang; mengembalikan True bila berhasil."""
+    function.enable_headless(output_dir, {"lokasi": lokasi} if lokasi else {})
+    reset_retry_budget()
+    run = perf.start_run(f"{label} [cli]")
+    try:
+        result = func(*call_args)
+    except Exception as e:
+        function.show_error_message("Error Tak Terduga", ERROR_MESSAGES["UNKNOWN_ERROR"].format(
+            error_detail=f"{e}\n\n{traceback.format_exc()}"
+        ))
+        result = False
+    finally:
+        summary = perf.finish_run(run)
+    ok = result is not False and not function.HEADLESS_ERRORS
+    print(f"{'OK   ' if ok else 'GAGAL'} {label} | {summary}")
+    return ok
+
+
+def build_jobs(spec, args, lokasi_list):
+    """(lokasi, label, argumen fungsi) untuk setiap kombinasi cabang x tanggal/input."""
+    for lokasi in lokasi_list:
+        if spec["mode"] == "date":
+            for day in args.date:
+                yield lokasi, f"{args.report} {lokasi} {day:%Y-%m-%d}", (to_dates(day, args.force_refresh), None)
+        elif spec["mode"] == "range":
+            first, last = args.date[0], args.date[-1]
+            label = f"{args.report} {lokasi} {first:%Y-%m-%d}..{last:%Y-%m-%d}"
+            yield lokasi, label, (to_dates(first, args.force_refresh, end_day=last), None)
+        elif spec["mode"] == "upload":
+            if spec.get("multi_input"):
+                yield lokasi, f"{args.report} {lokasi}", (list(args.input), lokasi)
+            else:
+                for path in args.input:
+                    yield lokasi, f"{args.report} {lokasi} {os.path.basename(path)}", (path, lokasi)
+        else:
+            yield lokasi, f"{args.report} {lokasi}", ()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Menjalankan laporan TMS tanpa GUI.")
+    parser.add_argument("report", nargs="?", choices=sorted(REPORTS), help="Nama laporan")
+    parser.add_argument("--lokasi", nargs="+", help='Kode cabang (mis. plck), beberapa kode, atau "all"')
+    parser.add_argument("--date", type=parse_date_range, help="Tanggal atau rentang AWAL..AKHIR")
+    parser.add_argument("--output-dir", default=".", help="Folder hasil (default: folder saat ini)")
+    parser.add_argument("--input", nargs="+", default=[], help="File Excel untuk laporan *-upload")
+    parser.add_argument("--force-refresh", action="store_true", help="Abaikan cache response API")
+    parser.add_argument("--gabung", action="store_true", help="Semua --lokasi dalam satu workbook per tanggal")
+    parser.add_argument("--offline", action="store_true", help="Hanya dari arsip harian lokal, tanpa request API")
+    parser.add_argument("--list", action="store_true", help="Tampilkan daftar laporan")
+    args = parser.parse_args(argv)
+
+    if args.list or not args.report:
+        for name in sorted(REPORTS):
+            print(f"{name:<26} {REPORTS[name]['help']}")
+        return 0
+
+    spec = REPORTS[args.report]
+    if spec["mode"] in ("date", "range") and not args.date:
+        parser.error(f"{args.report} membutuhkan --date")
+    if spec["mode"] == "upload":
+        if not args.input:
+            parser.error(f"{args.report} membutuhkan --input")
+        missing = [path for path in args.input if not os.path.isfile(path)]
+        if missing:
+            parser.error(f"File tidak ditemukan: {', '.join(missing)}")
+
+    if args.offline:
+        if args.force_refresh:
+            parser.error("--offline tidak bisa digabung dengan --force-refresh")
+        if not day_archive.is_available():
+            parser.error("--offline membutuhkan pyarrow (pip install pyarrow)")
+        day_archive.set_offline()
+
+    lokasi_list = resolve_lokasi(args.lokasi)
+    if not lokasi_list:
+        parser.error("Kode lokasi tidak ada di config.json; isi --lokasi")
+
+    output_dir = os.path.abspath(args.output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+
+    if args.gabung:
+        from utils import multi_hub
+        if args.report not in multi_hub.LAPORAN:
+            parser.error(f"--gabung hanya untuk: {', '.join(sorted(multi_hub.LAPORAN))}")
+        failed = 0
+        for day in args.date:
+            call_args = (args.report, to_dates(day, args.force_refresh), True, lokasi_list)
+            label = f"{args.report} gabungan {day:%Y-%m-%d}"
+            if not run_job(multi_hub.buat_laporan_semua_hub, None, output_dir, label, call_args):
+                failed += 1
+        return 1 if failed else 0
+
+    # Modul laporan dimuat hanya untuk laporan yang diminta
+    func = getattr(importlib.import_module(spec["module"]), spec["func"])
+    failed = 0
+    for lokasi, label, call_args in build_jobs(spec, args, lokasi_list):
+        if not run_job(func, lokasi, output_dir, label, call_args):
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
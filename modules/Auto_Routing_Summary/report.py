@@ -0,0 +1,324 @@
+# Jalur data Routing Summary (API): tanpa Tk, dipakai oleh apps.py dan cli.py
+from datetime import datetime, timedelta
+from openpyxl import load_workbook
+from openpyxl.styles import Alignment
+from openpyxl.utils import get_column_letter
+import pandas as pd
+import numpy as np
+import requests
+import traceback
+from utils.function import (
+    get_save_path,
+    load_config,
+    load_constants,
+    load_master_data,
+    load_secret,
+    load_type_map,
+    open_file_externally,
+    show_error_message,
+    show_info_message
+)
+from utils.messages import ERROR_MESSAGES, INFO_MESSAGES
+from utils.api_handler import handle_requests_error
+from utils.api_client import fetch_all_pages
+from utils import perf
+from utils.vehicle_types import VehicleTypeClassifier
+
+# Field /results yang dibaca laporan ini (proyeksi server, lihat fetch_all_pages)
+RESULTS_FIELDS = ("dispatchStatus", "result")
+
+# Sheet utama yang dipakai untuk mode semua hub (lihat utils.multi_hub)
+SHEET_UTAMA = 'Truck Detail'
+
+@perf.timed("style")
+def style_excel(file_path):
+    workbook = load_workbook(file_path)
+    for sheet_name in workbook.sheetnames:
+        ws = workbook[sheet_name]
+        for col in ws.columns:
+            max_length = 0
+            column_letter = get_column_letter(col[0].column)
+            for cell in col:
+                try:
+                    if len(str(cell.value)) > max_length:
+                        max_length = len(str(cell.value))
+                except:
+                    pass
+            adjusted_width = (max_length + 2)
+            ws.column_dimensions[column_letter].width = adjusted_width
+    if "Truck Detail" in workbook.sheetnames:
+        ws_detail = workbook["Truck Detail"]
+        center_align = Alignment(horizontal='center', vertical='center')
+        for row in ws_detail.iter_rows(min_row=2, min_col=3, max_col=8):
+            for cell in row:
+                cell.alignment = center_align
+    workbook.save(file_path)
+
+def kumpulkan_data(date_formats, gui_instance=None):
+    """
+    Mengambil dan mengolah data Routing Summary untuk lokasi di config.
+    Mengembalikan dict berisi "sheets" (nama sheet -> DataFrame), "lokasi"
+    dan "file_basename"; None bila gagal (pesan sudah ditampilkan).
+    """
+    selected_date_dmy = date_formats['dmy']
+    selected_date_for_filename = selected_date_dmy.replace('-', '.')
+    try:
+        date_obj = datetime.strptime(selected_date_dmy, '%d-%m-%Y')
+    except ValueError:
+        show_error_message("Error Format Tanggal", "Format tanggal dari pemilih tidak valid.")
+        return
+
+    perf.phase("load_config")
+    config = load_config()
+    constants = load_constants()
+    secrets = load_secret()
+    lokasi_code = config.get('lokasi')
+    
+    # =======================================================
+    # ▼▼▼ LOGIKA LOKASI PROSES ▼▼▼
+    # =======================================================
+    # Hanya proses lokasi yang dipilih
+    codes_to_process = [lokasi_code]
+    
+    # Muat data master berdasarkan kode yang diproses
+    # Asumsi: load_master_data() tanpa argumen akan memuat semua data
+    full_master_data = load_master_data()
+    if full_master_data is None: return
+
+    # Filter master data sesuai dengan kode lokasi yang dibutuhkan
+    master_data_df = full_master_data["df"]
+    hub_ids = full_master_data["hub_ids"]
+    if not master_data_df.empty:
+        master_data_df = master_data_df[master_data_df['Email'].str.contains('|'.join(codes_to_process), na=False)]
+    # =======================================================
+    
+    if not config:
+        show_error_message("Gagal", ERROR_MESSAGES["CONFIG_FILE_ERROR"])
+        return
+    if not constants:
+        show_error_message("Gagal", ERROR_MESSAGES["CONSTANT_FILE_ERROR"])
+        return
+    if not secrets:
+        show_error_message("Gagal", ERROR_MESSAGES["SECRET_FILE_ERROR"])
+        return
+    if master_data_df.empty:
+        show_error_message("Gagal", ERROR_MESSAGES["MASTER_DATA_MISSING"])
+        return
+
+    master_data_map = dict(zip(master_data_df['Email'], master_data_df['Driver']))
+    api_token = secrets.get('token')
+    location_id = constants.get('location_id', {})
+    
+    # Tentukan nama lokasi untuk nama file
+    lokasi_name = next((name for name, code in location_id.items() if code == lokasi_code), lokasi_code)
+
+    if not api_token:
+        show_error_message("Error Token API", ERROR_MESSAGES["API_TOKEN_MISSING"])
+        return
+
+    perf.phase("transform")
+    if date_obj.weekday() == 6:
+        adjusted_date = date_obj
+    else:
+        adjusted_date = date_obj - timedelta(days=1)
+        if adjusted_date.weekday() == 6:
+            adjusted_date = date_obj - timedelta(days=2)
+
+    date_str = adjusted_date.strftime('%Y-%m-%d')
+    
+    # =======================================================
+    # ▼▼▼ LOGIKA PANGGILAN API BERULANG UNTUK SETIAP HUB ▼▼▼
+    # =======================================================
+    all_response_data = []
+    hub_ids_to_fetch = [hub_ids.get(code) for code in codes_to_process if hub_ids.get(code)]
+
+    if not hub_ids_to_fetch:
+        show_error_message("Konfigurasi Salah", ERROR_MESSAGES["HUB_ID_MISSING"])
+        return
+        
+    for hub_id in hub_ids_to_fetch:
+        params = {
+            'dateFrom': date_str, 'dateTo': date_str,
+            'limit': 100, 'hubId': hub_id
+        }
+        try:
+            all_response_data.extend(fetch_all_pages(
+                "/results", params, "data",
+                use_cache=True, force_refresh=date_formats.get('force_refresh', False),
+                fields=RESULTS_FIELDS
+            ))
+        except requests.exceptions.RequestException as e:
+            handle_requests_error(e)
+            return
+    
+    if not all_response_data:
+        show_error_message("Data Tidak Ditemukan", ERROR_MESSAGES["DATA_NOT_FOUND"])
+        return
+    # =======================================================
+
+    processed_data = []
+    first_tags_list = []
+    processed_assignees_for_usage = set()
+
+    routing_results = [
+        item for item in all_response_data
+        if item.get("dispatchStatus") == "done"
+    ]
+    
+    for item in routing_results:
+        if 'result' in item and 'routing' in item['result']:
+            for route in item['result']['routing']:
+                assignee_email = route.get('assignee')
+                # Filter email tidak lagi diperlukan karena sudah difilter via hub_id dan master data
+                if not assignee_email:
+                    continue
+
+                if assignee_email not in processed_assignees_for_usage:
+                    vehicle_tags = route.get('vehicleTags', [])
+                    if vehicle_tags:
+                        first_tags_list.append(vehicle_tags[0])
+                    processed_assignees_for_usage.add(assignee_email)
+
+                driver_name = master_data_map.get(assignee_email, assignee_email)
+                trips = route.get("trips", [])
+                def safe_float(value, default=0):
+                    try:
+                        return float(value)
+                    except (TypeError, ValueError):
+                        return default
+
+                if trips:
+                    def is_hub_true(val):
+                        if isinstance(val, bool): return val
+                        if isinstance(val, str): return val.strip().lower() in ('true', '1', 'yes')
+                        try: return int(val) == 1
+                        except Exception: return False
+
+                    non_hub_trips = [t for t in trips if not is_hub_true(t.get('isHub', False))]
+                    total_weight = sum(safe_float(t.get("weight", 0)) for t in non_hub_trips)
+                    total_volume = sum(safe_float(t.get("volume", 0)) for t in non_hub_trips)
+                    total_distance = sum(safe_float(t.get("distance", 0)) for t in trips)
+                    total_minutes = sum((t.get("travelTime", 0) + t.get("visitTime", 0) + t.get("waitingTime", 0)) for t in trips)
+                    hours, minutes = divmod(total_minutes, 60)
+                    ship_duration = f"'{hours}:{minutes:02d}"
+                    vehicle_max_weight = route.get("vehicleMaxWeight", 1) or 1
+                    vehicle_max_volume = route.get("vehicleMaxVolume", 1) or 1
+                    weight_percentage = (total_weight / vehicle_max_weight) * 100 if vehicle_max_weight else None
+                    volume_percentage = (total_volume / vehicle_max_volume) * 100 if vehicle_max_volume else None
+                else:
+                    total_distance, ship_duration, weight_percentage, volume_percentage = None, None, None, None
+
+                processed_data.append({
+                    'Assignee': driver_name,
+                    'Vehicle Name': route.get('vehicleName'),
+                    'Total Distance (m)': (round(total_distance) if total_distance is not None else None),
+                    'Total Visits': None,
+                    'Total Delivered': None,
+                    'weight_numeric': weight_percentage,
+                    'volume_numeric': volume_percentage,
+                    'ship_duration': ship_duration
+                })
+
+    if not processed_data:
+        show_error_message("Data Tidak Ditemukan", "Tidak ada data 'done' yang ditemukan untuk diproses.")
+        return
+
+    df_api = pd.DataFrame(processed_data)
+    df_api['Total Distance (m)'] = df_api['Total Distance (m)'].astype(object)
+
+    def sum_or_none(series):
+        values = series.dropna()
+        return values.sum() if not values.empty else None
+
+    agg_rules = {
+        'Vehicle Name': lambda x: ', '.join(x.dropna().unique()),
+        'Total Distance (m)': sum_or_none,
+        'Total Visits': 'first',
+        'Total Delivered': 'first',
+        'weight_numeric': 'mean',
+        'volume_numeric': 'mean',
+        'ship_duration': 'first'
+    }
+    df_api_grouped = df_api.groupby('Assignee', as_index=False).agg(agg_rules)
+    df_api_grouped['Weight Percentage'] = df_api_grouped['weight_numeric'].apply(lambda x: f"{x:.1f}%" if pd.notnull(x) else None)
+    df_api_grouped['Volume Percentage'] = df_api_grouped['volume_numeric'].apply(lambda x: f"{x:.1f}%" if pd.notnull(x) else None)
+    df_api_grouped.rename(columns={'ship_duration': 'Ship Duration'}, inplace=True)
+    df_api_grouped = df_api_grouped.drop(columns=['weight_numeric', 'volume_numeric'])
+
+    all_master_drivers = set(master_data_map.values())
+    drivers_in_api = set(df_api_grouped['Assignee']) if not df_api_grouped.empty else set()
+    missing_drivers = all_master_drivers - drivers_in_api
+    df_missing = pd.DataFrame([{'Assignee': driver} for driver in missing_drivers])
+    
+    df_final = pd.concat([df_api_grouped, df_missing], ignore_index=True)
+
+    # Blok pengurutan SEWA (tidak berubah)
+    df_final['is_sewa'] = (
+        df_final['Vehicle Name'].str.contains('SEWA', case=False, na=False) |
+        df_final['Assignee'].str.contains('SEWA', case=False, na=False)
+    ).astype(int)
+    conditions = [
+        df_final['Assignee'].str.contains('DRY', case=False, na=False),
+        df_final['Assignee'].str.contains('FRZ', case=False, na=False)
+    ]
+    choices = [1, 2]
+    df_final['sewa_category'] = np.select(conditions, choices, default=3)
+    df_final = df_final.sort_values(
+        by=['is_sewa', 'sewa_category', 'Assignee'],
+        ascending=[True, True, True]
+    ).reset_index(drop=True)
+    df_final = df_final.drop(columns=['is_sewa', 'sewa_category'])
+
+    column_order = ['Vehicle Name', 'Assignee', 'Weight Percentage', 'Volume Percentage', 'Total Distance (m)', 'Total Visits', 'Total Delivered', 'Ship Duration']
+    df_final = df_final.reindex(columns=column_order)
+
+    dry_dist_m = df_final[df_final['Assignee'].str.contains("DRY", na=False)]['Total Distance (m)'].sum(skipna=True)
+    frz_dist_m = df_final[df_final['Assignee'].str.contains("FRZ", na=False)]['Total Distance (m)'].sum(skipna=True)
+    df_summary = pd.DataFrame({'DRY': [round((dry_dist_m or 0) / 1000, 2)], 'FRZ': [round((frz_dist_m or 0) / 1000, 2)]})
+    type_map = (load_type_map() or {}).get("type", {})
+    classifier = VehicleTypeClassifier(constants.get("vehicle_types", []), type_map)
+    df_usage = classifier.usage_table(first_tags_list)
+
+    file_basename = f"Routing Summary - {selected_date_for_filename} - {lokasi_name}"
+    return {
+        "lokasi": lokasi_code,
+        "lokasi_name": lokasi_name,
+        "file_basename": file_basename,
+        "sheets": {
+            'Truck Detail': df_final,
+            'Total Distance Summary': df_summary,
+            'Truck Usage': df_usage,
+        },
+    }
+
+def tulis_laporan(data, save_path):
+    """Menulis workbook Routing Summary lengkap ke save_path."""
+    with pd.ExcelWriter(save_path, engine='openpyxl') as writer:
+        for sheet_name, df in data["sheets"].items():
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+    style_excel(save_path)
+
+def process_routing_data(date_formats, gui_instance):
+    try:
+        data = kumpulkan_data(date_formats, gui_instance)
+        if data is None:
+            return
+
+        perf.phase("other")
+        save_path = get_save_path(base_name=data["file_basename"], extension=".xlsx")
+        if not save_path:
+            show_info_message("Dibatalkan", INFO_MESSAGES["CANCELED_BY_USER"])
+            return
+
+        perf.phase("write_excel")
+        tulis_laporan(data, save_path)
+        perf.phase("open")
+        open_file_externally(save_path)
+
+    except requests.exceptions.RequestException as e:
+        handle_requests_error(e)
+        return None
+    except Exception as e:
+        show_error_message("Error Tak Terduga", ERROR_MESSAGES["UNKNOWN_ERROR"].format(
+        error_detail=f"{e}\n\n{traceback.format_exc()}"
+    ))
@@ -13,12 +13,14 @@ from utils.function import (
 )
 from utils.messages import ERROR_MESSAGES, ASK_MESSAGES
 from utils.api_handler import handle_requests_error
+from utils.api_client import api_get, reset_retry_budget
 
 # Role ID yang harus dikecualikan
 constants = load_constants()
 role_ids = constants.get("role_ids", {})
 driver_id = role_ids.get("driver")
 def main(parent_window):
+    reset_retry_budget()
     try:
         config = load_config()
         secrets = load_secret()
@@ -59,14 +61,10 @@ def main(parent_window):
             role_ids.get("adminPlanner"),
         ]
         
-        base_url = constants.get('base_url')
-        api_url = f"{base_url}/users"
-        headers = {'Authorization': f'Bearer {api_token}'}
         params = {'limit': 500, 'hubId': hub_id, 'status': 'active'}
 
         try:
-            response = requests.get(api_url, headers=headers, params=params, timeout=30)
-            response.raise_for_status()
+            response = api_get("/users", params=params)
             users_data = response.json().get('data', [])
         except requests.exceptions.RequestException as e:
             handle_requests_error(e)
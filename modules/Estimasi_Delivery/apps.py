@@ -1,16 +1,20 @@
 import requests
-import re 
 import tkinter as tk
 from tkinter import ttk 
-from datetime import datetime, timedelta
+from datetime import datetime
 import os
-import pandas as pd
 from tkinter import filedialog, messagebox
-from openpyxl.styles import Font, PatternFill
-from utils.function import load_config, load_secret, load_constants, show_error_message, load_master_data
+from utils.function import load_config
 from utils.messages import ERROR_MESSAGES
-from utils.gui import create_date_picker_window
+from utils.gui import CLOSE_DELAY_MS, create_date_picker_window
 from utils.api_handler import handle_requests_error
+from utils import perf
+from modules.Estimasi_Delivery.report import (
+    _handle_api_request_and_parse_data,
+    get_hub_id,
+    nama_lokasi_cabang,
+    tulis_excel
+)
 
 # Batasan untuk tab/tombol kendaraan per halaman
 VEHICLES_PER_PAGE = 10 
@@ -38,110 +42,13 @@ def export_to_excel(all_vehicle_data, date_str, lokasi_cabang):
             file_path = os.path.join(folder_path, f"{name} ({counter}){ext}")
             counter += 1
 
-        with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-            red_font = Font(color="FF0000")
-            black_fill = PatternFill(start_color="000000", end_color="000000", fill_type="solid")
-            
-            fill_target_columns = ['SO', 'Jam Buka', 'Jam Tutup', 'Estimasi Sampai', 'Estimasi Berangkat']
-
-            for vehicle_data in all_vehicle_data:
-                stop_details = vehicle_data.get('stopDetails', [])
-                vehicle_name = vehicle_data.get('vehicleName', 'Sheet')
-                
-                export_rows = []
-                min_order, max_order = (None, None)
-                if stop_details:
-                    orders = [s.get('order', 999) for s in stop_details]
-                    min_order, max_order = (min(orders), max(orders))
-
-                for stop in sorted(stop_details, key=lambda x: x.get('order', 999)):
-                    visit_name = stop.get('visitName', 'N/A')
-                    jam_buka = stop.get('startTime', 'N/A')
-                    jam_tutup = stop.get('endTime', 'N/A')
-                    eta_val = stop.get('eta', 'N/A')
-                    etd_val = stop.get('etd', 'N/A')
-                    so_numbers = stop.get('soNumbers', '')
-
-                    if visit_name == 'HUB':
-                        jam_buka = ""
-                        jam_tutup = ""
-                        current_order = stop.get('order')
-                        if current_order == min_order: eta_val = ""
-                        elif current_order == max_order: etd_val = ""
-                    
-                    export_rows.append({
-                        'No.': stop.get('order'),
-                        'Outlet': visit_name,
-                        'SO': so_numbers,
-                        'Jam Buka': jam_buka,
-                        'Jam Tutup': jam_tutup,
-                        'Estimasi Sampai': f"{eta_val.split(':')[0]}:{eta_val.split(':')[1]}" if ':' in str(eta_val) else eta_val,
-                        'Estimasi Berangkat': f"{etd_val.split(':')[0]}:{etd_val.split(':')[1]}" if ':' in str(etd_val) else etd_val
-                    })
-
-                if export_rows:
-                    df = pd.DataFrame(export_rows)
-                    safe_sheet_name = re.sub(r'[\\/*?:"<>|]', "", vehicle_name)[:31]
-                    df.to_excel(writer, sheet_name=safe_sheet_name, index=False)
-
-                    worksheet = writer.sheets[safe_sheet_name]
-                    for col in worksheet.columns:
-                        max_length = 0
-                        column_letter = col[0].column_letter
-                        header_length = len(str(worksheet[f"{column_letter}1"].value))
-                        max_length = header_length
-                        for cell in col:
-                            try:
-                                if len(str(cell.value)) > max_length:
-                                    max_length = len(str(cell.value))
-                            except: pass
-                        adjusted_width = (max_length + 2)
-                        worksheet.column_dimensions[column_letter].width = adjusted_width
-
-                    for row_idx, row_data in enumerate(df.itertuples(index=False), 2):
-                        if row_data.Outlet == 'HUB':
-                            for col_idx in range(1, df.shape[1] + 1):
-                                cell = worksheet.cell(row=row_idx, column=col_idx)
-                                cell.font = red_font
-                                header_name = df.columns[col_idx-1]
-                                if header_name in fill_target_columns and not cell.value:
-                                    cell.fill = black_fill
+        tulis_excel(all_vehicle_data, file_path)
         
         os.startfile(file_path)
 
     except Exception as e:
         messagebox.showerror("Error Ekspor", f"Terjadi kesalahan saat mengekspor data:\n{e}")
 
-# =============================================================================
-# FUNGSI UTILITY DATA & REGEX
-# =============================================================================
-def extract_outlet_name(visit_name):
-    if not visit_name: return "N/A"
-    separator = ' - '
-    index = visit_name.find(separator)
-    if index != -1: return visit_name[:index].strip()
-    return visit_name.strip()
-
-def get_hub_id():
-    config = load_config()
-    lokasi_code = config.get('lokasi') if config else None
-    if not config or not lokasi_code:
-        show_error_message("Error Konfigurasi", ERROR_MESSAGES.get("LOCATION_CODE_MISSING", "Kode lokasi hilang."))
-        return None
-    master_data = load_master_data() 
-    hub_ids_map = master_data.get('hub_ids') if master_data else None
-    hub_id = hub_ids_map.get(lokasi_code) if hub_ids_map else None
-    if not hub_id:
-        show_error_message("Error Hub ID", f"Hub ID untuk lokasi '{lokasi_code}' tidak ditemukan di master data.")
-        return None
-    return hub_id
-
-def extract_customer_and_location(visit_name):
-    if not visit_name: return "", ""
-    cust_code = re.search(r'(C0\d+)', visit_name)
-    loc_code = re.search(r'(MAIN|SHIPTO|LOC\d+)', visit_name)
-    return cust_code.group(1) if cust_code else "", loc_code.group(1) if loc_code else ""
-
 # =============================================================================
 # FUNGSI UTILITY GUI
 # =============================================================================
@@ -372,140 +279,45 @@ def display_result_gui(parent_instance, parsed_data, date_str, lokasi_cabang):
 
 # (Sisa kode di bawah ini tidak ada perubahan)
 # =============================================================================
-def _parse_delivery_data(routing_results):
-    parsed_data = []
-    for route_item in routing_results:
-        for route in route_item.get('result', {}).get('routing', []):
-            vehicle_name = route.get('vehicleName', 'N/A')
-            trips = route.get('trips', [])
-            non_hub_trips = [trip for trip in trips if not trip.get('isHub')]
-            num_trips = len(non_hub_trips)
-            stop_details = []
-            for trip in trips:
-                time_window = trip.get('timeWindow', {})
-                outlet_name = ""
-                so_numbers = ""
-                visit_name_raw = trip.get('visitName', '')
-                
-                is_hub_trip = trip.get('isHub', False)
-                if is_hub_trip:
-                    outlet_name = "HUB"
-                    if not trip.get('eta') and not trip.get('etd'):
-                        continue
-                else:
-                    if not visit_name_raw or not time_window.get('startTime') or not trip.get('eta'):
-                        continue
-                    outlet_name = extract_outlet_name(visit_name_raw)
-                    
-                    match = re.search(r'S[SO]\d', visit_name_raw)
-                    if match:
-                        so_start_index = match.start()
-                        so_substring = visit_name_raw[so_start_index:]
-                        so_list = [so.strip() for so in so_substring.split(',')]
-                        so_numbers = ', '.join(so_list)
-
-                stop_details.append({
-                    "order": trip.get('order', 999),
-                    "visitName": outlet_name,
-                    "soNumbers": so_numbers, 
-                    "startTime": time_window.get('startTime', 'N/A'),
-                    "endTime": time_window.get('endTime', 'N/A'),
-                    "eta": trip.get('eta', 'N/A'),
-                    "etd": trip.get('etd', 'N/A'),
-                })
-            if stop_details:
-                parsed_data.append({
-                    "vehicleName": vehicle_name,
-                    "numTrips": num_trips,
-                    "stopDetails": stop_details
-                })
-    return parsed_data
-
-def _handle_api_request_and_parse_data(app_instance, date_obj, hub_id):
-    secret = load_secret()
-    constants = load_constants()
-    base_url = constants.get('base_url')
-    token = secret.get('token')
-    if not base_url or not token:
-        show_error_message("Error API", ERROR_MESSAGES.get("API_TOKEN_MISSING", "Token API hilang."))
-        return None, None
-    day_of_week = date_obj.weekday()
-    if day_of_week == 0:
-        target_date_obj = date_obj - timedelta(days=2)
-    else:
-        target_date_obj = date_obj - timedelta(days=1)
-    mileapp_date_format = target_date_obj.strftime('%Y-%m-%d')
-    date_str = date_obj.strftime('%d-%m-%Y')
-    url = f"{base_url}/results"
-    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-    params = {'dateFrom': mileapp_date_format, 'dateTo': mileapp_date_format, 'limit': 100, 'hubId': hub_id}
-    response = requests.get(url, headers=headers, params=params, timeout=30)
-    response.raise_for_status()
-    data = response.json()
-    app_instance.update_status("Memfilter data...")
-    routing_results = [
-        item for item in data.get('data', {}).get('data', [])
-        if item.get("dispatchStatus") == "done"
-    ]
-    if not routing_results:
-        app_instance.display_error("Data Tidak Ditemukan", ERROR_MESSAGES.get("DATA_NOT_FOUND", "Data tidak ditemukan."))
-        return None, date_str
-    app_instance.update_status("Mengekstrak dan memformat data estimasi...")
-    parsed_data = _parse_delivery_data(routing_results)
-    def get_hub_departure_time(vehicle):
-        try:
-            hub_stops = [s for s in vehicle.get('stopDetails', []) if s.get('visitName') == 'HUB']
-            if not hub_stops: return datetime.max
-            first_hub_stop = min(hub_stops, key=lambda s: s.get('order', 999))
-            if first_hub_stop and first_hub_stop.get('etd') != 'N/A':
-                return datetime.strptime(first_hub_stop['etd'], "%H:%M:%S")
-        except (ValueError, KeyError):
-            pass
-        return datetime.max
-    parsed_data.sort(key=lambda v: (get_hub_departure_time(v), v.get('vehicleName', '')))
-    return parsed_data, date_str
-
 def process_data(date_input, app_instance):
     date_str_input = date_input.get('dmy') if isinstance(date_input, dict) else (date_input if isinstance(date_input, str) else None)
     if not date_str_input:
         app_instance.display_error("Kesalahan Input", "Input tanggal tidak valid. Proses dibatalkan.")
-        app_instance.after(1000, app_instance.destroy) 
+        app_instance.after(CLOSE_DELAY_MS, app_instance.destroy) 
         return
     try:
         date_obj = datetime.strptime(date_str_input, '%d-%m-%Y') 
         if date_obj.weekday() == 6:
             app_instance.display_error("Data Tidak Ditemukan", ERROR_MESSAGES.get("DATA_NOT_FOUND", "Data tidak ditemukan."))
-            app_instance.after(1000, app_instance.destroy) 
+            app_instance.after(CLOSE_DELAY_MS, app_instance.destroy) 
             return
             
+        perf.phase("load_config")
         config = load_config()
-        constants = load_constants()
-        lokasi_code = config.get('lokasi', 'Unknown')
-        
-        location_id_map = constants.get('location_id', {})
-        reversed_location_map = {v: k for k, v in location_id_map.items()}
-        lokasi_cabang = reversed_location_map.get(lokasi_code, lokasi_code)
+        lokasi_cabang = nama_lokasi_cabang(config.get('lokasi', 'Unknown'))
         
         hub_id = get_hub_id() 
         if not hub_id:
-            app_instance.after(1000, app_instance.destroy) 
+            app_instance.after(CLOSE_DELAY_MS, app_instance.destroy) 
             return
             
-        parsed_data, date_str = _handle_api_request_and_parse_data(app_instance, date_obj, hub_id)
+        perf.phase("transform")
+        force_refresh = date_input.get('force_refresh', False) if isinstance(date_input, dict) else False
+        parsed_data, date_str = _handle_api_request_and_parse_data(app_instance, date_obj, hub_id, force_refresh)
         
         if parsed_data:
             app_instance.after(0, lambda: display_result_gui(app_instance, parsed_data, date_str, lokasi_cabang))
         elif date_str:
             app_instance.display_error("Data Kosong", "Tidak ada kendaraan yang lolos filter atau tidak ada data estimasi waktu yang lengkap.")
-            app_instance.after(1000, app_instance.destroy)
+            app_instance.after(CLOSE_DELAY_MS, app_instance.destroy)
             
     except requests.exceptions.RequestException as e:
         handle_requests_error(e)
-        app_instance.after(1000, app_instance.destroy)
+        app_instance.after(CLOSE_DELAY_MS, app_instance.destroy)
     except Exception as e:
         error_msg = ERROR_MESSAGES.get("UNKNOWN_ERROR", "Kesalahan tak terduga: {error_detail}").format(error_detail=str(e))
         app_instance.display_error("Kesalahan Tak Terduga", error_msg)
-        app_instance.after(1000, app_instance.destroy) 
+        app_instance.after(CLOSE_DELAY_MS, app_instance.destroy) 
 
 def main():
     create_date_picker_window("Estimasi Delivery", process_data)
\ No newline at end of file
@@ -0,0 +1,260 @@
+# Jalur data Estimasi Delivery: tanpa Tk, dipakai oleh apps.py dan cli.py
+import re
+from datetime import datetime, timedelta
+import pandas as pd
+from openpyxl.styles import Font, PatternFill
+from utils.function import (
+    get_save_path,
+    load_config,
+    load_constants,
+    load_master_data,
+    load_secret,
+    open_file_externally,
+    show_error_message
+)
+from utils.messages import ERROR_MESSAGES
+from utils.api_client import fetch_all_pages
+from utils import perf
+
+# Field /results yang dibaca laporan ini (proyeksi server, lihat fetch_all_pages)
+RESULTS_FIELDS = ("dispatchStatus", "result")
+
+# =============================================================================
+# FUNGSI UTILITY DATA & REGEX
+# =============================================================================
+def extract_outlet_name(visit_name):
+    if not visit_name: return "N/A"
+    separator = ' - '
+    index = visit_name.find(separator)
+    if index != -1: return visit_name[:index].strip()
+    return visit_name.strip()
+
+def get_hub_id():
+    config = load_config()
+    lokasi_code = config.get('lokasi') if config else None
+    if not config or not lokasi_code:
+        show_error_message("Error Konfigurasi", ERROR_MESSAGES.get("LOCATION_CODE_MISSING", "Kode lokasi hilang."))
+        return None
+    master_data = load_master_data() 
+    hub_ids_map = master_data.get('hub_ids') if master_data else None
+    hub_id = hub_ids_map.get(lokasi_code) if hub_ids_map else None
+    if not hub_id:
+        show_error_message("Error Hub ID", f"Hub ID untuk lokasi '{lokasi_code}' tidak ditemukan di master data.")
+        return None
+    return hub_id
+
+def extract_customer_and_location(visit_name):
+    if not visit_name: return "", ""
+    cust_code = re.search(r'(C0\d+)', visit_name)
+    loc_code = re.search(r'(MAIN|SHIPTO|LOC\d+)', visit_name)
+    return cust_code.group(1) if cust_code else "", loc_code.group(1) if loc_code else ""
+
+# =============================================================================
+# PENGAMBILAN & PARSING DATA
+# =============================================================================
+def _parse_delivery_data(routing_results):
+    parsed_data = []
+    for route_item in routing_results:
+        for route in route_item.get('result', {}).get('routing', []):
+            vehicle_name = route.get('vehicleName', 'N/A')
+            trips = route.get('trips', [])
+            non_hub_trips = [trip for trip in trips if not trip.get('isHub')]
+            num_trips = len(non_hub_trips)
+            stop_details = []
+            for trip in trips:
+                time_window = trip.get('timeWindow', {})
+                outlet_name = ""
+                so_numbers = ""
+                visit_name_raw = trip.get('visitName', '')
+                
+                is_hub_trip = trip.get('isHub', False)
+                if is_hub_trip:
+                    outlet_name = "HUB"
+                    if not trip.get('eta') and not trip.get('etd'):
+                        continue
+                else:
+                    if not visit_name_raw or not time_window.get('startTime') or not trip.get('eta'):
+                        continue
+                    outlet_name = extract_outlet_name(visit_name_raw)
+                    
+                    match = re.search(r'S[SO]\d', visit_name_raw)
+                    if match:
+                        so_start_index = match.start()
+                        so_substring = visit_name_raw[so_start_index:]
+                        so_list = [so.strip() for so in so_substring.split(',')]
+                        so_numbers = ', '.join(so_list)
+
+                stop_details.append({
+                    "order": trip.get('order', 999),
+                    "visitName": outlet_name,
+                    "soNumbers": so_numbers, 
+                    "startTime": time_window.get('startTime', 'N/A'),
+                    "endTime": time_window.get('endTime', 'N/A'),
+                    "eta": trip.get('eta', 'N/A'),
+                    "etd": trip.get('etd', 'N/A'),
+                })
+            if stop_details:
+                parsed_data.append({
+                    "vehicleName": vehicle_name,
+                    "numTrips": num_trips,
+                    "stopDetails": stop_details
+                })
+    return parsed_data
+
+def _handle_api_request_and_parse_data(app_instance, date_obj, hub_id, force_refresh=False):
+    secret = load_secret()
+    constants = load_constants()
+    base_url = constants.get('base_url')
+    token = secret.get('token')
+    if not base_url or not token:
+        show_error_message("Error API", ERROR_MESSAGES.get("API_TOKEN_MISSING", "Token API hilang."))
+        return None, None
+    day_of_week = date_obj.weekday()
+    if day_of_week == 0:
+        target_date_obj = date_obj - timedelta(days=2)
+    else:
+        target_date_obj = date_obj - timedelta(days=1)
+    mileapp_date_format = target_date_obj.strftime('%Y-%m-%d')
+    date_str = date_obj.strftime('%d-%m-%Y')
+    params = {'dateFrom': mileapp_date_format, 'dateTo': mileapp_date_format, 'limit': 100, 'hubId': hub_id}
+    if app_instance: app_instance.update_status("Mengambil data routing...")
+    all_results = fetch_all_pages("/results", params, "data", use_cache=True, force_refresh=force_refresh,
+                                  fields=RESULTS_FIELDS)
+    if app_instance: app_instance.update_status("Memfilter data...")
+    routing_results = [
+        item for item in all_results
+        if item.get("dispatchStatus") == "done"
+    ]
+    if not routing_results:
+        if app_instance:
+            app_instance.display_error("Data Tidak Ditemukan", ERROR_MESSAGES.get("DATA_NOT_FOUND", "Data tidak ditemukan."))
+        else:
+            show_error_message("Data Tidak Ditemukan", ERROR_MESSAGES.get("DATA_NOT_FOUND", "Data tidak ditemukan."))
+        return None, date_str
+    if app_instance: app_instance.update_status("Mengekstrak dan memformat data estimasi...")
+    parsed_data = _parse_delivery_data(routing_results)
+    def get_hub_departure_time(vehicle):
+        try:
+            hub_stops = [s for s in vehicle.get('stopDetails', []) if s.get('visitName') == 'HUB']
+            if not hub_stops: return datetime.max
+            first_hub_stop = min(hub_stops, key=lambda s: s.get('order', 999))
+            if first_hub_stop and first_hub_stop.get('etd') != 'N/A':
+                return datetime.strptime(first_hub_stop['etd'], "%H:%M:%S")
+        except (ValueError, KeyError):
+            pass
+        return datetime.max
+    parsed_data.sort(key=lambda v: (get_hub_departure_time(v), v.get('vehicleName', '')))
+    return parsed_data, date_str
+
+# =============================================================================
+# FUNGSI EXPORT KE EXCEL
+# =============================================================================
+def tulis_excel(all_vehicle_data, file_path):
+    """Menulis satu sheet per kendaraan ke file_path."""
+    with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
+        red_font = Font(color="FF0000")
+        black_fill = PatternFill(start_color="000000", end_color="000000", fill_type="solid")
+        
+        fill_target_columns = ['SO', 'Jam Buka', 'Jam Tutup', 'Estimasi Sampai', 'Estimasi Berangkat']
+
+        for vehicle_data in all_vehicle_data:
+            stop_details = vehicle_data.get('stopDetails', [])
+            vehicle_name = vehicle_data.get('vehicleName', 'Sheet')
+            
+            export_rows = []
+            min_order, max_order = (None, None)
+            if stop_details:
+                orders = [s.get('order', 999) for s in stop_details]
+                min_order, max_order = (min(orders), max(orders))
+
+            for stop in sorted(stop_details, key=lambda x: x.get('order', 999)):
+                visit_name = stop.get('visitName', 'N/A')
+                jam_buka = stop.get('startTime', 'N/A')
+                jam_tutup = stop.get('endTime', 'N/A')
+                eta_val = stop.get('eta', 'N/A')
+                etd_val = stop.get('etd', 'N/A')
+                so_numbers = stop.get('soNumbers', '')
+
+                if visit_name == 'HUB':
+                    jam_buka = ""
+                    jam_tutup = ""
+                    current_order = stop.get('order')
+                    if current_order == min_order: eta_val = ""
+                    elif current_order == max_order: etd_val = ""
+                
+                export_rows.append({
+                    'No.': stop.get('order'),
+                    'Outlet': visit_name,
+                    'SO': so_numbers,
+                    'Jam Buka': jam_buka,
+                    'Jam Tutup': jam_tutup,
+                    'Estimasi Sampai': f"{eta_val.split(':')[0]}:{eta_val.split(':')[1]}" if ':' in str(eta_val) else eta_val,
+                    'Estimasi Berangkat': f"{etd_val.split(':')[0]}:{etd_val.split(':')[1]}" if ':' in str(etd_val) else etd_val
+                })
+
+            if export_rows:
+                df = pd.DataFrame(export_rows)
+                safe_sheet_name = re.sub(r'[\\/*?:"<>|]', "", vehicle_name)[:31]
+                df.to_excel(writer, sheet_name=safe_sheet_name, index=False)
+
+                worksheet = writer.sheets[safe_sheet_name]
+                for col in worksheet.columns:
+                    max_length = 0
+                    column_letter = col[0].column_letter
+                    header_length = len(str(worksheet[f"{column_letter}1"].value))
+                    max_length = header_length
+                    for cell in col:
+                        try:
+                            if len(str(cell.value)) > max_length:
+                                max_length = len(str(cell.value))
+                        except: pass
+                    adjusted_width = (max_length + 2)
+                    worksheet.column_dimensions[column_letter].width = adjusted_width
+
+                for row_idx, row_data in enumerate(df.itertuples(index=False), 2):
+                    if row_data.Outlet == 'HUB':
+                        for col_idx in range(1, df.shape[1] + 1):
+                            cell = worksheet.cell(row=row_idx, column=col_idx)
+                            cell.font = red_font
+                            header_name = df.columns[col_idx-1]
+                            if header_name in fill_target_columns and not cell.value:
+                                cell.fill = black_fill
+
+def nama_lokasi_cabang(lokasi_code):
+    constants = load_constants() or {}
+    location_id_map = constants.get('location_id', {})
+    reversed_location_map = {v: k for k, v in location_id_map.items()}
+    return reversed_location_map.get(lokasi_code, lokasi_code)
+
+def buat_laporan(dates, app_instance=None):
+    """
+    Jalur tanpa GUI (cli.py): ambil data estimasi untuk tanggal terpilih lalu
+    simpan Excel lewat get_save_path. Mengembalikan path file, atau None.
+    """
+    perf.phase("load_config")
+    date_obj = datetime.strptime(dates["dmy"], '%d-%m-%Y')
+    if date_obj.weekday() == 6:
+        show_error_message("Data Tidak Ditemukan", ERROR_MESSAGES.get("DATA_NOT_FOUND", "Data tidak ditemukan."))
+        return None
+    config = load_config() or {}
+    lokasi_cabang = nama_lokasi_cabang(config.get('lokasi', 'Unknown'))
+    hub_id = get_hub_id()
+    if not hub_id:
+        return None
+
+    perf.phase("transform")
+    parsed_data, date_str = _handle_api_request_and_parse_data(app_instance, date_obj, hub_id, dates.get("force_refresh", False))
+    if not parsed_data:
+        if date_str:
+            show_error_message("Data Kosong", "Tidak ada kendaraan yang lolos filter atau tidak ada data estimasi waktu yang lengkap.")
+        return None
+
+    perf.phase("other")
+    file_path = get_save_path(f"Estimasi Delivery - {date_str} - {lokasi_cabang}")
+    if not file_path:
+        return None
+    perf.phase("write_excel")
+    tulis_excel(parsed_data, file_path)
+    perf.phase("open")
+    open_file_externally(file_path)
+    return file_path
@@ -0,0 +1,24 @@
+from utils.function import show_ask_message
+from utils.gui import CLOSE_DELAY_MS, create_date_picker_window
+from utils.messages import ASK_MESSAGES
+from utils.multi_hub import buat_laporan_semua_hub
+
+# =============================================================================
+# FUNGSI GUI DAN EKSEKUSI
+# =============================================================================
+
+def main(report_key, title):
+    """Laporan report_key (lihat utils.multi_hub.LAPORAN) untuk semua hub pengguna."""
+    gabung = show_ask_message("Semua Hub", ASK_MESSAGES["ASK_COMBINE_HUBS"])
+
+    def process_wrapper(dates, app_instance):
+        def safe_close():
+            if app_instance and app_instance.winfo_exists():
+                app_instance.destroy()
+        try:
+            buat_laporan_semua_hub(report_key, dates, gabung=gabung)
+        finally:
+            if app_instance and app_instance.winfo_exists():
+                app_instance.after(CLOSE_DELAY_MS, safe_close)
+
+    create_date_picker_window(title=f"{title} - Semua Hub", process_callback=process_wrapper)
@@ -1,74 +1,14 @@
 import requests
-import json 
-import re 
 import tkinter as tk
 from tkinter import ttk 
-import threading 
-from datetime import datetime, timedelta
-from utils.function import load_config, load_secret, load_constants, show_error_message, load_master_data
 from utils.messages import ERROR_MESSAGES
-from utils.gui import create_date_picker_window
+from utils.gui import CLOSE_DELAY_MS, create_date_picker_window
 from utils.api_handler import handle_requests_error
+from modules.Routing_Transaction.report import ambil_data_routing
 
 # Batasan untuk tab/tombol kendaraan per halaman
 VEHICLES_PER_PAGE = 10 
 
-# =============================================================================
-# FUNGSI UTILITY DATA
-# =============================================================================
-
-def get_hub_id():
-    """Mengambil Hub ID dari master.json."""
-    config = load_config()
-    if not config:
-        show_error_message("Error Konfigurasi", ERROR_MESSAGES["CONFIG_FILE_ERROR"])
-        return None
-
-    lokasi_code = config.get('lokasi')
-    
-    if not lokasi_code:
-        show_error_message("Error Konfigurasi", ERROR_MESSAGES["LOCATION_CODE_MISSING"])
-        return None
-
-    master_data = load_master_data() 
-    if not master_data:
-        show_error_message("Error Master Data", ERROR_MESSAGES["MASTER_FILE_ERROR"])
-        return None
-    
-    hub_ids_map = master_data.get('hub_ids')
-    
-    if not hub_ids_map:
-        show_error_message("Error Master Data", ERROR_MESSAGES["MASTER_DATA_MISSING"].format(details="Hub IDs map tidak ditemukan di master data."))
-        return None
-
-    hub_id = hub_ids_map.get(lokasi_code)
-
-    if not hub_id:
-        show_error_message("Error Hub ID", f"Hub ID untuk lokasi '{lokasi_code}' tidak ditemukan di master data.")
-        return None
-        
-    return hub_id
-
-def extract_customer_and_location(visit_name):
-    """
-    Mengekstrak Kode Customer (C0...) dan Kode Lokasi (LOC/MAIN/SHIPTO) dari visitName.
-    """
-    cust_code = ""
-    loc_code = ""
-    
-    if not visit_name:
-        return cust_code, loc_code
-    
-    cust_match = re.search(r'(C0\d+)', visit_name)
-    if cust_match:
-        cust_code = cust_match.group(1)
-        
-    loc_match = re.search(r'(MAIN|SHIPTO|LOC\d+)', visit_name)
-    if loc_match:
-        loc_code = loc_match.group(1)
-            
-    return cust_code, loc_code
-
 # =============================================================================
 # FUNGSI GUI OUTPUT BARU
 # =============================================================================
@@ -426,136 +366,31 @@ def process_data(date_input, app_instance):
 
     if not date_str:
         app_instance.display_error("Kesalahan Input", "Input tanggal tidak valid. Proses dibatalkan.")
-        app_instance.after(1000, app_instance.destroy)
+        app_instance.after(CLOSE_DELAY_MS, app_instance.destroy)
         return
 
     try:
-        secret = load_secret()
-        constants = load_constants()
-        hub_id = get_hub_id()
-
-        if not secret or not constants or not hub_id:
-            app_instance.after(1000, app_instance.destroy)
-            return
-
-        base_url = constants.get('base_url')
-        token = secret.get('token')
-
-        if not base_url or not token:
-            show_error_message("Error API", ERROR_MESSAGES["API_TOKEN_MISSING"])
-            app_instance.after(1000, app_instance.destroy)
-            return
-
-        date_obj = datetime.strptime(date_str, '%d-%m-%Y')
-        day_of_week = date_obj.weekday()
-
-        if day_of_week == 6:
-            app_instance.display_error("Data Tidak Ditemukan", ERROR_MESSAGES["DATA_NOT_FOUND"])
-            app_instance.after(1000, app_instance.destroy)
-            return
-        elif day_of_week == 0:
-            target_date_obj = date_obj - timedelta(days=2)
-        else:
-            target_date_obj = date_obj - timedelta(days=1)
-
-        mileapp_date_format = target_date_obj.strftime('%Y-%m-%d')
-        url = f"{base_url}/results"
-        headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-        params = {"dateFrom": mileapp_date_format, "dateTo": mileapp_date_format, "limit": 100, "hubId": hub_id}
-
-        response = requests.get(url, headers=headers, params=params, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-
-        app_instance.update_status("Memfilter data...")
-        routing_results = [
-            item for item in data.get('data', {}).get('data', [])
-            if item.get("dispatchStatus") == "done"
-        ]
-
-        if not routing_results:
-            app_instance.display_error("Data Tidak Ditemukan", ERROR_MESSAGES["DATA_NOT_FOUND"])
-            app_instance.after(1000, app_instance.destroy)
-            return
-
-        app_instance.update_status("Mengekstrak dan memformat data trips dan stops...")
-        parsed_data = []
-
-        for route_item in routing_results:
-            routing_list = route_item.get('result', {}).get('routing', [])
-            for route in routing_list:
-                vehicle_name = route.get('vehicleName', 'N/A')
-                trips = route.get('trips', []) or []
-                trips_sorted = sorted(trips, key=lambda t: t.get('order', 9999))
-                
-                # ============================================================
-                # ▼▼▼ LOGIKA BARU UNTUK MENCARI ETD HUB PERTAMA ▼▼▼
-                # ============================================================
-                hub_etd = datetime.max # Nilai default jika ETD HUB tidak ditemukan
-                
-                first_hub_trip = next((trip for trip in trips_sorted if trip.get('isHub')), None)
-                
-                if first_hub_trip:
-                    etd_raw = first_hub_trip.get('etd')
-                    if etd_raw:
-                        try:
-                            if re.fullmatch(r"\d{2}:\d{2}(:\d{2})?", etd_raw):
-                                hub_etd = datetime.combine(datetime.today().date(), datetime.strptime(etd_raw, "%H:%M:%S").time())
-                            else:
-                                hub_etd = datetime.fromisoformat(etd_raw.replace('Z', '+00:00'))
-                        except Exception:
-                            pass # Biarkan hub_etd tetap datetime.max jika format salah
-                # ============================================================
-
-                non_hub_trips = [trip for trip in trips_sorted if not trip.get('isHub')]
-                num_trips = len(non_hub_trips)
-                details_per_stop = []
-
-                for trip in non_hub_trips:
-                    visit_name = trip.get('visitName')
-                    if visit_name:
-                        cust_code, loc_code = extract_customer_and_location(visit_name)
-                        if cust_code and loc_code:
-                            so_numbers = []
-                            so_list_start_match = re.search(r'(SO\d+-\d+)', visit_name)
-                            if so_list_start_match:
-                                so_start_index = so_list_start_match.start()
-                                so_list_string = visit_name[so_start_index:].strip()
-                                so_numbers.extend([so.strip() for so in so_list_string.split(',')])
-                            if so_numbers:
-                                details_per_stop.append({
-                                    "customerID": cust_code,
-                                    "locationCode": loc_code,
-                                    "soNumbers": so_numbers
-                                })
-
-                if details_per_stop:
-                    parsed_data.append({
-                        "vehicleName": vehicle_name,
-                        "numTrips": num_trips,
-                        "detailsPerStop": details_per_stop,
-                        "hub_etd": hub_etd  # Tambahkan ETD HUB ke data
-                    })
-
-        # Urutkan berdasarkan ETD HUB, lalu nama kendaraan
-        parsed_data.sort(key=lambda x: (x.get('hub_etd', datetime.max), x.get('vehicleName', '')))
-
-        if parsed_data:
+        force_refresh = date_input.get('force_refresh', False) if isinstance(date_input, dict) else False
+        parsed_data = ambil_data_routing({"dmy": date_str, "force_refresh": force_refresh}, app_instance)
+
+        if parsed_data is None:
+            app_instance.after(CLOSE_DELAY_MS, app_instance.destroy)
+        elif parsed_data:
             app_instance.after(0, lambda: display_result_gui(app_instance, parsed_data, date_str))
         else:
             app_instance.display_error(
                 "Data Kosong",
                 "Tidak ada kendaraan yang lolos filter (status 'done' dan memiliki SO, Customer ID, dan Lokasi)."
             )
-            app_instance.after(1000, app_instance.destroy)
+            app_instance.after(CLOSE_DELAY_MS, app_instance.destroy)
 
     except requests.exceptions.RequestException as e:
         handle_requests_error(e)
-        app_instance.after(1000, app_instance.destroy)
+        app_instance.after(CLOSE_DELAY_MS, app_instance.destroy)
     except Exception as e:
         error_msg = ERROR_MESSAGES["UNKNOWN_ERROR"].format(error_detail=str(e))
         app_instance.display_error("Kesalahan Tak Terduga", error_msg)
-        app_instance.after(1000, app_instance.destroy)
+        app_instance.after(CLOSE_DELAY_MS, app_instance.destroy)
 
 def main():
     """Fungsi entry point untuk modul Routing Transaction."""
@@ -0,0 +1,202 @@
+# Jalur data Routing Transaction: tanpa Tk, dipakai oleh apps.py dan tools/benchmark.py
+import re
+from datetime import datetime, timedelta
+from utils.function import load_config, load_secret, load_constants, show_error_message, load_master_data
+from utils.messages import ERROR_MESSAGES
+from utils.api_client import fetch_all_pages
+from utils import perf
+
+# Field /results yang dibaca laporan ini (proyeksi server, lihat fetch_all_pages)
+RESULTS_FIELDS = ("dispatchStatus", "result")
+
+# =============================================================================
+# FUNGSI UTILITY DATA
+# =============================================================================
+
+def get_hub_id():
+    """Mengambil Hub ID dari master store (master.db)."""
+    config = load_config()
+    if not config:
+        show_error_message("Error Konfigurasi", ERROR_MESSAGES["CONFIG_FILE_ERROR"])
+        return None
+
+    lokasi_code = config.get('lokasi')
+
+    if not lokasi_code:
+        show_error_message("Error Konfigurasi", ERROR_MESSAGES["LOCATION_CODE_MISSING"])
+        return None
+
+    master_data = load_master_data()
+    if not master_data:
+        show_error_message("Error Master Data", ERROR_MESSAGES["MASTER_FILE_ERROR"])
+        return None
+
+    hub_ids_map = master_data.get('hub_ids')
+
+    if not hub_ids_map:
+        show_error_message("Error Master Data", ERROR_MESSAGES["MASTER_DATA_MISSING"].format(details="Hub IDs map tidak ditemukan di master data."))
+        return None
+
+    hub_id = hub_ids_map.get(lokasi_code)
+
+    if not hub_id:
+        show_error_message("Error Hub ID", f"Hub ID untuk lokasi '{lokasi_code}' tidak ditemukan di master data.")
+        return None
+
+    return hub_id
+
+def extract_customer_and_location(visit_name):
+    """
+    Mengekstrak Kode Customer (C0...) dan Kode Lokasi (LOC/MAIN/SHIPTO) dari visitName.
+    """
+    cust_code = ""
+    loc_code = ""
+
+    if not visit_name:
+        return cust_code, loc_code
+
+    cust_match = re.search(r'(C0\d+)', visit_name)
+    if cust_match:
+        cust_code = cust_match.group(1)
+
+    loc_match = re.search(r'(MAIN|SHIPTO|LOC\d+)', visit_name)
+    if loc_match:
+        loc_code = loc_match.group(1)
+
+    return cust_code, loc_code
+
+# =============================================================================
+# PARSING DATA ROUTING
+# =============================================================================
+
+def parse_routing_results(routing_results):
+    """
+    Mengubah hasil /results (status 'done') menjadi daftar kendaraan beserta
+    Customer ID, Kode Lokasi dan Nomor SO per stop. Kendaraan tanpa stop yang
+    lengkap dilewati; hasil diurutkan berdasarkan ETD HUB pertama lalu nama.
+    """
+    parsed_data = []
+
+    for route_item in routing_results:
+        routing_list = route_item.get('result', {}).get('routing', [])
+        for route in routing_list:
+            vehicle_name = route.get('vehicleName', 'N/A')
+            trips = route.get('trips', []) or []
+            trips_sorted = sorted(trips, key=lambda t: t.get('order', 9999))
+
+            # ============================================================
+            # ▼▼▼ LOGIKA BARU UNTUK MENCARI ETD HUB PERTAMA ▼▼▼
+            # ============================================================
+            hub_etd = datetime.max # Nilai default jika ETD HUB tidak ditemukan
+
+            first_hub_trip = next((trip for trip in trips_sorted if trip.get('isHub')), None)
+
+            if first_hub_trip:
+                etd_raw = first_hub_trip.get('etd')
+                if etd_raw:
+                    try:
+                        if re.fullmatch(r"\d{2}:\d{2}(:\d{2})?", etd_raw):
+                            hub_etd = datetime.combine(datetime.today().date(), datetime.strptime(etd_raw, "%H:%M:%S").time())
+                        else:
+                            hub_etd = datetime.fromisoformat(etd_raw.replace('Z', '+00:00'))
+                    except Exception:
+                        pass # Biarkan hub_etd tetap datetime.max jika format salah
+            # ============================================================
+
+            non_hub_trips = [trip for trip in trips_sorted if not trip.get('isHub')]
+            num_trips = len(non_hub_trips)
+            details_per_stop = []
+
+            for trip in non_hub_trips:
+                visit_name = trip.get('visitName')
+                if visit_name:
+                    cust_code, loc_code = extract_customer_and_location(visit_name)
+                    if cust_code and loc_code:
+                        so_numbers = []
+                        so_list_start_match = re.search(r'(SO\d+-\d+)', visit_name)
+                        if so_list_start_match:
+                            so_start_index = so_list_start_match.start()
+                            so_list_string = visit_name[so_start_index:].strip()
+                            so_numbers.extend([so.strip() for so in so_list_string.split(',')])
+                        if so_numbers:
+                            details_per_stop.append({
+                                "customerID": cust_code,
+                                "locationCode": loc_code,
+                                "soNumbers": so_numbers
+                            })
+
+            if details_per_stop:
+                parsed_data.append({
+                    "vehicleName": vehicle_name,
+                    "numTrips": num_trips,
+                    "detailsPerStop": details_per_stop,
+                    "hub_etd": hub_etd  # Tambahkan ETD HUB ke data
+                })
+
+    # Urutkan berdasarkan ETD HUB, lalu nama kendaraan
+    parsed_data.sort(key=lambda x: (x.get('hub_etd', datetime.max), x.get('vehicleName', '')))
+    return parsed_data
+
+# =============================================================================
+# FUNGSI UTAMA AMBIL DATA
+# =============================================================================
+
+def ambil_data_routing(dates, app_instance=None):
+    """
+    Mengambil dan mem-parse data Routing Transaction untuk dates["dmy"]
+    (data routing H-1, Senin memakai Sabtu). Mengembalikan list kendaraan
+    (boleh kosong bila tidak ada yang lolos filter), atau None bila gagal;
+    pesan error sudah ditampilkan.
+    """
+    perf.phase("load_config")
+    secret = load_secret()
+    constants = load_constants()
+    hub_id = get_hub_id()
+
+    if not secret or not constants or not hub_id:
+        return None
+
+    base_url = constants.get('base_url')
+    token = secret.get('token')
+
+    if not base_url or not token:
+        show_error_message("Error API", ERROR_MESSAGES["API_TOKEN_MISSING"])
+        return None
+
+    perf.phase("transform")
+    date_obj = datetime.strptime(dates["dmy"], '%d-%m-%Y')
+    day_of_week = date_obj.weekday()
+
+    if day_of_week == 6:
+        _tampilkan_error(app_instance, "Data Tidak Ditemukan", ERROR_MESSAGES["DATA_NOT_FOUND"])
+        return None
+    elif day_of_week == 0:
+        target_date_obj = date_obj - timedelta(days=2)
+    else:
+        target_date_obj = date_obj - timedelta(days=1)
+
+    mileapp_date_format = target_date_obj.strftime('%Y-%m-%d')
+    params = {"dateFrom": mileapp_date_format, "dateTo": mileapp_date_format, "limit": 100, "hubId": hub_id}
+
+    if app_instance: app_instance.update_status("Mengambil data routing...")
+    all_results = fetch_all_pages("/results", params, "data", use_cache=True,
+                                  force_refresh=dates.get("force_refresh", False), fields=RESULTS_FIELDS)
+
+    if app_instance: app_instance.update_status("Memfilter data...")
+    routing_results = [
+        item for item in all_results
+        if item.get("dispatchStatus") == "done"
+    ]
+
+    if not routing_results:
+        _tampilkan_error(app_instance, "Data Tidak Ditemukan", ERROR_MESSAGES["DATA_NOT_FOUND"])
+        return None
+
+    if app_instance: app_instance.update_status("Mengekstrak dan memformat data trips dan stops...")
+    return parse_routing_results(routing_results)
+
+def _tampilkan_error(app_instance, title, message):
+    if app_instance:
+        app_instance.display_error(title, message)
+    else:
+        show_error_message(title, message)
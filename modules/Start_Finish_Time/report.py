@@ -0,0 +1,377 @@
+# Jalur data Start-Finish Time: tanpa Tk, dipakai oleh apps.py dan cli.py
+from datetime import datetime, timedelta
+from openpyxl.styles import PatternFill, Alignment
+from openpyxl.utils import get_column_letter
+import openpyxl
+import pandas as pd
+import numpy as np
+import requests
+import traceback
+# Impor fungsi bantuan dari shared_utils dan gui_utils
+from utils.function import (
+    get_save_path,
+    load_config,
+    load_constants,
+    load_master_data,
+    load_secret,
+    open_file_externally,
+    show_error_message,
+    show_info_message
+)
+from utils.messages import ERROR_MESSAGES, INFO_MESSAGES
+from utils.api_handler import handle_requests_error
+from utils.api_client import api_get
+from utils import day_archive, perf
+
+# Sheet utama yang dipakai untuk mode semua hub (lihat utils.multi_hub)
+SHEET_UTAMA = 'Data'
+
+# =============================================================================
+# BAGIAN 1: FUNGSI-FUNGSI BANTU (HELPER FUNCTIONS)
+# =============================================================================
+
+# Fungsi extract_email_from_id dihapus karena tidak lagi digunakan
+
+def convert_to_jam(menit):
+    menit = int(round(menit)) 
+    jam = menit // 60
+    sisa_menit = menit % 60
+    return f"{jam}:{sisa_menit:02d}"
+
+
+def tambah_7_jam(waktu_str):
+    try:
+        waktu = datetime.fromisoformat(waktu_str)
+    except (ValueError, TypeError):
+        if isinstance(waktu_str, str):
+             waktu = datetime.strptime(waktu_str, "%Y-%m-%d %H:%M:%S")
+        else:
+            return '' # Kembalikan string kosong jika input tidak valid
+    return (waktu + timedelta(hours=7)).strftime("%Y-%m-%d %H:%M:%S")
+
+def siapkan_dataframe(dataframe):
+    """Mengganti nama, memformat, dan mengurutkan kolom sesuai tampilan laporan."""
+    kolom_buang = ['finish.lat', 'finish.lon', 'finish.notes']
+    dataframe = dataframe.drop(columns=[col for col in kolom_buang if col in dataframe.columns])
+
+    kolom_baru = {
+        'Driver': 'Driver', 'startTime': 'Start Trip', 'finish.finishTime': 'Finish Trip',
+        'trackedTime': 'Duration', 
+    }
+    dataframe = dataframe.rename(columns=kolom_baru)
+
+    for kolom in ['Start Trip', 'Finish Trip']:
+        if kolom in dataframe.columns:
+            dataframe[kolom] = pd.to_datetime(dataframe[kolom], errors='coerce')
+
+    if 'Start Trip' in dataframe.columns:
+        dataframe.insert(dataframe.columns.get_loc('Start Trip'), 'Start Date', dataframe['Start Trip'].dt.strftime('%d-%m-%Y'))
+        dataframe['Start Trip'] = dataframe['Start Trip'].dt.strftime("'%H:%M")
+
+    if 'Finish Trip' in dataframe.columns:
+        dataframe.insert(dataframe.columns.get_loc('Finish Trip'), 'Finish Date', dataframe['Finish Trip'].dt.strftime('%d-%m-%Y'))
+        dataframe['Finish Trip'] = dataframe['Finish Trip'].dt.strftime("'%H:%M")
+
+    dataframe = dataframe.rename(columns={'Start Trip': 'Start Time', 'Finish Trip': 'Finish Time'})
+
+    if 'Duration' in dataframe.columns:
+        dataframe['Duration'] = dataframe['Duration'].astype(str).apply(lambda x: f"'{x}" if pd.notna(x) and x != 'None' and x != '' else x)
+    
+    urutan_kolom = [
+        'Plat', 'Driver', 'Start Date', 'Start Time', 'Finish Date',
+        'Finish Time', 'Duration',
+    ]
+    urutan_kolom_final = [col for col in urutan_kolom if col in dataframe.columns]
+    return dataframe[urutan_kolom_final]
+
+def tulis_laporan(data, filename):
+    """Menulis sheet Data beserta format warna dan lebar kolom ke filename."""
+    dataframe = data["sheets"][SHEET_UTAMA]
+    perf.phase("write_excel")
+    dataframe.to_excel(filename, index=False, sheet_name=SHEET_UTAMA)
+
+    perf.phase("style")
+    wb = openpyxl.load_workbook(filename)
+    ws = wb.active
+    
+    kolom_rata_tengah = ['Plat', 'Start Date', 'Start Time', 'Finish Date', 'Finish Time', 'Duration']
+    col_idx_map = {col_name: idx + 1 for idx, col_name in enumerate(dataframe.columns)}
+    center_alignment = Alignment(horizontal='center', vertical='center')
+
+    for col_name in kolom_rata_tengah:
+        if col_name in col_idx_map:
+            col_number = col_idx_map[col_name]
+            for row_idx in range(1, ws.max_row + 1):
+                ws.cell(row=row_idx, column=col_number).alignment = center_alignment
+
+    for column_idx, column_name in enumerate(dataframe.columns):
+        column_letter = get_column_letter(column_idx + 1)
+        try:
+            max_length = max(len(str(cell.value)) for cell in ws[column_letter] if cell.value is not None)
+            adjusted_width = (max_length + 2)
+            if adjusted_width > 0:
+                ws.column_dimensions[column_letter].width = adjusted_width
+        except ValueError:
+            pass
+            
+    # --- BLOK BARU UNTUK WARNA FILL ---
+    # Hex RRGGBB (tanpa #)
+    fill_color = PatternFill(start_color="f6edc3",
+                             end_color="f6edc3",
+                             fill_type="solid")
+    
+    kolom_warna = ['Start Time', 'Finish Time', 'Duration']
+
+    for col_name in kolom_warna:
+        if col_name in col_idx_map:
+            col_number = col_idx_map[col_name]
+            # Mulai dari baris 1 (header) sampai baris terakhir
+            for row_idx in range(1, ws.max_row + 1):
+                ws.cell(row=row_idx, column=col_number).fill = fill_color
+    # --- AKHIR BLOK BARU ---
+
+    merah_fill = PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid")
+    start_date_col_idx = col_idx_map.get('Start Date')
+    finish_date_col_idx = col_idx_map.get('Finish Date')
+    if start_date_col_idx and finish_date_col_idx:
+        for row in range(2, ws.max_row + 1):
+            start_date_cell = ws.cell(row=row, column=start_date_col_idx)
+            finish_date_cell = ws.cell(row=row, column=finish_date_col_idx)
+            if start_date_cell.value and finish_date_cell.value and start_date_cell.value != finish_date_cell.value:
+                start_date_cell.fill = merah_fill
+                finish_date_cell.fill = merah_fill
+
+    wb.save(filename)
+
+# =============================================================================
+# BAGIAN 2: FUNGSI PEMROSESAN UTAMA
+# =============================================================================
+
+def filter_duplikat(grup):
+    """
+    Membuang sesi start-finish satu driver yang kalah dari sesi lain: ada sesi
+    dengan durasi DAN jarak yang sama-sama lebih besar. Urutan baris tetap.
+
+    Sesi diurutkan dari durasi terbesar, lalu jarak maksimum kumulatif dari
+    sesi berdurasi lebih besar (bukan sama) dibandingkan dengan jarak tiap
+    sesi, sehingga O(n log n) alih-alih membandingkan setiap pasangan baris.
+    """
+    durasi = grup['finish.totalDuration_menit'].to_numpy()
+    jarak = grup['finish.totalDistance'].to_numpy(dtype=float)
+
+    urutan = np.argsort(-durasi, kind='stable')
+    durasi_urut = -durasi[urutan]
+    jarak_maks = np.maximum.accumulate(jarak[urutan])
+    # Posisi sesi pertama dengan durasi yang sama; sesi sebelumnya berdurasi lebih besar
+    awal_durasi = np.searchsorted(durasi_urut, durasi_urut, side='left')
+    jarak_maks_sebelum = np.where(awal_durasi > 0, jarak_maks[awal_durasi - 1], -np.inf)
+
+    dibuang = np.empty(len(grup), dtype=bool)
+    dibuang[urutan] = jarak[urutan] < jarak_maks_sebelum
+    return grup[~dibuang]
+
+def kumpulkan_data(dates, app_instance=None):
+    """
+    Mengambil dan mengolah riwayat start-finish untuk lokasi di config.
+    Mengembalikan dict berisi "sheets" (nama sheet -> DataFrame), "lokasi"
+    dan "file_basename"; None/False bila gagal (pesan sudah ditampilkan).
+    """
+    tanggal_str = dates["dmy"]
+
+    perf.phase("load_config")
+    config = load_config()
+    constants = load_constants()
+    secrets = load_secret()
+    master_data = load_master_data()
+
+    if not config or "lokasi" not in config:
+        show_error_message("Error Konfigurasi", ERROR_MESSAGES["CONFIG_FILE_ERROR"])
+        return False
+    if not constants:
+        show_error_message("Error Konstanta", ERROR_MESSAGES["CONSTANT_FILE_ERROR"])
+        return False
+    if not secrets:
+        show_error_message("Error Rahasia", ERROR_MESSAGES["SECRET_FILE_ERROR"])
+        return False
+    if not master_data:
+        show_error_message("Error Master", ERROR_MESSAGES["MASTER_DATA_MISSING"])
+        return False
+
+    api_token = secrets.get('token')
+    lokasi_code = config.get('lokasi')
+    hub_ids = master_data.get('hub_ids', {})
+    location_id = constants.get('location_id', {})
+
+    if not api_token:
+        show_error_message("Error Token API", ERROR_MESSAGES["API_TOKEN_MISSING"])
+        return False
+    if not lokasi_code:
+        show_error_message("Error Konfigurasi", ERROR_MESSAGES["LOCATION_CODE_MISSING"])
+        return False
+    if lokasi_code not in hub_ids:
+        show_error_message("Error Hub ID", ERROR_MESSAGES["HUB_ID_MISSING"])
+        return False
+
+    lokasi_name = next((name for name, code in location_id.items() if code == lokasi_code), lokasi_code)
+
+    perf.phase("transform")
+    tanggal_obj = datetime.strptime(tanggal_str, "%d-%m-%Y")
+    tanggal_input = tanggal_obj.strftime("%Y-%m-%d")
+    tanggal_from = (tanggal_obj - timedelta(days=1)).strftime("%Y-%m-%d")
+
+    params = {
+        "limit": 1000, "startFinish": "true", "fields": "finish,startTime,email",
+        "timeTo": f"{tanggal_input} 23:59:59", "timeFrom": f"{tanggal_from} 00:00:00",
+        "timeBy": "createdTime"
+    }
+
+    try:
+        # Arsip harian (utils.day_archive) dilewati bila pengguna minta ambil ulang
+        items = None if dates.get("force_refresh") else day_archive.get_or_raise("/location-histories", params)
+        if items is None:
+            response = api_get("/location-histories", params=params)
+            with perf.span("decode"):
+                items = response.json().get("tasks", {}).get("data", [])
+            day_archive.put("/location-histories", params, items)
+    except requests.exceptions.RequestException as e:
+        handle_requests_error(e)
+        return False
+    except Exception as e:
+        show_error_message("API Error", ERROR_MESSAGES["UNKNOWN_ERROR"].format(
+            error_detail=f"{e}\n\n{traceback.format_exc()}"
+        ))
+        return False
+
+    if not items:
+        show_error_message("Error", ERROR_MESSAGES["DATA_NOT_FOUND"])
+        return
+
+    filtered_items = []
+    for item in items:
+        email = item.get("email")
+        if not email or lokasi_code not in email:
+            continue
+        tracked_time = item.get("trackedTime", 0)
+        if tracked_time not in [None, 0] \
+        and abs(tracked_time) >= 10 \
+        and item.get("finish", {}).get("totalDistance", float('inf')) > 5:
+            item_copy = item.copy()            
+            item_copy["startTime"] = tambah_7_jam(item_copy.get("startTime"))
+            if item_copy.get("finish"):
+                item_copy["finish"]["finishTime"] = tambah_7_jam(item_copy["finish"].get("finishTime"))
+                if "totalDuration" in item_copy["finish"]:
+                    item_copy["finish"]["totalDuration"] = convert_to_jam(item_copy["finish"]["totalDuration"])
+            
+            if "trackedTime" in item_copy:
+                item_copy["trackedTime"] = abs(item_copy["trackedTime"])
+                item_copy["trackedTime"] = convert_to_jam(item_copy["trackedTime"])
+            
+            filtered_items.append(item_copy)
+
+    if not filtered_items:
+        show_error_message("Error", "Tidak ada data yang lolos filter untuk lokasi yang dipilih.")
+        return
+
+    df_api_data = pd.json_normalize(filtered_items)
+    
+    # Ganti nama kolom 'email' menjadi 'Email' agar sesuai dengan master data
+    df_api_data.rename(columns={"email": "Email"}, inplace=True)
+
+    # Pastikan kolom 'startTime' ada sebelum difilter
+    if 'startTime' in df_api_data.columns:
+        df_api_data['startTime'] = pd.to_datetime(df_api_data['startTime'])
+        df_api_data = df_api_data[df_api_data['startTime'].dt.strftime("%Y-%m-%d") == tanggal_input]
+
+    if df_api_data.empty:
+        show_error_message("Error", "Tidak ada data yang cocok dengan tanggal yang dipilih setelah filter.")
+        return
+
+    try:
+        mapping_df = master_data["df"]
+        # Filter master data sesuai lokasi
+        mapping_df_filtered = mapping_df[mapping_df['Email'].str.contains(lokasi_code, na=False, case=False)]
+        
+        # Gabungkan data API yang sudah difilter dengan master data yang sudah difilter
+        df_merged = df_api_data.merge(mapping_df_filtered[['Email', 'Driver', 'Plat']], on='Email', how='left')
+
+        df_merged['Driver'] = df_merged['Driver'].fillna(df_merged['Email'])
+        df_merged['Plat'] = df_merged['Plat'].fillna('')
+        df_merged.drop(columns=['Email'], inplace=True)
+
+    except Exception as e:
+        show_error_message("Error", ERROR_MESSAGES["UNKNOWN_ERROR"].format(error_detail=e))
+        return
+
+    existing_drivers = df_merged['Driver'].unique().tolist()
+    missing_rows_df = mapping_df_filtered[~mapping_df_filtered['Driver'].isin(existing_drivers)].copy()
+    if not missing_rows_df.empty:
+        missing_drivers_df_processed = missing_rows_df[['Driver', 'Plat']].copy()
+        for col in df_merged.columns:
+            if col not in missing_drivers_df_processed.columns:
+                missing_drivers_df_processed[col] = ""
+        missing_drivers_df_processed = missing_drivers_df_processed[df_merged.columns]
+        final_df = pd.concat([df_merged, missing_drivers_df_processed], ignore_index=True)
+    else:
+        final_df = df_merged.copy()
+
+    def durasi_ke_menit(durasi_str):
+        try:
+            if isinstance(durasi_str, str) and ':' in durasi_str:
+                jam, menit = map(int, durasi_str.split(':'))
+                return jam * 60 + menit
+        except (ValueError, AttributeError):
+            pass
+        return 0
+
+    final_df['finish.totalDuration_menit'] = final_df['finish.totalDuration'].apply(durasi_ke_menit)
+    final_df['finish.totalDistance'] = pd.to_numeric(final_df['finish.totalDistance'], errors='coerce').fillna(0)
+    
+    non_empty_df = final_df[final_df['finish.totalDuration_menit'] > 0]
+    groups = [filter_duplikat(group) for _, group in non_empty_df.groupby('Driver')]
+    filtered_df_final = pd.concat(groups, ignore_index=True) if groups else pd.DataFrame()
+
+    kosong_df = final_df[final_df['finish.totalDuration_menit'] == 0]
+    final_df = pd.concat([filtered_df_final, kosong_df], ignore_index=True)
+    final_df.drop(columns=['finish.totalDuration_menit'], inplace=True)
+
+    # Blok pengurutan SEWA
+    if not final_df.empty:
+        final_df['is_sewa'] = (
+            final_df['Plat'].str.contains('SEWA', case=False, na=False) |
+            final_df['Driver'].str.contains('SEWA', case=False, na=False)
+        ).astype(int)
+        conditions = [
+            final_df['Driver'].str.contains('DRY', case=False, na=False),
+            final_df['Driver'].str.contains('FRZ', case=False, na=False)
+        ]
+        choices = [1, 2]
+        final_df['sewa_category'] = np.select(conditions, choices, default=3)
+        final_df = final_df.sort_values(
+            by=['is_sewa', 'sewa_category', 'Driver'],
+            ascending=[True, True, True]
+        ).reset_index(drop=True)
+        final_df = final_df.drop(columns=['is_sewa', 'sewa_category'])
+
+    tanggal_format_titik = tanggal_str.replace('-', '.')
+    return {
+        "lokasi": lokasi_code,
+        "lokasi_name": lokasi_name,
+        "file_basename": f"Time Summary - {tanggal_format_titik} - {lokasi_name}",
+        "sheets": {SHEET_UTAMA: siapkan_dataframe(final_df)},
+    }
+
+def ambil_data(dates, app_instance=None):
+    data = kumpulkan_data(dates, app_instance)
+    if not data:
+        return False
+
+    perf.phase("other")
+    filename = get_save_path(data["file_basename"])
+    if not filename:
+        show_info_message("Dibatalkan", INFO_MESSAGES["CANCELED_BY_USER"])
+        return
+
+    tulis_laporan(data, filename)
+    perf.phase("open")
+    open_file_externally(filename)
+    return True
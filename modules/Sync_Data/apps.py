@@ -1,41 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
 import requests
-import json
-import os
+import time
 import tkinter as tk
 import traceback
 from utils.function import (
-    MASTER_JSON_PATH,
-    TYPE_MAP_PATH,
+    SYNC_STATE_PATH,
+    collect_errors,
     load_config,
     load_constants,
+    load_json_data,
     load_master_data,
     load_secret,
+    load_type_map,
     save_json_data,
+    save_master_sync,
+    save_type_map,
     show_error_message,
     show_ask_message
 )
 from utils.messages import ERROR_MESSAGES, ASK_MESSAGES
 from utils.api_handler import handle_requests_error
-
-# =============================================================================
-# LOAD / SAVE TYPE MAP
-# =============================================================================
-def load_type_map():
-    # Jika belum ada file → buat kosong
-    if not os.path.exists(TYPE_MAP_PATH):
-        with open(TYPE_MAP_PATH, "w", encoding="utf-8") as f:
-            json.dump({"type": {}}, f, indent=4)
-        return {}
-    try:
-        with open(TYPE_MAP_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return data.get("type", {})
-    except Exception:
-        return {}
-
-def save_type_map(type_map):
-    with open(TYPE_MAP_PATH, "w", encoding="utf-8") as f:
-        json.dump({"type": type_map}, f, indent=4)
+from utils.api_client import api_get, get_conditional_stats, reset_retry_budget
 
 # =============================================================================
 # ASK USER UNTUK SUBSTITUSI TYPE (hanya saat type_map kosong)
@@ -120,13 +106,9 @@ def ask_type_substitution(plat, original_type, assignee_email, driver_users, con
 # =============================================================================
 # SYNC HUB IDS
 # =============================================================================
-def sync_hub(api_token, constants):
-    base_url = constants.get("base_url")
-    url = f"{base_url}/hubs"
-    headers = {"Authorization": f"Bearer {api_token}"}
+def sync_hub(constants):
     try:
-        resp = requests.get(url, headers=headers, timeout=30)
-        resp.raise_for_status()
+        resp = api_get("/hubs")
         data = resp.json().get("data", [])
         excluded_id = "683924970c29c079e30d862f"
         location_id = constants.get("location_id", {})
@@ -150,15 +132,32 @@ def sync_hub(api_token, constants):
 # =============================================================================
 # FETCH VEHICLES (gunakan type_map + substitusi manual pertama kali)
 # =============================================================================
-def fetch_and_process_vehicle_data(api_token, hub_id, constants, type_map, driver_users, rest_config):
-    base_url = constants.get('base_url')
-    api_url = f'{base_url}/vehicles'
-    headers = {'Authorization': f'Bearer {api_token}'}
+def fetch_vehicles(hub_id, since=None):
+    """
+    Mengambil data kendaraan mentah dari API (tanpa mapping tipe).
+    Jika `since` diisi, hanya kendaraan yang berubah sejak waktu tersebut yang diminta.
+    """
     params = {'limit': 100, 'hubId': hub_id}
+    if since:
+        params[DELTA_SINCE_PARAM] = since
+    try:
+        response = api_get('/vehicles', params=params)
+        return response.json().get('data', [])
+    except requests.exceptions.RequestException as e:
+        handle_requests_error(e)
+        return None
+    except Exception as e:
+        show_error_message(
+            "Error Kendaraan",
+            ERROR_MESSAGES["UNKNOWN_ERROR"].format(
+                error_detail=f"{e}\n\n{traceback.format_exc()}"
+            )
+        )
+        return None
+
+def process_vehicle_data(vehicle_data, constants, type_map, driver_users, rest_config):
+    """Memetakan tipe kendaraan mentah memakai type_map (dialog substitusi bila perlu)."""
     try:
-        response = requests.get(api_url, headers=headers, params=params, timeout=30)
-        response.raise_for_status()
-        vehicle_data = response.json().get('data', [])
         valid_types = constants.get("vehicle_types", [])
         type_map_updated = False
 
@@ -200,9 +199,6 @@ def fetch_and_process_vehicle_data(api_token, hub_id, constants, type_map, drive
 
         return vehicles
 
-    except requests.exceptions.RequestException as e:
-        handle_requests_error(e)
-        return None
     except Exception as e:
         show_error_message(
             "Error Kendaraan",
@@ -212,29 +208,45 @@ def fetch_and_process_vehicle_data(api_token, hub_id, constants, type_map, drive
         )
         return None
 
+def fetch_and_process_vehicle_data(hub_id, constants, type_map, driver_users, rest_config):
+    vehicle_data = fetch_vehicles(hub_id)
+    if vehicle_data is None:
+        return None
+    return process_vehicle_data(vehicle_data, constants, type_map, driver_users, rest_config)
+
 # =============================================================================
 # FETCH USERS
 # =============================================================================
-def fetch_driver_users(api_token, hub_id, constants, lokasi_kode):
-    base_url = constants.get("base_url")
+def is_driver_user(user):
+    """User dianggap driver jika namanya memuat FRZ atau DRY."""
+    name = user.get("name")
+    return bool(name) and ("FRZ" in name or "DRY" in name)
+
+def fetch_users(hub_id, constants, lokasi_kode, since=None):
+    """
+    Mengambil user aktif dengan role driver (belum difilter FRZ/DRY).
+    Jika `since` diisi, hanya user yang berubah sejak waktu tersebut yang diminta,
+    termasuk yang sudah nonaktif (disaring oleh merge_delta).
+    """
     role_ids = constants.get("role_ids", {})
     if lokasi_kode in ("plck", "pldm"):
         driver_id = role_ids.get("driverJkt")
     else:
         driver_id = role_ids.get("driver")
-    api_url = f"{base_url}/users"
-    headers = {"Authorization": f"Bearer {api_token}"}
     params = {
         "roleId": driver_id,
         "hubId": hub_id,
-        "status": "active",
         "limit": 500
     }
+    if since:
+        # Tanpa filter status: user yang dinonaktifkan harus ikut terambil
+        # agar terhapus dari snapshot
+        params[DELTA_SINCE_PARAM] = since
+    else:
+        params["status"] = "active"
     try:
-        resp = requests.get(api_url, headers=headers, params=params, timeout=30)
-        resp.raise_for_status()
-        users = resp.json().get("data", [])
-        return [u for u in users if u.get("name") and ("FRZ" in u["name"] or "DRY" in u["name"])]
+        resp = api_get("/users", params=params)
+        return resp.json().get("data", [])
     
     except requests.exceptions.RequestException as e:
         handle_requests_error(e)
@@ -245,6 +257,97 @@ def fetch_driver_users(api_token, hub_id, constants, lokasi_kode):
         ))
         return None
 
+def fetch_driver_users(hub_id, constants, lokasi_kode):
+    users = fetch_users(hub_id, constants, lokasi_kode)
+    if users is None:
+        return None
+    return [u for u in users if is_driver_user(u)]
+
+# =============================================================================
+# DELTA SYNC (HIGH-WATER MARK PER HUB)
+# =============================================================================
+
+# Parameter query untuk meminta record yang berubah sejak waktu tertentu.
+# Jika server mengabaikannya, record lama tetap tersaring oleh merge_delta.
+DELTA_SINCE_PARAM = "updatedAtFrom"
+CHANGE_FIELDS = ("updatedAt", "updated_at", "modifiedAt")
+
+# Delta tidak pernah memuat record yang dihapus di server atau pindah
+# hub/role, jadi snapshot dibangun ulang lewat full resync berkala
+FULL_RESYNC_DAYS = 7
+
+# Field yang disimpan di snapshot sync_state.json: cukup untuk merge_delta,
+# filter driver/kendaraan, dan pemetaan tipe (bukan record API utuh)
+USER_FIELDS = ("_id", "email", "name", "status") + CHANGE_FIELDS
+VEHICLE_FIELDS = ("_id", "assignee", "name", "tags") + CHANGE_FIELDS
+
+def _record_key(record):
+    return record.get("_id") or record.get("email") or record.get("name")
+
+def _changed_at(record):
+    for field in CHANGE_FIELDS:
+        if record.get(field):
+            return str(record[field])
+    return None
+
+def _slim(records, fields):
+    return [{k: r[k] for k in fields if k in r} for r in records]
+
+def is_active_driver(user):
+    """Driver (FRZ/DRY) yang masih aktif; user tanpa field status dianggap aktif."""
+    return user.get("status", "active") == "active" and is_driver_user(user)
+
+def is_full_sync_due(hub_state, now=None):
+    """True jika full resync terakhir hub ini belum ada atau lebih lama dari FULL_RESYNC_DAYS."""
+    last_full = (hub_state or {}).get("last_full_sync")
+    if not last_full:
+        return True
+    try:
+        last_full = datetime.fromisoformat(last_full)
+    except ValueError:
+        return True
+    return (now or datetime.now()) - last_full >= timedelta(days=FULL_RESYNC_DAYS)
+
+def load_sync_state():
+    """Memuat sync_state.json: {"hub_id": hub terakhir, "hubs": {hub_id: {...}}}."""
+    state = load_json_data(SYNC_STATE_PATH) or {}
+    state.setdefault("hubs", {})
+    return state
+
+def merge_delta(snapshot, delta, since, keep):
+    """
+    Menggabungkan record yang berubah ke snapshot (dict key -> record).
+
+    Args:
+        snapshot (dict): Record hasil sync sebelumnya.
+        delta (list): Record dari API (bisa berisi record lama jika server
+            tidak mendukung filter perubahan).
+        since (str): High-water mark sebelumnya (nilai updatedAt terbesar).
+        keep (function): Record yang tidak lolos dihapus dari snapshot.
+
+    Returns:
+        tuple: (snapshot baru, high-water mark baru)
+    """
+    merged = dict(snapshot)
+    mark = since
+    for record in delta:
+        changed = _changed_at(record)
+        if since and changed and changed < since:
+            continue
+        key = _record_key(record)
+        if key is None:
+            continue
+        if keep(record):
+            merged[key] = record
+        else:
+            merged.pop(key, None)
+        if changed and (mark is None or changed > mark):
+            mark = changed
+    return merged, mark
+
+def is_valid_vehicle(vehicle):
+    return bool(vehicle.get('assignee') and vehicle.get('name') and vehicle.get('tags'))
+
 # =============================================================================
 # UPDATE DRIVER
 # =============================================================================
@@ -286,15 +389,90 @@ def update_driver_master(master_driver, users, vehicles):
     updated_driver = sorted(updated_driver, key=lambda x: x.get("Email", "").lower())
     return updated_driver, was_updated
 
+# =============================================================================
+# EKSEKUTOR TAHAPAN SYNC (DAG)
+# =============================================================================
+def run_stages(stages, max_workers=4):
+    """
+    Menjalankan tahapan sync sebagai DAG kecil: setiap tahap dijalankan begitu
+    semua dependensinya selesai, tahap yang saling bebas berjalan paralel.
+
+    Args:
+        stages (list): List tuple (nama, fungsi, [nama dependensi]). Fungsi
+            menerima dict hasil tahap-tahap sebelumnya.
+        max_workers (int): Jumlah thread maksimal.
+
+    Tahap berjalan di thread pekerja, jadi tidak boleh membuka jendela Tk;
+    pesan error ditampung lalu ditampilkan di thread pemanggil setelah semua
+    tahap selesai.
+
+    Returns:
+        tuple: (results, timings). Tahap yang dependensinya gagal (hasil None)
+        tidak dijalankan dan hasilnya None. timings berisi durasi per tahap (detik).
+    """
+    results = {}
+    timings = {}
+    errors = []
+    pending = {name: (func, deps) for name, func, deps in stages}
+    running = {}
+
+    def timed(func, inputs):
+        start = time.perf_counter()
+        with collect_errors() as stage_errors:
+            value = func(inputs)
+        return value, round(time.perf_counter() - start, 3), stage_errors
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            progressed = True
+            while progressed:
+                progressed = False
+                for name, (func, deps) in list(pending.items()):
+                    if not all(d in results for d in deps):
+                        continue
+                    del pending[name]
+                    progressed = True
+                    if any(results[d] is None for d in deps):
+                        results[name] = None
+                        continue
+                    future = executor.submit(timed, func, dict(results))
+                    running[future] = name
+
+            if not running:
+                # Sisa tahap memiliki dependensi yang tidak pernah terpenuhi
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name], timings[name], stage_errors = future.result()
+                errors.extend(stage_errors)
+
+    for error in errors:
+        title, _, message = error.partition(": ")
+        show_error_message(title, message)
+    return results, timings
+
 # =============================================================================
 # MAIN
 # =============================================================================
-def main(rest_config):
+def main(rest_config, full_resync=False):
+    """
+    Sinkronisasi hub, driver, dan kendaraan ke master store (master.db).
+
+    Secara default hanya record yang berubah sejak sync terakhir yang diambil
+    (delta sync). Full resync dilakukan jika full_resync=True, belum ada
+    state sync untuk hub ini, hub berbeda dari sync sebelumnya, atau full
+    resync terakhir lebih lama dari FULL_RESYNC_DAYS (agar record yang
+    dihapus di server ikut hilang dari snapshot).
+    """
+    sync_start = time.perf_counter()
+    reset_retry_budget()
     try:
         constants = load_constants()
         config = load_config()
         secrets = load_secret()
-        type_map = load_type_map()
+        type_map = (load_type_map() or {}).get("type", {})
 
         if not constants or not config or not secrets:
             show_error_message("Gagal", ERROR_MESSAGES["CONFIG_FILE_ERROR"])
@@ -322,37 +500,111 @@ def main(rest_config):
             show_error_message("Gagal", ERROR_MESSAGES["LOCATION_CODE_MISSING"])
             return
 
-        # Selalu sync hub dari API
-        new_hub_ids = sync_hub(api_token, constants)
-        if new_hub_ids is None:
-            return
-
-        if hub_ids != new_hub_ids:
-            hub_ids.update(new_hub_ids)
-
-        # Sort berdasarkan key ascending
-        hub_ids = dict(sorted(hub_ids.items()))
-        
-        hub_id = hub_ids.get(lokasi_kode)
-        if not hub_id:
-            show_error_message("Gagal", ERROR_MESSAGES["HUB_ID_MISSING"])
-            return
-
-        # Ambil users & vehicles (boleh saja master_df None — fungsi aman terhadap itu)
-        users = fetch_driver_users(api_token, hub_id, constants, lokasi_kode)
-        vehicles = fetch_and_process_vehicle_data(api_token, hub_id, constants, type_map, users, rest_config)
-
         # Siapkan master records aman untuk update_driver_master
         if master_df is not None and hasattr(master_df, "to_dict"):
             master_records = master_df.to_dict("records")
         else:
             master_records = []
 
-        updated_driver, driver_updated = update_driver_master(master_records, users, vehicles)
-
-        # Simpan jika ada perubahan
+        def stage_hubs(_):
+            # Selalu sync hub dari API
+            new_hub_ids = sync_hub(constants)
+            if new_hub_ids is None:
+                return None
+            merged = dict(hub_ids)
+            if merged != new_hub_ids:
+                merged.update(new_hub_ids)
+            # Sort berdasarkan key ascending
+            merged = dict(sorted(merged.items()))
+            if not merged.get(lokasi_kode):
+                show_error_message("Gagal", ERROR_MESSAGES["HUB_ID_MISSING"])
+                return None
+            return merged
+
+        sync_state = load_sync_state()
+
+        def stage_state(r):
+            hub_id = r["hubs"][lokasi_kode]
+            hub_state = sync_state["hubs"].get(hub_id)
+            is_full = (full_resync or not hub_state or sync_state.get("hub_id") != hub_id
+                       or not master_records or is_full_sync_due(hub_state))
+            if is_full:
+                hub_state = {}
+            return {"hub_id": hub_id, "full": is_full, **hub_state}
+
+        def stage_users(r):
+            state = r["state"]
+            since = state.get("users_since")
+            delta = fetch_users(state["hub_id"], constants, lokasi_kode, since)
+            if delta is None:
+                return None
+            return merge_delta(state.get("users", {}), _slim(delta, USER_FIELDS), since, is_active_driver)
+
+        def stage_raw_vehicles(r):
+            state = r["state"]
+            since = state.get("vehicles_since")
+            delta = fetch_vehicles(state["hub_id"], since)
+            if delta is None:
+                return None
+            return merge_delta(state.get("vehicles", {}), _slim(delta, VEHICLE_FIELDS), since, is_valid_vehicle)
+
+        # hubs -> state -> (users || raw_vehicles) diambil paralel
+        results, timings = run_stages([
+            ("hubs", stage_hubs, []),
+            ("state", stage_state, ["hubs"]),
+            ("users", stage_users, ["state"]),
+            ("raw_vehicles", stage_raw_vehicles, ["state"]),
+        ])
+
+        # Pemetaan tipe bisa membuka dialog substitusi (Tk), jadi dijalankan di
+        # thread pemanggil setelah tahap fetch selesai
+        if results.get("users") is None or results.get("raw_vehicles") is None:
+            timings["total"] = round(time.perf_counter() - sync_start, 3)
+            return timings
+        users_list = list(results["users"][0].values())
+
+        stage_start = time.perf_counter()
+        vehicles_list = process_vehicle_data(list(results["raw_vehicles"][0].values()),
+                                             constants, type_map, users_list, rest_config)
+        timings["vehicles"] = round(time.perf_counter() - stage_start, 3)
+        if vehicles_list is None:
+            timings["total"] = round(time.perf_counter() - sync_start, 3)
+            return timings
+
+        stage_start = time.perf_counter()
+        updated_driver, driver_updated = update_driver_master(master_records, users_list, vehicles_list)
+        timings["merge"] = round(time.perf_counter() - stage_start, 3)
+        timings["total"] = round(time.perf_counter() - sync_start, 3)
+        hub_ids = results["hubs"]
+
+        # Simpan jika ada perubahan; durasi per tahap ikut disimpan untuk analisis waktu startup
         if driver_updated or hub_ids:
-            save_json_data({"driver": updated_driver, "hub_ids": hub_ids}, MASTER_JSON_PATH)
+            sync_meta = {
+                "last_sync": datetime.now().isoformat(timespec="seconds"),
+                "full_resync": results["state"]["full"],
+                "stage_timings": timings,
+                "conditional_requests": get_conditional_stats(),
+            }
+            # Master store hanya menulis baris yang isinya berubah
+            save_master_sync(drivers=updated_driver, hub_ids=hub_ids, sync_meta=sync_meta)
+
+        # High-water mark dan snapshot disimpan setelah master store berhasil diperbarui
+        hub_id = results["state"]["hub_id"]
+        users, users_since = results["users"]
+        vehicles, vehicles_since = results["raw_vehicles"]
+        now = datetime.now().isoformat(timespec="seconds")
+        sync_state["hub_id"] = hub_id
+        sync_state["hubs"][hub_id] = {
+            "last_sync": now,
+            "last_full_sync": now if results["state"]["full"] else results["state"].get("last_full_sync"),
+            "users_since": users_since,
+            "vehicles_since": vehicles_since,
+            "users": users,
+            "vehicles": vehicles,
+        }
+        save_json_data(sync_state, SYNC_STATE_PATH)
+
+        return timings
 
     except Exception as e:
         show_error_message("Error Tidak Dikenal", ERROR_MESSAGES["UNKNOWN_ERROR"].format(error_detail=e))
@@ -0,0 +1,176 @@
+# Jalur data Vehicles Data: tanpa Tk, dipakai oleh apps.py dan cli.py
+import requests
+import pandas as pd
+import openpyxl
+from datetime import datetime
+import traceback
+
+from utils.function import (
+    get_master_lookups,
+    get_save_path,
+    load_config,
+    load_constants,
+    load_master_data,
+    load_secret,
+    open_file_externally,
+    show_error_message
+)
+from utils.messages import ERROR_MESSAGES
+from utils.api_handler import handle_requests_error
+from utils.api_client import api_get
+
+
+def auto_size_columns(workbook):
+    for sheet_name in workbook.sheetnames:
+        worksheet = workbook[sheet_name]
+        for col in worksheet.columns:
+            max_length = 0
+            column = col[0].column_letter
+            for cell in col:
+                try:
+                    if cell.value and len(str(cell.value)) > max_length:
+                        max_length = len(str(cell.value))
+                except (ValueError, TypeError):
+                    pass
+            adjusted_width = min(max_length + 2, 50)
+            worksheet.column_dimensions[column].width = adjusted_width
+
+
+def fetch_and_prepare_data():
+    """Ambil data API, kelola, return dict dataframe tanpa simpan file."""
+    config = load_config()
+    constants = load_constants()
+    secrets = load_secret()
+    master_data = load_master_data()
+
+    if not (config and constants and secrets and master_data):
+        return None, None
+
+    api_token = secrets.get("token")
+    lokasi_code = config.get("lokasi")
+    hub_ids = master_data.get("hub_ids", {})
+    location_id = constants.get("location_id", {})
+
+    if not (api_token and lokasi_code and lokasi_code in hub_ids):
+        return None, None
+
+    hub_id = hub_ids[lokasi_code]
+    params = {"limit": 500, "hubId": hub_id}
+
+    try:
+        response = api_get("/vehicles", params=params)
+        vehicles_data = response.json().get("data", [])
+        if not vehicles_data:
+            return None, None
+
+        driver_mapping = get_master_lookups()["email_to_driver"]
+
+        template_data = []
+        master_data_list = []
+
+        for vehicle in vehicles_data:
+            working_time = vehicle.get("workingTime", {})
+            capacity = vehicle.get("capacity", {})
+            weight_cap = capacity.get("weight", {})
+            volume_cap = capacity.get("volume", {})
+            tags = vehicle.get("tags", [])
+
+            template_data.append({
+                "Name*": vehicle.get("name", ""),
+                "Assignee": vehicle.get("assignee", ""),
+                "Start Time": working_time.get("startTime", ""),
+                "End Time": working_time.get("endTime", ""),
+                "Break Start": "",
+                "Break End":  "",
+                "Multiday": working_time.get("multiday") or 0,
+                "Speed Km/h": "",
+                "Cost Factor": "",
+                "Vehicle Tags": "; ".join(tags),
+                "weight Min": weight_cap.get("min", ""),
+                "weight Max": weight_cap.get("max", ""),
+                "volume Min": volume_cap.get("min", ""),
+                "volume Max": volume_cap.get("max", ""),
+            })
+
+            assignee_email = (vehicle.get("assignee", "") or "").lower()
+            vehicle_type_raw = tags[0] if tags else ""
+            if vehicle_type_raw == "FROZEN-KFC":
+                vehicle_type_raw = "FROZEN-CDD-LONG-5000"
+            elif vehicle_type_raw == "DRY-HAVI":
+                vehicle_type_raw = "DRY-FUSO-LONG"
+
+            driver_name = driver_mapping.get(assignee_email, assignee_email)
+            master_data_list.append({
+                "License Plat": vehicle.get("name", ""),
+                "Type": vehicle_type_raw,
+                "Email": assignee_email,
+                "Name": driver_name,
+            })
+
+        df_template = pd.DataFrame(template_data)
+        df_master = pd.DataFrame(master_data_list)
+        df_conditional = pd.DataFrame()
+
+        if not df_master.empty and "Email" in df_master.columns and "License Plat" in df_master.columns:
+            df_master['plat_len'] = df_master['License Plat'].astype(str).str.len()
+            df_master = df_master.sort_values(by=['Email', 'plat_len'], ascending=[True, True])
+            duplicate_mask = df_master.duplicated(subset='Email', keep='first')
+            
+            if duplicate_mask.any():
+                df_conditional = df_master[duplicate_mask].copy()
+                df_master = df_master[~duplicate_mask].copy()
+
+            df_master = df_master.drop(columns=['plat_len'])
+            if not df_conditional.empty:
+                df_conditional = df_conditional.drop(columns=['plat_len'])
+
+        if not df_master.empty and "Email" in df_master.columns:
+            df_master = df_master.sort_values(by="Email", ascending=True).reset_index(drop=True)
+        if not df_template.empty and "Assignee" in df_template.columns:
+            df_template = df_template.sort_values(by="Assignee", ascending=True).reset_index(drop=True)
+
+        # Mulai dengan Master Vehicle
+        dfs = {"Master Vehicle": df_master}
+
+        # Jika ada data duplikat, sisipkan Conditional Vehicle di urutan kedua
+        if not df_conditional.empty:
+            dfs["Conditional Vehicle"] = df_conditional.sort_values(by="Email", ascending=True).reset_index(drop=True)
+        
+        # Tambahkan Template Vehicle di urutan terakhir
+        dfs["Template Vehicle"] = df_template
+
+        lokasi_name = next((n for n, c in location_id.items() if c == lokasi_code), lokasi_code)
+        return dfs, lokasi_name
+
+    except requests.exceptions.RequestException as e:
+        handle_requests_error(e)
+    except Exception as e:
+        show_error_message("Error Tak Terduga", ERROR_MESSAGES["UNKNOWN_ERROR"].format(
+            error_detail=f"{e}\n\n{traceback.format_exc()}"
+        ))
+    return None, None
+
+
+def simpan_excel(dfs, save_path):
+    """Menulis semua DataFrame (satu sheet per key) lalu merapikan lebar kolom."""
+    with pd.ExcelWriter(save_path, engine="openpyxl") as writer:
+        for sheet_name, df_item in dfs.items():
+            df_item.to_excel(writer, index=False, sheet_name=sheet_name, na_rep="")
+    workbook = openpyxl.load_workbook(save_path)
+    auto_size_columns(workbook)
+    workbook.save(save_path)
+
+
+def buat_laporan():
+    """Jalur tanpa GUI (cli.py): ambil data kendaraan lalu simpan Excel. Mengembalikan path file, atau None."""
+    dfs, lokasi_name = fetch_and_prepare_data()
+    if not dfs:
+        show_error_message("Data Tidak Ditemukan", ERROR_MESSAGES["DATA_NOT_FOUND"])
+        return None
+    date_str = datetime.now().strftime("%d.%m.%Y")
+    save_path = get_save_path(f"Vehicle Data - {date_str} - {lokasi_name}")
+    if not save_path:
+        return None
+    simpan_excel(dfs, save_path)
+    open_file_externally(save_path)
+    return save_path
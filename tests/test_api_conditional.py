@@ -0,0 +1,75 @@
+# tests/test_api_conditional.py
+
+import json
+import pytest
+import utils.function as function
+from utils import api_client, response_cache
+from tools.fake_server import start_in_background
+
+HUBS = [{"_id": "hub-1", "name": "Hub Cikarang"}, {"_id": "hub-2", "name": "Hub Bandung"}]
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """Server tiruan MileApp dengan fixture /hubs; cache dan konfigurasi di tmp_path."""
+    fixtures = tmp_path / "fixtures"
+    fixtures.mkdir()
+    (fixtures / "hubs.json").write_text(json.dumps(HUBS), encoding="utf-8")
+    fake, base_url = start_in_background(str(fixtures))
+
+    constant_path = tmp_path / "constant.json"
+    constant_path.write_text(json.dumps({"base_url": base_url}), encoding="utf-8")
+    secret_path = tmp_path / "secret.json"
+    secret_path.write_text(json.dumps({"token": "test"}), encoding="utf-8")
+    monkeypatch.setattr(function, "CONSTANT_PATH", str(constant_path))
+    monkeypatch.setattr(function, "SECRET_PATH", str(secret_path))
+    monkeypatch.setattr(response_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    api_client.reset_session()
+    yield fake
+    api_client.reset_session()
+    fake.shutdown()
+    fake.server_close()
+
+
+def _stats_delta(before):
+    after = api_client.get_conditional_stats()
+    return {kind: after[kind] - before[kind] for kind in after}
+
+
+def test_request_kedua_dilayani_304_dari_body_tersimpan(server):
+    before = api_client.get_conditional_stats()
+    first = api_client.api_get("/hubs")
+    assert first.status_code == 200
+    assert response_cache.get_validated("/hubs", None)["etag"] == first.headers["ETag"]
+
+    second = api_client.api_get("/hubs")
+    assert second.status_code == 200
+    assert second.json() == first.json() == {"status": True, "data": HUBS}
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert _stats_delta(before) == {"hits": 1, "misses": 1}
+
+
+def test_validator_per_params(server):
+    before = api_client.get_conditional_stats()
+    api_client.api_get("/hubs", params={"limit": 1})
+    api_client.api_get("/hubs", params={"limit": 2})
+    assert _stats_delta(before) == {"hits": 0, "misses": 2}
+
+
+def test_etag_usang_diganti_body_baru(server):
+    response_cache.put_validated("/hubs", None, '"usang"', None, json.dumps({"status": True, "data": []}))
+    before = api_client.get_conditional_stats()
+
+    response = api_client.api_get("/hubs")
+    assert response.json()["data"] == HUBS
+    assert _stats_delta(before) == {"hits": 0, "misses": 1}
+    stored = response_cache.get_validated("/hubs", None)
+    assert stored["etag"] == response.headers["ETag"]
+    assert json.loads(stored["body"])["data"] == HUBS
+
+
+def test_endpoint_tanpa_validator_tidak_bersyarat(server):
+    before = api_client.get_conditional_stats()
+    assert api_client.api_get("/hubs", conditional=False).json()["data"] == HUBS
+    assert _stats_delta(before) == {"hits": 0, "misses": 0}
+    assert response_cache.get_validated("/hubs", None) is None
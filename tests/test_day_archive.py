@@ -0,0 +1,47 @@
+# tests/test_day_archive.py
+
+import json
+import pytest
+import utils.function as function
+from utils import day_archive, response_cache
+
+pytest.importorskip("pyarrow")
+
+PARAMS = {"hubId": "hub-1", "dateFrom": "2024-05-02", "dateTo": "2024-05-02", "limit": 100}
+ITEMS = [{"_id": "t1", "status": "done", "tags": ["a"]}, {"_id": "t2", "status": "ongoing", "tags": []}]
+
+
+@pytest.fixture(autouse=True)
+def archive(tmp_path, monkeypatch):
+    constant_path = tmp_path / "constant.json"
+    constant_path.write_text(json.dumps({"base_url": "http://arsip.test"}), encoding="utf-8")
+    monkeypatch.setattr(function, "CONSTANT_PATH", str(constant_path))
+    monkeypatch.setattr(day_archive, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    monkeypatch.setattr(response_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    response_cache._memory.clear()
+    day_archive.put("/tasks", PARAMS, ITEMS)
+    yield
+    response_cache._memory.clear()
+
+
+def _read_parquet_gagal(*args, **kwargs):
+    raise AssertionError("arsip di-decode ulang")
+
+
+def test_hit_arsip_dinaikkan_ke_cache_memori(monkeypatch):
+    assert day_archive.get("/tasks", PARAMS) == ITEMS
+    monkeypatch.setattr(day_archive.pd, "read_parquet", _read_parquet_gagal)
+    # Pembacaan berikutnya (arsip maupun response_cache) dilayani dari memori
+    assert day_archive.get("/tasks", PARAMS) == ITEMS
+    assert response_cache.get("/tasks", PARAMS) == ITEMS
+
+
+def test_hasil_arsip_berupa_salinan():
+    first = day_archive.get("/tasks", PARAMS)
+    first[0]["tags"].append("diubah")
+    assert day_archive.get("/tasks", PARAMS) == ITEMS
+
+
+def test_jalur_stream_tidak_mengisi_cache_memori():
+    assert day_archive.get("/tasks", PARAMS, remember=False) == ITEMS
+    assert not response_cache._memory
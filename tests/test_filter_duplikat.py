@@ -0,0 +1,61 @@
+# tests/test_filter_duplikat.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from modules.Start_Finish_Time.report import filter_duplikat
+
+
+def filter_duplikat_pasangan(grup):
+    """
+    Versi lama (setiap pasangan baris dibandingkan), sebagai acuan hasil;
+    kolom dibaca sebagai array agar 400 percobaan tetap cepat.
+    """
+    durasi = grup['finish.totalDuration_menit'].to_numpy()
+    jarak = grup['finish.totalDistance'].to_numpy()
+    idx_to_drop = set()
+    for i in range(len(grup)):
+        for j in range(len(grup)):
+            if i != j:
+                if durasi[i] < durasi[j] and jarak[i] < jarak[j]:
+                    idx_to_drop.add(grup.index[i])
+    return grup.drop(list(idx_to_drop))
+
+
+def sesi(durasi, jarak, index=None):
+    return pd.DataFrame({
+        "Driver": "DRIVER",
+        "finish.totalDuration_menit": durasi,
+        "finish.totalDistance": jarak,
+    }, index=index)
+
+
+@pytest.mark.parametrize("durasi, jarak, tersisa", [
+    ([], [], []),
+    ([30], [5.0], [0]),
+    ([30, 60], [5.0, 10.0], [1]),
+    ([30, 60], [10.0, 5.0], [0, 1]),
+    # Durasi atau jarak sama: tidak saling membuang
+    ([60, 60], [5.0, 10.0], [0, 1]),
+    ([30, 60], [10.0, 10.0], [0, 1]),
+    ([10, 20, 30, 40], [1.0, 2.0, 3.0, 4.0], [3]),
+    ([40, 30, 20, 10], [1.0, 2.0, 3.0, 4.0], [0, 1, 2, 3]),
+])
+def test_kasus_tetap(durasi, jarak, tersisa):
+    grup = sesi(np.array(durasi, dtype='int64'), np.array(jarak, dtype=float))
+    assert list(filter_duplikat(grup).index) == tersisa
+
+
+def test_sama_persis_dengan_versi_pasangan():
+    rng = np.random.default_rng(23)
+    for _ in range(400):
+        size = int(rng.integers(0, 40))
+        # Rentang nilai kecil agar banyak durasi/jarak kembar
+        durasi = rng.integers(1, 12, size)
+        jarak = rng.integers(0, 12, size) / 2
+        index = rng.permutation(1000)[:size]
+        grup = sesi(durasi, jarak, index=index)
+        hasil = filter_duplikat(grup)
+        acuan = filter_duplikat_pasangan(grup)
+        assert list(hasil.index) == list(acuan.index)
+        pd.testing.assert_frame_equal(hasil, acuan)
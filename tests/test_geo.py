@@ -0,0 +1,31 @@
+# tests/test_geo.py
+
+import numpy as np
+import pandas as pd
+from utils import geo
+
+
+def test_parse_latlon_semua_tidak_valid():
+    lat, lon = geo.parse_latlon(pd.Series(['-', 'abc', '1,2,3', 'a,b']))
+    assert np.isnan(lat).all() and np.isnan(lon).all()
+
+
+def test_parse_latlon_semua_kosong():
+    lat, lon = geo.parse_latlon(pd.Series(['', None, np.nan]))
+    assert lat.shape == lon.shape == (3,)
+    assert np.isnan(lat).all() and np.isnan(lon).all()
+
+
+def test_parse_latlon_satu_baris():
+    lat, lon = geo.parse_latlon(pd.Series([' -7.2 , 112.7 ']))
+    assert lat.tolist() == [-7.2] and lon.tolist() == [112.7]
+
+
+def test_latlon_distance_kolom_tanpa_koma():
+    jarak = geo.latlon_distance(pd.Series(['', '-']), pd.Series(['-7.2,112.7', '-7.3,112.8']))
+    assert np.isnan(jarak).all()
+
+
+def test_latlon_distance_titik_sama():
+    jarak = geo.latlon_distance(pd.Series(['-7.2,112.7']), pd.Series(['-7.2, 112.7']))
+    assert jarak.tolist() == [0.0]
@@ -0,0 +1,59 @@
+# tests/test_plate_matcher.py
+
+import pytest
+from utils.plate_matcher import PlateMatcher
+
+PLAT_TO_TYPE = {
+    "B 1234 XYZ": "CDD",
+    "B 123": "L300",
+    "D 9 AB": "FUSO",
+    "9 AB": "CDE",
+}
+
+
+def loop_lama(plat_map, name):
+    """Acuan: loop lama `for plat in plat_map: if plat in name`."""
+    for plat in plat_map:
+        if plat in str(name):
+            return plat
+    return None
+
+
+@pytest.mark.parametrize("name, plat", [
+    ("B 1234 XYZ - CDD DRY", "B 1234 XYZ"),
+    # Plat lebih pendek yang juga cocok kalah karena urutannya di master lebih belakang
+    ("B 123 - L300", "B 123"),
+    ("TRUK D 9 AB", "D 9 AB"),
+    ("X 9 AB", "9 AB"),
+    ("B 12", None),
+    ("", None),
+    (None, None),
+])
+def test_plat_pertama_sesuai_urutan_master(name, plat):
+    matcher = PlateMatcher(PLAT_TO_TYPE)
+    assert matcher.match(name) == plat == loop_lama(PLAT_TO_TYPE, name)
+
+
+def test_urutan_master_menentukan_pemenang():
+    # Plat pendek di depan menang walaupun plat panjang juga muncul di nama
+    plat_map = {"B 123": "L300", "B 1234 XYZ": "CDD"}
+    assert PlateMatcher(plat_map).match("B 1234 XYZ") == "B 123"
+
+
+def test_get_mengembalikan_nilai_plat():
+    matcher = PlateMatcher(PLAT_TO_TYPE)
+    assert matcher.get("B 1234 XYZ - DRY") == "CDD"
+    assert matcher.get("tanpa plat", "-") == "-"
+
+
+def test_plat_tumpang_tindih_lewat_fail_link():
+    plat_map = ["ABCD", "BCX", "C"]
+    for name in ("ABCX", "ABCD", "XBCXY", "ABX", "ZZC"):
+        assert PlateMatcher(plat_map).match(name) == loop_lama(plat_map, name)
+
+
+def test_tanpa_plat_dan_plat_kosong():
+    assert PlateMatcher({}).match("B 1234") is None
+    assert len(PlateMatcher({})) == 0
+    # Plat kosong selalu cocok, sama seperti `"" in name`
+    assert PlateMatcher(["", "B 1"]).match("B 1") == ""
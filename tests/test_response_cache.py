@@ -0,0 +1,137 @@
+# tests/test_response_cache.py
+
+import threading
+import time
+import pytest
+from utils import response_cache
+
+PARAMS = {"hubId": "hub-1", "dateFrom": "2024-05-02", "dateTo": "2024-05-02"}
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(response_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    response_cache._memory.clear()
+    yield
+    response_cache._memory.clear()
+    response_cache._inflight.clear()
+
+
+def _run(target, *args):
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault("value", target(*args)))
+    thread.start()
+    return thread, result
+
+
+def test_dua_pemanggil_satu_load():
+    calls = []
+    entered, release = threading.Event(), threading.Event()
+
+    def loader():
+        calls.append("load")
+        entered.set()
+        release.wait(5)
+        items = [{"_id": "t1"}]
+        response_cache.put("/results", PARAMS, items)
+        return items
+
+    first, first_result = _run(response_cache.single_flight, "/results", PARAMS, loader)
+    assert entered.wait(5)
+    second, second_result = _run(response_cache.single_flight, "/results", PARAMS, loader)
+    # Pemanggil kedua harus sudah menunggu load yang berjalan sebelum dilepas
+    time.sleep(0.2)
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert calls == ["load"]
+    assert first_result["value"] == second_result["value"] == [{"_id": "t1"}]
+    # Setiap pemanggil mendapat objek sendiri
+    first_result["value"][0]["_id"] = "diubah"
+    assert second_result["value"] == [{"_id": "t1"}]
+    assert response_cache.get("/results", PARAMS) == [{"_id": "t1"}]
+
+
+def test_force_refresh_tidak_ikut_load_biasa():
+    calls = []
+    entered, release = threading.Event(), threading.Event()
+
+    def cached_loader():
+        calls.append("cache")
+        entered.set()
+        release.wait(5)
+        return [{"_id": "lama"}]
+
+    def fresh_loader():
+        calls.append("server")
+        return [{"_id": "baru"}]
+
+    normal, normal_result = _run(response_cache.single_flight, "/results", PARAMS, cached_loader)
+    assert entered.wait(5)
+    # Load paksa selesai sendiri walaupun load biasa masih berjalan
+    forced = response_cache.single_flight("/results", PARAMS, fresh_loader, force_refresh=True)
+    release.set()
+    normal.join(5)
+
+    assert calls == ["cache", "server"]
+    assert forced == [{"_id": "baru"}]
+    assert normal_result["value"] == [{"_id": "lama"}]
+    assert not response_cache._inflight
+
+
+def test_force_refresh_ikut_load_paksa_lain():
+    calls = []
+    entered, release = threading.Event(), threading.Event()
+
+    def loader():
+        calls.append("server")
+        entered.set()
+        release.wait(5)
+        return [{"_id": "baru"}]
+
+    first, first_result = _run(response_cache.single_flight, "/results", PARAMS, loader, True)
+    assert entered.wait(5)
+    second, second_result = _run(response_cache.single_flight, "/results", PARAMS, loader, True)
+    time.sleep(0.2)
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert calls == ["server"]
+    assert first_result["value"] == second_result["value"] == [{"_id": "baru"}]
+
+
+def test_exception_diteruskan_ke_pemanggil_yang_menunggu():
+    entered, release = threading.Event(), threading.Event()
+
+    def loader():
+        entered.set()
+        release.wait(5)
+        raise RuntimeError("gagal")
+
+    errors = []
+
+    def call():
+        try:
+            response_cache.single_flight("/results", PARAMS, loader)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call)]
+    threads[0].start()
+    assert entered.wait(5)
+    threads.append(threading.Thread(target=call))
+    threads[1].start()
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert errors == ["gagal", "gagal"]
+
+
+def test_hit_memori_tanpa_loader_dan_salinan_terpisah():
+    response_cache.put("/results", PARAMS, [{"_id": "t1"}])
+    first = response_cache.single_flight("/results", PARAMS, lambda: pytest.fail("loader dipanggil"))
+    first[0]["_id"] = "diubah"
+    assert response_cache.single_flight("/results", PARAMS, lambda: None) == [{"_id": "t1"}]
@@ -0,0 +1,45 @@
+# tests/test_routing_transaction.py
+
+import subprocess
+import sys
+from modules.Routing_Transaction.report import extract_customer_and_location, parse_routing_results
+
+
+def route(vehicle, trips):
+    return {"dispatchStatus": "done", "result": {"routing": [{"vehicleName": vehicle, "trips": trips}]}}
+
+
+def hub(order, etd):
+    return {"order": order, "isHub": True, "visitName": "HUB", "etd": etd}
+
+
+def stop(order, visit_name):
+    return {"order": order, "visitName": visit_name}
+
+
+def test_report_tanpa_tkinter():
+    # Proses terpisah: modul lain di sesi pytest boleh saja sudah memuat tkinter
+    code = "import sys, modules.Routing_Transaction.report; print('tkinter' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "False"
+
+
+def test_extract_customer_and_location():
+    assert extract_customer_and_location("Toko A C0123 LOC2 SO1-1") == ("C0123", "LOC2")
+    assert extract_customer_and_location("Toko B C0456 MAIN") == ("C0456", "MAIN")
+    assert extract_customer_and_location("Tanpa kode") == ("", "")
+    assert extract_customer_and_location(None) == ("", "")
+
+
+def test_parse_dan_urut_berdasarkan_etd_hub():
+    results = [
+        route("B 2 B", [hub(0, "09:00:00"), stop(1, "Toko C0002 MAIN SO2-1, SO2-2")]),
+        route("B 1 A", [stop(2, "Toko C0001 LOC1 SO1-1"), hub(0, "07:00:00"), stop(1, "Tanpa SO C0003 MAIN")]),
+        route("B 3 C", [stop(1, "Tanpa kode")]),
+    ]
+    parsed = parse_routing_results(results)
+
+    assert [v["vehicleName"] for v in parsed] == ["B 1 A", "B 2 B"]
+    assert parsed[0]["numTrips"] == 2
+    assert parsed[0]["detailsPerStop"] == [{"customerID": "C0001", "locationCode": "LOC1", "soNumbers": ["SO1-1"]}]
+    assert parsed[1]["detailsPerStop"][0]["soNumbers"] == ["SO2-1", "SO2-2"]
@@ -0,0 +1,80 @@
+# tests/test_sync_delta.py
+
+from datetime import datetime, timedelta
+from modules.Sync_Data.apps import (
+    FULL_RESYNC_DAYS,
+    USER_FIELDS,
+    _slim,
+    is_active_driver,
+    is_full_sync_due,
+    is_valid_vehicle,
+    merge_delta,
+)
+
+
+def user(_id, name="'DRY' Budi", status="active", updated="2024-05-01T00:00:00Z", **extra):
+    return {"_id": _id, "email": f"{_id}@plck.id", "name": name, "status": status, "updatedAt": updated, **extra}
+
+
+SNAPSHOT = {"u1": user("u1"), "u2": user("u2", name="'FRZ' Andi")}
+SINCE = "2024-05-01T00:00:00Z"
+
+
+def test_record_baru_ditambahkan_dan_mark_naik():
+    merged, mark = merge_delta(SNAPSHOT, [user("u3", updated="2024-05-02T00:00:00Z")], SINCE, is_active_driver)
+    assert set(merged) == {"u1", "u2", "u3"}
+    assert mark == "2024-05-02T00:00:00Z"
+
+
+def test_record_berubah_diperbarui():
+    changed = user("u1", name="'DRY' Budi S", updated="2024-05-02T00:00:00Z")
+    merged, _ = merge_delta(SNAPSHOT, [changed], SINCE, is_active_driver)
+    assert merged["u1"]["name"] == "'DRY' Budi S"
+    assert SNAPSHOT["u1"]["name"] == "'DRY' Budi"
+
+
+def test_record_lama_diabaikan():
+    stale = user("u1", name="'DRY' Lama", updated="2024-04-01T00:00:00Z")
+    merged, mark = merge_delta(SNAPSHOT, [stale], SINCE, is_active_driver)
+    assert merged["u1"]["name"] == "'DRY' Budi"
+    assert mark == SINCE
+
+
+def test_user_nonaktif_dihapus():
+    deactivated = user("u2", name="'FRZ' Andi", status="inactive", updated="2024-05-02T00:00:00Z")
+    merged, _ = merge_delta(SNAPSHOT, [deactivated], SINCE, is_active_driver)
+    assert set(merged) == {"u1"}
+
+
+def test_bukan_driver_lagi_dihapus():
+    renamed = user("u1", name="Budi Admin", updated="2024-05-02T00:00:00Z")
+    merged, _ = merge_delta(SNAPSHOT, [renamed], SINCE, is_active_driver)
+    assert set(merged) == {"u2"}
+
+
+def test_kendaraan_tanpa_assignee_dihapus():
+    snapshot = {"v1": {"_id": "v1", "assignee": "u1@plck.id", "name": "B 1 A", "tags": ["CDD DRY"]}}
+    unassigned = {"_id": "v1", "assignee": "", "name": "B 1 A", "tags": ["CDD DRY"], "updatedAt": "2024-05-02"}
+    merged, _ = merge_delta(snapshot, [unassigned], None, is_valid_vehicle)
+    assert merged == {}
+
+
+def test_full_resync_membuang_record_yang_dihapus_di_server():
+    # Full resync dimulai dari snapshot kosong: record yang tidak lagi dikirim server hilang
+    merged, _ = merge_delta({}, [user("u1")], None, is_active_driver)
+    assert set(merged) == {"u1"}
+
+
+def test_snapshot_hanya_menyimpan_field_yang_dipakai():
+    slim = _slim([user("u1", phone="0812", roleId="r1")], USER_FIELDS)[0]
+    assert set(slim) == {"_id", "email", "name", "status", "updatedAt"}
+
+
+def test_full_resync_berkala():
+    now = datetime(2024, 5, 10, 8, 0)
+    fresh = (now - timedelta(days=FULL_RESYNC_DAYS - 1)).isoformat()
+    stale = (now - timedelta(days=FULL_RESYNC_DAYS)).isoformat()
+    assert not is_full_sync_due({"last_full_sync": fresh}, now)
+    assert is_full_sync_due({"last_full_sync": stale}, now)
+    assert is_full_sync_due({}, now)
+    assert is_full_sync_due({"last_full_sync": "bukan tanggal"}, now)
@@ -0,0 +1,54 @@
+# tests/test_vehicle_types.py
+
+import pytest
+from utils.vehicle_types import VehicleTypeClassifier
+
+VEHICLE_TYPES = ['L300', 'CDE', 'CDE-LONG', 'CDD', 'CDD-LONG', 'FUSO', 'FUSO-LONG']
+
+
+@pytest.mark.parametrize("tag, kategori, tipe", [
+    ("CDD DRY", "DRY", "CDD"),
+    ("CDD-LONG FROZEN", "FROZEN", "CDD-LONG"),
+    ("FROZEN-CDE-LONG", "FROZEN", "CDE-LONG"),
+    # Perubahan yang disengaja: FUSO-LONG dihitung sebagai FUSO-LONG, bukan FUSO
+    ("FUSO-LONG DRY", "DRY", "FUSO-LONG"),
+    ("FUSO DRY", "DRY", "FUSO"),
+    # Tag dengan DRY dan FROZEN sekaligus dihitung sekali sebagai DRY
+    ("DRY FROZEN CDD", "DRY", "CDD"),
+    ("L300", None, "L300"),
+    ("TRONTON DRY", "DRY", None),
+    (None, None, None),
+])
+def test_kategori_dan_tipe_terpanjang(tag, kategori, tipe):
+    row = VehicleTypeClassifier(VEHICLE_TYPES).classify([tag]).iloc[0]
+    assert row["Kategori"] == kategori
+    assert row["Tipe"] == tipe
+
+
+def test_tipe_sama_panjang_ikut_urutan_vehicle_types():
+    classifier = VehicleTypeClassifier(["CDE", "CDD"])
+    assert classifier.classify(["CDD CDE DRY"]).iloc[0]["Tipe"] == "CDE"
+
+
+def test_type_map_dan_huruf_besar():
+    classifier = VehicleTypeClassifier(VEHICLE_TYPES, {"Truk Engkel": "cdd dry"})
+    row = classifier.classify(["Truk Engkel"], upper=True).iloc[0]
+    assert (row["Tag"], row["Kategori"], row["Tipe"]) == ("CDD DRY", "DRY", "CDD")
+    # Tanpa upper=True huruf kecil tidak dikenali
+    assert classifier.classify(["Truk Engkel"]).iloc[0]["Kategori"] is None
+
+
+def test_usage_counts_dan_tabel():
+    tags = ["CDD DRY", "CDD DRY", "CDD FROZEN", "FUSO-LONG DRY", "DRY FROZEN L300", "TRONTON DRY"]
+    classifier = VehicleTypeClassifier(VEHICLE_TYPES)
+    counts = classifier.usage_counts(tags)
+    assert list(counts) == VEHICLE_TYPES
+    assert counts["CDD"] == {"DRY": 2, "FROZEN": 1}
+    assert counts["FUSO-LONG"] == {"DRY": 1, "FROZEN": 0}
+    assert counts["FUSO"] == {"DRY": 0, "FROZEN": 0}
+    assert counts["L300"] == {"DRY": 1, "FROZEN": 0}
+
+    table = classifier.usage_table(tags).set_index("Tipe Kendaraan")
+    assert table.loc["CDD", "Jumlah (DRY)"] == 2
+    assert table.loc["CDD", "Jumlah (FROZEN)"] == 1
+    assert table.loc["CDE"].isna().all()
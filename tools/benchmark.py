@@ -0,0 +1,685 @@
+# tools/benchmark.py
+"""
+Benchmark end-to-end setiap laporan terhadap data sintetis.
+
+Untuk setiap ukuran (jumlah task), data dibuat dengan tools/synthetic_data.py,
+disajikan oleh tools/fake_server.py, lalu jalur data tiap laporan dijalankan
+tanpa GUI di proses terpisah (agar peak RSS terukur per laporan). Per tahap
+dicatat wall time, CPU time, peak RSS dan ukuran file output, lalu hasilnya
+ditambahkan ke file riwayat JSON.
+
+Contoh:
+    python -m tools.benchmark run --sizes 100 1000 10000 --label "sebelum refactor"
+    python -m tools.benchmark run --reports delivery_summary_api --sizes 1000
+    python -m tools.benchmark list
+    python -m tools.benchmark compare            # dua run terakhir
+    python -m tools.benchmark compare --base 0 --target -1 --threshold 15
+    python -m tools.benchmark filter-duplikat --sessions 10 100 1000
+"""
+
+from datetime import date, datetime
+from types import SimpleNamespace
+import argparse
+import functools
+import inspect
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from tools import synthetic_data
+from tools.fake_server import start_in_background
+from utils import master_store
+
+# =============================================================================
+# KONFIGURASI
+# =============================================================================
+
+HISTORY_PATH = os.path.join(REPO_ROOT, 'benchmark_history.json')
+DEFAULT_SIZES = (100, 1000, 10000)
+
+# Task per rute; jumlah driver = ukuran / STOPS_PER_ROUTE
+STOPS_PER_ROUTE = 20
+LOKASI = "plck"
+DELIVERY_DATE = date(2024, 5, 2)
+SEED = 1
+
+# Selisih wall time di bawah ini dianggap noise saat membandingkan run
+NOISE_FLOOR_SECONDS = 0.05
+
+# Laporan -> modul dan fungsi modul yang diukur sebagai tahap.
+# Tahap boleh bersarang (mis. format_excel_sheet dipanggil dari simpan_excel).
+# Ukuran output hanya dihitung untuk tahap di "writers" karena tahap lain bisa
+# dipanggil ribuan kali (per task).
+REPORTS = {
+    "routing_summary_upload": {
+        "module": "modules.Routing_Summary.report",
+        "stages": ["contains_capacity_constraint", "proses_truck_detail", "proses_truck_usage",
+                   "get_adjusted_date_from_excel"],
+        "writers": [],
+    },
+    "routing_summary_api": {
+        "module": "modules.Auto_Routing_Summary.report",
+        "stages": ["fetch_all_pages", "style_excel"],
+        "writers": ["style_excel"],
+    },
+    "delivery_summary_upload": {
+        "module": "modules.Delivery_Summary.report",
+        "stages": ["process_total_delivered", "process_pending_so", "process_ro_vs_real",
+                   "process_update_longlat", "apply_styles_and_formatting", "get_created_date"],
+        "writers": [],
+    },
+    "delivery_summary_api": {
+        "module": "modules.Auto_Delivery_Summary.report",
+        "stages": ["fetch_results_data", "parse_hub_times", "iter_items", "process_task_data_code1",
+                   "simpan_excel", "format_excel_sheet"],
+        "writers": ["simpan_excel"],
+    },
+    "start_finish_time": {
+        "module": "modules.Start_Finish_Time.report",
+        "stages": ["api_get", "filter_duplikat", "tulis_laporan"],
+        "writers": ["tulis_laporan"],
+    },
+    "estimasi_delivery": {
+        "module": "modules.Estimasi_Delivery.report",
+        "stages": ["fetch_all_pages", "_parse_delivery_data", "tulis_excel"],
+        "writers": ["tulis_excel"],
+    },
+    "routing_transaction": {
+        "module": "modules.Routing_Transaction.report",
+        "stages": ["fetch_all_pages", "parse_routing_results"],
+        "writers": [],
+    },
+    "vehicles_data": {
+        "module": "modules.Vehicles_Data.report",
+        "stages": ["fetch_and_prepare_data", "simpan_excel"],
+        "writers": ["simpan_excel"],
+    },
+}
+
+
+# =============================================================================
+# PENGUKURAN
+# =============================================================================
+def peak_rss_kb():
+    """Peak RSS proses ini (KB), None jika tidak bisa diukur di platform ini."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS melaporkan byte, Linux kilobyte
+        return peak // 1024 if sys.platform == 'darwin' else peak
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) // 1024
+    except ImportError:
+        return None
+
+
+def dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class StageRecorder:
+    """Mengakumulasi wall/CPU time per tahap dan memantau folder output."""
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.stages = {}
+
+    def _stat(self, name):
+        return self.stages.setdefault(name, {
+            "calls": 0, "wall": 0.0, "cpu": 0.0, "peak_rss_kb": None, "output_bytes": 0,
+        })
+
+    def measure(self, name, track_output=True):
+        recorder = self
+
+        class _Span:
+            def __enter__(self):
+                self.out_before = dir_size(recorder.output_dir) if track_output else 0
+                self.wall = time.perf_counter()
+                self.cpu = time.process_time()
+                return self
+
+            def __exit__(self, *exc):
+                stat = recorder._stat(name)
+                stat["wall"] += time.perf_counter() - self.wall
+                stat["cpu"] += time.process_time() - self.cpu
+                stat["peak_rss_kb"] = peak_rss_kb()
+                if track_output:
+                    stat["output_bytes"] += max(0, dir_size(recorder.output_dir) - self.out_before)
+                return False
+
+        return _Span()
+
+    def _add_time(self, name, wall, cpu):
+        stat = self._stat(name)
+        stat["wall"] += wall
+        stat["cpu"] += cpu
+
+    def wrap(self, name, func, track_output=False):
+        """Membungkus fungsi; generator diukur selama item-nya diambil."""
+        recorder = self
+
+        def timed_iter(gen):
+            stat = recorder._stat(name)
+            try:
+                while True:
+                    wall, cpu = time.perf_counter(), time.process_time()
+                    try:
+                        item = next(gen)
+                    finally:
+                        recorder._add_time(name, time.perf_counter() - wall, time.process_time() - cpu)
+                    yield item
+            except StopIteration:
+                return
+            finally:
+                stat["peak_rss_kb"] = peak_rss_kb()
+                gen.close()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.measure(name, track_output):
+                result = func(*args, **kwargs)
+            self._stat(name)["calls"] += 1
+            if inspect.isgenerator(result):
+                return timed_iter(result)
+            return result
+
+        return wrapper
+
+
+# =============================================================================
+# PENGGANTI GUI (MODE HEADLESS)
+# =============================================================================
+class HeadlessApp:
+    """Pengganti jendela DatePickerApp: mencatat status/error tanpa Tk."""
+
+    def __init__(self):
+        self.errors = []
+        self.status = ""
+        self.progress = SimpleNamespace(stop=lambda: None, start=lambda *a: None)
+
+    def update_status(self, message):
+        self.status = message
+
+    def display_error(self, title, message):
+        self.errors.append(f"{title}: {message}")
+
+    def display_info(self, title, message):
+        pass
+
+    def after(self, ms, func=None, *args):
+        # Tampilan hasil (tab/viewer) tidak dijalankan; hanya jalur data yang diukur
+        return None
+
+    def winfo_exists(self):
+        return False
+
+    def destroy(self):
+        pass
+
+
+def _headless_dialogs(app, output_dir, input_files):
+    """Namespace pengganti messagebox/filedialog yang tidak membuka jendela."""
+    inputs = list(input_files)
+    messagebox = SimpleNamespace(
+        showerror=lambda title, message, **kw: app.errors.append(f"{title}: {message}"),
+        showwarning=lambda title, message, **kw: app.errors.append(f"{title}: {message}"),
+        showinfo=lambda *a, **kw: None,
+        askyesno=lambda *a, **kw: False,
+    )
+    filedialog = SimpleNamespace(
+        askopenfilename=lambda **kw: inputs.pop(0) if inputs else "",
+        askdirectory=lambda **kw: output_dir,
+    )
+    return messagebox, filedialog
+
+
+def _save_path_in(output_dir):
+    def get_save_path(base_name="Laporan", extension=".xlsx"):
+        return os.path.join(output_dir, f"{base_name}{extension}")
+    return get_save_path
+
+
+# =============================================================================
+# WORKSPACE (DATA SINTETIS + KONFIGURASI TERISOLASI)
+# =============================================================================
+def prepare_workspace(size, workdir):
+    """Membuat fixture, master store, config, secret dan file upload untuk satu ukuran."""
+    drivers = max(1, size // STOPS_PER_ROUTE)
+    data = synthetic_data.generate(drivers=drivers, stops=STOPS_PER_ROUTE, days=1, lokasi=(LOKASI,),
+                                   seed=SEED, start_date=DELIVERY_DATE)
+    fixtures_dir = os.path.join(workdir, "fixtures")
+    synthetic_data.write_fixtures(data, fixtures_dir)
+
+    config_dir = os.path.join(workdir, "config")
+    os.makedirs(config_dir, exist_ok=True)
+    shutil.copy(os.path.join(fixtures_dir, "master.json"), os.path.join(config_dir, "master.json"))
+    with open(os.path.join(REPO_ROOT, 'constant.json'), 'r', encoding='utf-8') as f:
+        constants = json.load(f)
+    for name, content in (
+        ("config.json", {"lokasi": LOKASI, "user_checked": True}),
+        ("secret.json", {"token": "benchmark"}),
+        ("type_map.json", {"type": {}}),
+        ("constant.json", constants),
+    ):
+        with open(os.path.join(config_dir, name), 'w', encoding='utf-8') as f:
+            json.dump(content, f, ensure_ascii=False, indent=4)
+
+    # Migrasi master.json -> master.db dilakukan di sini agar tidak ikut terukur
+    master_store.migrate_from_json(os.path.join(config_dir, "master.db"), os.path.join(config_dir, "master.json"),
+                                   os.path.join(config_dir, "type_map.json"))
+
+    uploads_dir = os.path.join(workdir, "uploads")
+    os.makedirs(uploads_dir, exist_ok=True)
+    synthetic_data.write_task_export(data["fixtures"]["tasks"], os.path.join(uploads_dir, "export_task.xlsx"))
+    synthetic_data.write_routing_export(data["fixtures"]["results"], os.path.join(uploads_dir, "export_routing.xlsx"))
+    return {
+        "fixtures": fixtures_dir, "config": config_dir, "uploads": uploads_dir,
+        "tasks": len(data["fixtures"]["tasks"]), "drivers": drivers,
+    }
+
+
+def _set_base_url(config_dir, base_url):
+    path = os.path.join(config_dir, "constant.json")
+    with open(path, 'r', encoding='utf-8') as f:
+        constants = json.load(f)
+    constants["base_url"] = base_url
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(constants, f, ensure_ascii=False, indent=4)
+
+
+# =============================================================================
+# RUNNER PER LAPORAN (DIJALANKAN DI PROSES ANAK)
+# =============================================================================
+def _dates():
+    return {
+        "dmy": DELIVERY_DATE.strftime('%d-%m-%Y'),
+        "ymd": DELIVERY_DATE.strftime('%Y-%m-%d'),
+        "force_refresh": False,
+    }
+
+
+def run_routing_summary_upload(module, ctx):
+    module.proses_file_routing([os.path.join(ctx.uploads, "export_routing.xlsx")], LOKASI)
+
+
+def run_routing_summary_api(module, ctx):
+    module.process_routing_data(_dates(), ctx.app)
+
+
+def run_delivery_summary_upload(module, ctx):
+    module.proses_file_task(os.path.join(ctx.uploads, "export_task.xlsx"), LOKASI)
+
+
+def run_delivery_summary_api(module, ctx):
+    module.panggil_api_dan_simpan(_dates(), ctx.app)
+
+
+def run_start_finish_time(module, ctx):
+    module.ambil_data(_dates(), ctx.app)
+
+
+def run_estimasi_delivery(module, ctx):
+    module.buat_laporan(_dates(), ctx.app)
+
+
+def run_routing_transaction(module, ctx):
+    module.ambil_data_routing(_dates(), ctx.app)
+
+
+def run_vehicles_data(module, ctx):
+    module.buat_laporan()
+
+
+RUNNERS = {
+    "routing_summary_upload": run_routing_summary_upload,
+    "routing_summary_api": run_routing_summary_api,
+    "delivery_summary_upload": run_delivery_summary_upload,
+    "delivery_summary_api": run_delivery_summary_api,
+    "start_finish_time": run_start_finish_time,
+    "estimasi_delivery": run_estimasi_delivery,
+    "routing_transaction": run_routing_transaction,
+    "vehicles_data": run_vehicles_data,
+}
+
+
+def run_child(report, workdir):
+    """Menjalankan satu laporan secara headless; mengembalikan dict hasil."""
+    import importlib
+    import utils.function as function
+    from utils import day_archive, response_cache
+
+    config_dir = os.path.join(workdir, "config")
+    output_dir = os.path.join(workdir, "output", report)
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.makedirs(output_dir)
+
+    app = HeadlessApp()
+    recorder = StageRecorder(output_dir)
+    messagebox, filedialog = _headless_dialogs(app, output_dir, [
+        os.path.join(workdir, "uploads", "export_task.xlsx"),
+    ])
+
+    # Konfigurasi dan cache diarahkan ke workspace, bukan folder aplikasi
+    function.CONFIG_PATH = os.path.join(config_dir, "config.json")
+    function.MASTER_JSON_PATH = os.path.join(config_dir, "master.json")
+    function.MASTER_DB_PATH = os.path.join(config_dir, "master.db")
+    function.TYPE_MAP_PATH = os.path.join(config_dir, "type_map.json")
+    function.SYNC_STATE_PATH = os.path.join(config_dir, "sync_state.json")
+    function.CONSTANT_PATH = os.path.join(config_dir, "constant.json")
+    function.SECRET_PATH = os.path.join(config_dir, "secret.json")
+    function.messagebox = messagebox
+    function.filedialog = filedialog
+    response_cache.CACHE_DIR = os.path.join(workdir, "cache", report)
+    day_archive.ARCHIVE_DIR = os.path.join(workdir, "archive", report)
+    # Membuka file hasil bukan bagian dari pengukuran
+    os.startfile = lambda *a, **kw: None
+
+    module = importlib.import_module(REPORTS[report]["module"])
+    for name, value in (
+        ("get_save_path", _save_path_in(output_dir)),
+        ("open_file_externally", lambda *a, **kw: None),
+        ("messagebox", messagebox),
+        ("filedialog", filedialog),
+    ):
+        if hasattr(module, name):
+            setattr(module, name, value)
+    writers = REPORTS[report]["writers"]
+    for stage in REPORTS[report]["stages"]:
+        if callable(getattr(module, stage, None)):
+            setattr(module, stage, recorder.wrap(stage, getattr(module, stage), stage in writers))
+
+    ctx = SimpleNamespace(app=app, recorder=recorder, uploads=os.path.join(workdir, "uploads"))
+    rss_before = peak_rss_kb()
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        RUNNERS[report](module, ctx)
+    except Exception as e:
+        app.errors.append(f"{e}\n{traceback.format_exc()}")
+    return {
+        "total": {
+            "wall": time.perf_counter() - wall,
+            "cpu": time.process_time() - cpu,
+            "peak_rss_kb": peak_rss_kb(),
+            "rss_before_kb": rss_before,
+            "output_bytes": dir_size(output_dir),
+        },
+        "stages": recorder.stages,
+        "errors": app.errors,
+    }
+
+
+# =============================================================================
+# ORKESTRASI
+# =============================================================================
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmark(sizes, reports, label=None, latency=0.0, keep_workdir=False):
+    """Menjalankan semua kombinasi laporan x ukuran; mengembalikan record run."""
+    run = {
+        "timestamp": datetime.now().isoformat(timespec='seconds'),
+        "label": label,
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [],
+    }
+    for size in sizes:
+        workdir = tempfile.mkdtemp(prefix=f"benchmark_{size}_")
+        try:
+            gen_wall = time.perf_counter()
+            workspace = prepare_workspace(size, workdir)
+            gen_wall = time.perf_counter() - gen_wall
+            server, base_url = start_in_background(workspace["fixtures"], latency=latency)
+            _set_base_url(workspace["config"], base_url)
+            print(f"[{size}] {workspace['tasks']} task, {workspace['drivers']} driver "
+                  f"(data dibuat dalam {gen_wall:.1f} dtk)")
+            try:
+                for report in reports:
+                    result = _spawn_child(report, workdir)
+                    result.update({"report": report, "size": size, "tasks": workspace["tasks"]})
+                    run["results"].append(result)
+                    status = "GAGAL" if result["errors"] else "ok"
+                    print(f"  {report:<26} {result['total']['wall']:>8.2f} dtk  "
+                          f"{(result['total']['peak_rss_kb'] or 0) / 1024:>7.1f} MB  {status}")
+                    for error in result["errors"][:3]:
+                        print(f"      ! {error.splitlines()[0]}")
+            finally:
+                server.shutdown()
+                server.server_close()
+        finally:
+            if keep_workdir:
+                print(f"  workspace disimpan di {workdir}")
+            else:
+                shutil.rmtree(workdir, ignore_errors=True)
+    return run
+
+
+def _spawn_child(report, workdir):
+    result_path = os.path.join(workdir, f"result_{report}.json")
+    proc = subprocess.run(
+        [sys.executable, "-m", "tools.benchmark", "_child", report, workdir, result_path],
+        cwd=REPO_ROOT, capture_output=True, text=True,
+    )
+    try:
+        with open(result_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"total": {"wall": 0.0, "cpu": 0.0, "peak_rss_kb": None, "output_bytes": 0},
+                "stages": {}, "errors": [f"Proses benchmark gagal (exit {proc.returncode}):\n{proc.stderr}"]}
+
+
+# =============================================================================
+# RIWAYAT & PERBANDINGAN
+# =============================================================================
+def load_history(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def append_history(path, run):
+    history = load_history(path)
+    history.append(run)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(history, f, ensure_ascii=False, indent=2)
+    return len(history) - 1
+
+
+def _rows(run):
+    """(laporan, ukuran, tahap) -> ukuran-ukuran dari sebuah run."""
+    rows = {}
+    for result in run.get("results", []):
+        if result.get("errors"):
+            continue
+        key = (result["report"], result["size"])
+        rows[key + ("TOTAL",)] = result["total"]
+        for stage, stat in result.get("stages", {}).items():
+            rows[key + (stage,)] = stat
+    return rows
+
+
+def compare_runs(base, target, threshold):
+    """Mencetak tabel perbandingan; mengembalikan jumlah regresi wall time."""
+    base_rows, target_rows = _rows(base), _rows(target)
+    print(f"Base  : {base.get('timestamp')} {base.get('commit') or ''} {base.get('label') or ''}")
+    print(f"Target: {target.get('timestamp')} {target.get('commit') or ''} {target.get('label') or ''}")
+    print(f"{'Laporan':<26} {'Ukuran':>6} {'Tahap':<30} {'Base':>8} {'Target':>8} {'Selisih':>8} "
+          f"{'RSS MB':>8}")
+    regressions = 0
+    for key in sorted(set(base_rows) & set(target_rows)):
+        old, new = base_rows[key], target_rows[key]
+        delta = new["wall"] - old["wall"]
+        pct = (delta / old["wall"] * 100) if old["wall"] else 0.0
+        flag = ""
+        if delta > NOISE_FLOOR_SECONDS and pct > threshold:
+            flag = "  REGRESI"
+            regressions += 1
+        elif -delta > NOISE_FLOOR_SECONDS and -pct > threshold:
+            flag = "  lebih cepat"
+        rss = (new.get("peak_rss_kb") or 0) / 1024
+        print(f"{key[0]:<26} {key[1]:>6} {key[2]:<30} {old['wall']:>8.3f} {new['wall']:>8.3f} "
+              f"{pct:>+7.1f}% {rss:>8.1f}{flag}")
+    return regressions
+
+
+# =============================================================================
+# MIKRO-BENCHMARK FILTER DUPLIKAT (START-FINISH TIME)
+# =============================================================================
+DEFAULT_SESSIONS = (10, 100, 1000)
+
+
+def _filter_duplikat_pairwise(grup):
+    """Versi lama filter_duplikat (perbandingan setiap pasangan baris), sebagai pembanding."""
+    idx_to_drop = set()
+    for i in range(len(grup)):
+        for j in range(len(grup)):
+            if i != j:
+                row_i = grup.iloc[i]
+                row_j = grup.iloc[j]
+                if (row_i['finish.totalDuration_menit'] < row_j['finish.totalDuration_menit'] and
+                        row_i['finish.totalDistance'] < row_j['finish.totalDistance']):
+                    idx_to_drop.add(grup.index[i])
+    return grup.drop(list(idx_to_drop))
+
+
+def _sesi_driver(sessions, seed=SEED):
+    """Sesi start-finish sintetis untuk satu driver (durasi/jarak sengaja ada yang kembar)."""
+    import numpy as np
+    import pandas as pd
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Driver": "DRIVER BENCHMARK",
+        "finish.totalDuration_menit": rng.integers(1, 600, sessions),
+        "finish.totalDistance": rng.integers(0, 2000, sessions) / 10,
+    })
+
+
+def run_filter_duplikat(sessions, pairwise_max, repeat=5):
+    """Membandingkan filter_duplikat dengan versi pasangan-baris; mengembalikan 1 bila hasil berbeda."""
+    from modules.Start_Finish_Time.report import filter_duplikat
+    print(f"{'Sesi/driver':>11} {'Skyline':>10} {'Pasangan':>10} {'Speed-up':>9}  Baris tersisa")
+    mismatches = 0
+    for size in sessions:
+        grup = _sesi_driver(size)
+        best = min(_timed(filter_duplikat, grup)[0] for _ in range(repeat))
+        kept = filter_duplikat(grup)
+        if size <= pairwise_max:
+            wall, expected = _timed(_filter_duplikat_pairwise, grup)
+            same = list(kept.index) == list(expected.index)
+            mismatches += not same
+            print(f"{size:>11} {best * 1000:>8.2f}ms {wall * 1000:>8.0f}ms {wall / best:>8.0f}x  "
+                  f"{len(kept)}{'' if same else '  BERBEDA'}")
+        else:
+            print(f"{size:>11} {best * 1000:>8.2f}ms {'-':>10} {'-':>9}  {len(kept)}")
+    return 1 if mismatches else 0
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark jalur data laporan terhadap data sintetis.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="Menjalankan benchmark dan menyimpan hasil ke riwayat")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Jumlah task")
+    run_parser.add_argument("--reports", nargs="+", choices=sorted(REPORTS), default=list(REPORTS))
+    run_parser.add_argument("--label", default=None, help="Catatan untuk run ini")
+    run_parser.add_argument("--latency", type=float, default=0.0, help="Latency server tiruan (ms)")
+    run_parser.add_argument("--history", default=HISTORY_PATH)
+    run_parser.add_argument("--keep-workdir", action="store_true", help="Jangan hapus data sintetis")
+
+    list_parser = sub.add_parser("list", help="Menampilkan run yang tersimpan")
+    list_parser.add_argument("--history", default=HISTORY_PATH)
+
+    compare_parser = sub.add_parser("compare", help="Membandingkan dua run dari riwayat")
+    compare_parser.add_argument("--base", type=int, default=-2, help="Indeks run pembanding (default -2)")
+    compare_parser.add_argument("--target", type=int, default=-1, help="Indeks run yang dinilai (default -1)")
+    compare_parser.add_argument("--threshold", type=float, default=10.0, help="Batas regresi (%%)")
+    compare_parser.add_argument("--history", default=HISTORY_PATH)
+
+    filter_parser = sub.add_parser("filter-duplikat",
+                                   help="Mikro-benchmark filter_duplikat Start-Finish Time vs versi lama")
+    filter_parser.add_argument("--sessions", type=int, nargs="+", default=list(DEFAULT_SESSIONS),
+                               help="Jumlah sesi per driver")
+    filter_parser.add_argument("--pairwise-max", type=int, default=1000,
+                               help="Versi lama hanya dijalankan sampai jumlah sesi ini")
+
+    child_parser = sub.add_parser("_child")
+    child_parser.add_argument("report")
+    child_parser.add_argument("workdir")
+    child_parser.add_argument("result_path")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "_child":
+        result = run_child(args.report, args.workdir)
+        with open(args.result_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False)
+        return 0
+
+    if args.command == "filter-duplikat":
+        return run_filter_duplikat(args.sessions, args.pairwise_max)
+
+    if args.command == "run":
+        run = run_benchmark(args.sizes, args.reports, args.label, args.latency, args.keep_workdir)
+        index = append_history(args.history, run)
+        print(f"Hasil disimpan sebagai run #{index} di {args.history}")
+        return 0
+
+    history = load_history(args.history)
+    if args.command == "list":
+        for index, run in enumerate(history):
+            failed = sum(1 for r in run.get("results", []) if r.get("errors"))
+            print(f"#{index:<3} {run.get('timestamp')} {run.get('commit') or '-':<9} "
+                  f"{len(run.get('results', []))} hasil, {failed} gagal  {run.get('label') or ''}")
+        return 0
+
+    try:
+        base, target = history[args.base], history[args.target]
+    except IndexError:
+        print("Riwayat belum memiliki run yang diminta.")
+        return 2
+    regressions = compare_runs(base, target, args.threshold)
+    print(f"{regressions} regresi di atas {args.threshold:.0f}%")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,304 @@
+# tools/fake_server.py
+"""
+Server tiruan API MileApp untuk load test dan benchmark tanpa jaringan.
+
+Menyajikan /hubs, /users, /vehicles, /tasks, /results dan /location-histories
+dari fixture JSON di satu folder:
+
+    <fixtures>/hubs.json, users.json, vehicles.json, tasks.json,
+    results.json, location-histories.json   -> list record
+    <fixtures>/recorded/<endpoint>/<hash>.json -> response asli hasil --record
+
+Record fixture boleh memiliki key tambahan "_date" (YYYY-MM-DD) yang dipakai
+untuk filter dateFrom/dateTo/timeFrom/timeTo, dan "hubId" untuk filter hubId.
+Key yang diawali "_" selain "_id" tidak ikut dikirim.
+
+Contoh:
+    python -m tools.fake_server --fixtures fixtures --port 8765 --latency 80
+    lalu isi "base_url" di constant.json dengan http://127.0.0.1:8765/api/v3
+"""
+
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlparse
+from urllib.request import Request, urlopen
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+
+# =============================================================================
+# BENTUK RESPONSE PER ENDPOINT
+# =============================================================================
+
+# Endpoint -> key pembungkus data; None berarti {"data": [...]} tanpa metadata paginasi
+ENDPOINTS = {
+    "/hubs": None,
+    "/users": None,
+    "/vehicles": None,
+    "/tasks": "tasks",
+    "/results": "data",
+    "/location-histories": "tasks",
+}
+
+DEFAULT_LIMIT = 100
+
+# Field yang tetap dikirim API asli walaupun tidak diminta lewat parameter 'fields'
+ALWAYS_INCLUDED = {
+    "/location-histories": ("trackedTime",),
+}
+
+
+# =============================================================================
+# FIXTURE
+# =============================================================================
+class FixtureStore:
+    """Memuat fixture sekali dan menyimpan response hasil rekaman."""
+
+    def __init__(self, fixtures_dir):
+        self.fixtures_dir = fixtures_dir
+        self._records = {}
+        self._lock = threading.Lock()
+
+    def records(self, endpoint):
+        with self._lock:
+            if endpoint not in self._records:
+                path = os.path.join(self.fixtures_dir, f"{endpoint.strip('/')}.json")
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        self._records[endpoint] = json.load(f)
+                except (OSError, ValueError):
+                    self._records[endpoint] = []
+            return self._records[endpoint]
+
+    def _recorded_path(self, endpoint, params):
+        normalized = json.dumps(sorted(params.items()), ensure_ascii=False)
+        key = hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+        return os.path.join(self.fixtures_dir, "recorded", endpoint.strip('/'), f"{key}.json")
+
+    def recorded(self, endpoint, params):
+        try:
+            with open(self._recorded_path(endpoint, params), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def save_recorded(self, endpoint, params, body):
+        path = self._recorded_path(endpoint, params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(body)
+
+
+def _record_date(record):
+    return str(record.get("_date") or "")[:10]
+
+
+def filter_records(records, params):
+    """Filter hubId dan rentang tanggal (berdasarkan key "_date")."""
+    hub_id = params.get("hubId")
+    date_from = (params.get("dateFrom") or params.get("timeFrom") or "")[:10]
+    date_to = (params.get("dateTo") or params.get("timeTo") or "")[:10]
+    result = []
+    for record in records:
+        if hub_id and record.get("hubId") not in (None, hub_id):
+            continue
+        record_date = _record_date(record)
+        if record_date:
+            if date_from and record_date < date_from:
+                continue
+            if date_to and record_date > date_to:
+                continue
+        result.append(record)
+    return result
+
+
+def project(record, fields, always=()):
+    """Menerapkan parameter 'fields' dan membuang key internal fixture."""
+    if fields:
+        keep = set(fields) | set(always) | {"_id"}
+        return {k: v for k, v in record.items() if k in keep}
+    return {k: v for k, v in record.items() if k == "_id" or not k.startswith("_")}
+
+
+def build_body(endpoint, params, records, page_limit=None):
+    """Menyusun body JSON sesuai bentuk response MileApp untuk satu halaman."""
+    try:
+        limit = max(1, int(params.get("limit") or DEFAULT_LIMIT))
+        page = max(1, int(params.get("page") or 1))
+    except ValueError:
+        limit, page = DEFAULT_LIMIT, 1
+    if page_limit:
+        limit = min(limit, page_limit)
+
+    fields = [f for f in (params.get("fields") or "").split(",") if f]
+    matched = filter_records(records, params)
+    start = (page - 1) * limit
+    always = ALWAYS_INCLUDED.get(endpoint, ())
+    data = [project(r, fields, always) for r in matched[start:start + limit]]
+
+    data_key = ENDPOINTS[endpoint]
+    if data_key is None:
+        payload = {"status": True, "data": data}
+    else:
+        payload = {
+            "status": True,
+            data_key: {
+                "current_page": page,
+                "data": data,
+                "per_page": limit,
+                "last_page": max(1, math.ceil(len(matched) / limit)),
+                "total": len(matched),
+            },
+        }
+    return json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+
+# =============================================================================
+# HANDLER HTTP
+# =============================================================================
+def make_handler(store, options):
+    """Membuat kelas handler dengan fixture dan opsi server yang diberikan."""
+
+    class MileAppHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            if options.verbose:
+                super().log_message(format, *args)
+
+        def _send(self, status, body=b"", headers=None):
+            self.send_response(status)
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def _match_endpoint(self, path):
+            # Prefix apa pun (mis. /api/v3) diterima agar base_url bebas diatur
+            for endpoint in ENDPOINTS:
+                if path.rstrip('/').endswith(endpoint):
+                    return endpoint
+            return None
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            endpoint = self._match_endpoint(url.path)
+            if endpoint is None:
+                self._send(404, b'{"status": false, "message": "Not found"}',
+                           {"Content-Type": "application/json"})
+                return
+
+            if options.latency or options.jitter:
+                time.sleep(max(0.0, options.latency + random.uniform(-options.jitter, options.jitter)) / 1000)
+
+            if options.error_rate and random.random() < options.error_rate:
+                status = random.choice(options.error_status)
+                headers = {"Retry-After": str(options.retry_after)} if status in (429, 503) else {}
+                self._send(status, b'{"status": false}', headers)
+                return
+
+            params = dict(parse_qsl(url.query))
+            body = store.recorded(endpoint, params)
+            if body is None and options.record:
+                body = self._proxy(url.path, endpoint, params)
+                if body is None:
+                    return
+            if body is None:
+                body = build_body(endpoint, params, store.records(endpoint), options.page_limit)
+
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            headers = {
+                "Content-Type": "application/json",
+                "ETag": etag,
+                "Last-Modified": formatdate(options.started_at, usegmt=True),
+            }
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, b"", headers)
+                return
+            self._send(200, body, headers)
+
+        def _proxy(self, path, endpoint, params):
+            """Mode rekam: teruskan ke server asli lalu simpan response-nya."""
+            upstream = options.record.rstrip('/') + path[path.rfind(endpoint):]
+            if params:
+                upstream += "?" + urlencode(params)
+            request = Request(upstream, headers={"Authorization": self.headers.get("Authorization", "")})
+            try:
+                with urlopen(request, timeout=60) as response:
+                    body = response.read()
+            except Exception as e:
+                self._send(502, json.dumps({"status": False, "message": str(e)}).encode('utf-8'))
+                return None
+            store.save_recorded(endpoint, params, body)
+            return body
+
+    return MileAppHandler
+
+
+def create_server(fixtures_dir, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, page_limit=None,
+                  error_rate=0.0, error_status=(503,), retry_after=1, record=None, verbose=False):
+    """
+    Membuat ThreadingHTTPServer (belum berjalan). port=0 memilih port bebas;
+    alamat aktual ada di server.server_address. Latency dan jitter dalam ms.
+    """
+    options = argparse.Namespace(
+        latency=latency, jitter=jitter, page_limit=page_limit, error_rate=error_rate,
+        error_status=list(error_status), retry_after=retry_after, record=record,
+        verbose=verbose, started_at=time.time(),
+    )
+    server = ThreadingHTTPServer((host, port), make_handler(FixtureStore(fixtures_dir), options))
+    server.daemon_threads = True
+    return server
+
+
+def start_in_background(fixtures_dir, **kwargs):
+    """Menjalankan server di thread daemon; mengembalikan (server, base_url)."""
+    server = create_server(fixtures_dir, **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}/api/v3"
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Server tiruan API MileApp dari fixture lokal.")
+    parser.add_argument("--fixtures", default="fixtures", help="Folder fixture JSON")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Latency per request (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Variasi latency +/- (ms)")
+    parser.add_argument("--page-limit", type=int, default=None, help="Batas maksimal item per halaman")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Peluang response error (0-1)")
+    parser.add_argument("--error-status", type=int, nargs="+", default=[503], help="Status untuk error injeksi")
+    parser.add_argument("--retry-after", type=int, default=1, help="Nilai Retry-After untuk 429/503 (detik)")
+    parser.add_argument("--record", default=None, metavar="UPSTREAM_BASE_URL",
+                        help="Teruskan request yang belum terekam ke server asli dan simpan response-nya")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    server = create_server(
+        args.fixtures, host=args.host, port=args.port, latency=args.latency, jitter=args.jitter,
+        page_limit=args.page_limit, error_rate=args.error_rate, error_status=args.error_status,
+        retry_after=args.retry_after, record=args.record, verbose=args.verbose,
+    )
+    host, port = server.server_address[:2]
+    print(f"Server tiruan MileApp berjalan. Isi base_url dengan: http://{host}:{port}/api/v3")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,500 @@
+# tools/synthetic_data.py
+"""
+Generator data MileApp sintetis untuk uji skala laporan.
+
+Menghasilkan fixture yang konsisten satu sama lain (hub, driver, kendaraan,
+hasil routing, task dan location history) dalam format yang dibaca
+tools/fake_server.py, ditambah master.json yang cocok dengan driver tersebut.
+write_task_export / write_routing_export membuat file Excel berformat export
+MileApp untuk laporan yang bekerja dari upload file.
+Hasilnya deterministik: seed dan parameter yang sama selalu menghasilkan file
+yang sama persis.
+
+Contoh:
+    python -m tools.synthetic_data --out fixtures --drivers 40 --stops 25 --days 3
+    python -m tools.fake_server --fixtures fixtures
+"""
+
+from datetime import date, datetime, timedelta
+import argparse
+import json
+import math
+import os
+import random
+
+# =============================================================================
+# KONSTANTA DATA SINTETIS
+# =============================================================================
+
+CONSTANT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'constant.json')
+
+# Titik pusat kira-kira tiap lokasi; lokasi lain memakai titik Cikarang
+HUB_COORDINATES = {
+    "plbdg": (-6.9175, 107.6191), "plck": (-6.2615, 107.1530), "pldm": (-6.1547, 106.7199),
+    "pldps": (-8.6705, 115.2126), "pljbr": (-8.1724, 113.7002), "plmks": (-5.1477, 119.4327),
+    "plmlg": (-7.9666, 112.6326), "plsmg": (-6.9932, 110.4203), "plsda": (-7.4478, 112.7183),
+    "plygy": (-7.7956, 110.3695),
+}
+
+FIRST_NAMES = ["AGUS", "BUDI", "DEDI", "EKO", "FAJAR", "HADI", "IWAN", "JOKO", "RUDI", "SURYA",
+               "TONI", "WAHYU", "YUDI", "ARIF", "DIAN", "HERU", "RIZKI", "SLAMET", "UJANG", "YANTO"]
+LAST_NAMES = ["PRASETYA", "SANTOSO", "HIDAYAT", "SAPUTRA", "KURNIAWAN", "NUGROHO", "SETIAWAN",
+              "WIBOWO", "HERMAWAN", "RAMADHAN", "SUSANTO", "FIRMANSYAH", "GUNAWAN", "PRATAMA"]
+OUTLET_WORDS = ["KFC", "RM SEDERHANA", "TOKO MAKMUR", "WARUNG BAROKAH", "RESTO NUSANTARA",
+                "CAFE KOPI", "MINIMARKET JAYA", "HOTEL MELATI", "BAKERY SARI", "KANTIN SEHAT"]
+AREA_WORDS = ["CIKARANG", "BEKASI", "JABABEKA", "LIPPO", "TAMBUN", "CIBITUNG", "KARAWANG",
+              "SETU", "SERANG BARU", "CIKEDOKAN"]
+PLATE_SUFFIXES = ["FCC", "FCD", "FCE", "FCF", "UUA", "UUB", "KJA", "KJB"]
+
+# Peluang kejadian per kunjungan
+LABEL_CHANCES = (("BATAL", 0.02), ("PENDING", 0.03), ("TERIMA SEBAGIAN", 0.04))
+PENDING_GR_CHANCE = 0.03
+RELOCATION_CHANCE = 0.08
+# Peluang driver memiliki perjalanan tambahan yang lebih pendek (trip ganda)
+EXTRA_TRIP_CHANCE = 0.2
+
+WIB = timedelta(hours=7)
+
+
+# =============================================================================
+# FUNGSI BANTU
+# =============================================================================
+def load_location_names():
+    """Peta kode lokasi -> nama lokasi dari constant.json (kosong jika tidak ada)."""
+    try:
+        with open(CONSTANT_PATH, 'r', encoding='utf-8') as f:
+            location_id = json.load(f).get("location_id", {})
+    except (OSError, ValueError):
+        return {}
+    return {code: name for name, code in location_id.items()}
+
+
+def planning_date(delivery_date):
+    """Tanggal hasil routing untuk tanggal kirim, sama dengan aturan di laporan (Senin -> Sabtu)."""
+    if delivery_date.weekday() == 0:
+        return delivery_date - timedelta(days=2)
+    return delivery_date - timedelta(days=1)
+
+
+def delivery_dates(start, days):
+    """Tanggal kirim sebanyak `days` mulai dari `start`, Minggu dilewati."""
+    result = []
+    current = start
+    while len(result) < days:
+        if current.weekday() != 6:
+            result.append(current)
+        current += timedelta(days=1)
+    return result
+
+
+def to_utc_iso(local_dt):
+    """Datetime WIB (naive) -> string ISO UTC seperti yang dikirim API MileApp."""
+    return (local_dt - WIB).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def hhmm(minutes):
+    minutes = int(minutes) % (24 * 60)
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def distance_m(a, b):
+    """Jarak haversine dua titik (lat, lng) dalam meter."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * 6371000 * math.asin(math.sqrt(h))
+
+
+def _object_id(rng):
+    return "%024x" % rng.getrandbits(96)
+
+
+def _longlat(point):
+    return f"{point[0]:.6f},{point[1]:.6f}"
+
+
+# =============================================================================
+# ENTITAS MASTER (HUB, DRIVER, KENDARAAN, OUTLET)
+# =============================================================================
+def build_hub(rng, lokasi_code, location_names):
+    name = location_names.get(lokasi_code, lokasi_code.upper())
+    return {
+        "_id": _object_id(rng),
+        "name": f"Hub {name}",
+        "code": lokasi_code,
+        "lokasi": lokasi_code,
+        "center": HUB_COORDINATES.get(lokasi_code, HUB_COORDINATES["plck"]),
+    }
+
+
+def build_drivers(rng, hub, count, vehicle_types, updated_at):
+    """Membuat user driver beserta kendaraannya (satu kendaraan per driver)."""
+    users, vehicles, master_rows = [], [], []
+    for i in range(1, count + 1):
+        email = f"kendaraan.{hub['lokasi']}{i:02d}@panganlestari.com"
+        frozen = rng.random() < 0.6
+        prefix = "'FRZ'" if frozen else "'DRY'"
+        name = f"{prefix} {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        plate = f"B {rng.randint(1000, 9999)} {rng.choice(PLATE_SUFFIXES)}"
+        base_type = rng.choice(vehicle_types)
+        capacity = {"L300": 1000, "CDE": 2000, "CDD": 4000, "FUSO": 8000}.get(base_type.split("-")[0], 2000)
+        tag = f"{'FROZEN' if frozen else 'DRY'}-{base_type}-{capacity}"
+        volume = round(capacity / 250, 1)
+
+        users.append({
+            "_id": _object_id(rng), "email": email, "name": name, "status": "active",
+            "hubId": hub["_id"], "updatedAt": updated_at,
+        })
+        vehicles.append({
+            "_id": _object_id(rng), "name": plate, "assignee": email, "tags": [tag],
+            "hubId": hub["_id"], "updatedAt": updated_at,
+            "workingTime": {"startTime": "05:00", "endTime": "20:00", "multiday": 0},
+            "capacity": {"weight": {"min": 0, "max": capacity}, "volume": {"min": 0, "max": volume}},
+        })
+        master_rows.append({"Email": email, "Driver": name, "Plat": plate, "Type": tag})
+    return users, vehicles, master_rows
+
+
+def build_outlets(rng, hub, count):
+    """Pool outlet di sekitar hub; satu customer bisa memiliki beberapa lokasi kirim."""
+    center = hub["center"]
+    outlets = []
+    while len(outlets) < count:
+        customer_code = f"C0{rng.randint(100000, 999999)}"
+        base_name = f"{rng.choice(OUTLET_WORDS)} {rng.choice(AREA_WORDS)}"
+        for loc_code in ["MAIN"] + [f"LOC{n}" for n in range(1, rng.randint(1, 3))]:
+            open_minutes = rng.choice([360, 420, 480, 540])
+            outlets.append({
+                "code": customer_code,
+                "name": base_name,
+                "location": loc_code,
+                "point": (center[0] + rng.uniform(-0.15, 0.15), center[1] + rng.uniform(-0.15, 0.15)),
+                "open": open_minutes,
+                "close": open_minutes + rng.choice([480, 600, 720]),
+            })
+    return outlets[:count]
+
+
+# =============================================================================
+# DATA HARIAN (RESULTS, TASKS, LOCATION HISTORIES)
+# =============================================================================
+def build_route(rng, hub, vehicle, driver, outlets, stops):
+    """Satu rute: hub -> outlet x stops -> hub, dengan waktu yang konsisten."""
+    tag = vehicle["tags"][0]
+    max_weight = vehicle["capacity"]["weight"]["max"]
+    clock = rng.choice([300, 330, 360, 390])  # menit sejak 00:00 WIB
+    position = hub["center"]
+    trips = [{"order": 0, "isHub": True, "visitName": hub["name"], "eta": "", "etd": hhmm(clock),
+              "distance": 0, "travelTime": 0, "visitTime": 0, "waitingTime": 0, "weight": 0, "volume": 0}]
+    visits = []
+
+    for order, outlet in enumerate(rng.sample(outlets, min(stops, len(outlets))), start=1):
+        distance = distance_m(position, outlet["point"]) * 1.3
+        travel = max(3, int(distance / 500))
+        arrival = clock + travel
+        waiting = max(0, outlet["open"] - arrival)
+        visit_minutes = rng.randint(10, 30)
+        weight = round(rng.uniform(20, max_weight / max(stops, 1) * 1.2), 1)
+        so_numbers = ", ".join(f"SO{rng.randint(100000, 999999)}-{n}" for n in range(1, rng.randint(2, 3)))
+        trips.append({
+            "order": order, "isHub": False,
+            "visitName": f"{outlet['name']} - {outlet['code']} - {outlet['location']} - {so_numbers}",
+            "timeWindow": {"startTime": hhmm(outlet["open"]), "endTime": hhmm(outlet["close"])},
+            "eta": hhmm(arrival + waiting), "etd": hhmm(arrival + waiting + visit_minutes),
+            "distance": round(distance), "travelTime": travel, "visitTime": visit_minutes,
+            "waitingTime": waiting, "weight": weight, "volume": round(weight / 250, 3),
+        })
+        visits.append((order, outlet, arrival + waiting, visit_minutes))
+        clock = arrival + waiting + visit_minutes
+        position = outlet["point"]
+
+    back_distance = distance_m(position, hub["center"]) * 1.3
+    back_travel = max(3, int(back_distance / 500))
+    trips.append({"order": len(trips), "isHub": True, "visitName": hub["name"],
+                  "eta": hhmm(clock + back_travel), "etd": "", "distance": round(back_distance),
+                  "travelTime": back_travel, "visitTime": 0, "waitingTime": 0, "weight": 0, "volume": 0})
+
+    route = {
+        "assignee": driver["email"], "vehicleName": vehicle["name"], "vehicleTags": vehicle["tags"],
+        "vehicleMaxWeight": max_weight, "vehicleMaxVolume": vehicle["capacity"]["volume"]["max"],
+        "trips": trips,
+    }
+    return route, visits, tag
+
+
+def build_tasks(rng, hub, vehicle, driver, visits, delivery_date):
+    """Task kunjungan untuk satu driver; urutan aktual sedikit diacak dari rencana."""
+    day_start = datetime.combine(delivery_date, datetime.min.time())
+    actual = list(visits)
+    # Sebagian kecil kunjungan ditukar urutannya agar RO vs Real tidak selalu sama
+    for i in range(len(actual) - 1):
+        if rng.random() < 0.1:
+            actual[i], actual[i + 1] = actual[i + 1], actual[i]
+
+    tasks = []
+    clock = None
+    for order, outlet, planned_minutes, visit_minutes in actual:
+        labels = [label for label, chance in LABEL_CHANCES if rng.random() < chance]
+        pending_gr = not labels and rng.random() < PENDING_GR_CHANCE
+        arrival_minutes = planned_minutes + rng.randint(-20, 40)
+        if clock is not None:
+            arrival_minutes = max(arrival_minutes, clock + 3)
+        done_minutes = arrival_minutes + max(3, visit_minutes + rng.randint(-5, 15))
+        clock = done_minutes
+        arrival = day_start + timedelta(minutes=arrival_minutes, seconds=rng.randint(0, 59))
+        done = day_start + timedelta(minutes=done_minutes, seconds=rng.randint(0, 59))
+
+        task = {
+            "_id": _object_id(rng),
+            "hubId": hub["_id"],
+            "_date": delivery_date.isoformat(),
+            "flow": "Pending GR" if pending_gr else "Delivery",
+            "title": f"{outlet['name']} - {outlet['code']} - {outlet['location']}",
+            "customerName": outlet["name"],
+            "label": labels,
+            "statusDelivery": labels[:1] if labels else ["TERKIRIM"],
+            "statusGr": ["PENDING GR"] if pending_gr else [],
+            "alasan": "Toko tutup" if "BATAL" in labels or "PENDING" in labels else "",
+            "assignedTo": {"email": driver["email"], "name": driver["name"]},
+            "assignedVehicle": {"assignee": driver["email"], "name": vehicle["name"]},
+            "routePlannedOrder": order,
+            "openTime": hhmm(outlet["open"]),
+            "closeTime": hhmm(outlet["close"]),
+            "eta": hhmm(planned_minutes),
+            "etd": hhmm(planned_minutes + visit_minutes),
+            "visitTime": visit_minutes,
+            "doneTime": to_utc_iso(done),
+            "klikJikaSudahSampai": to_utc_iso(arrival),
+            "longlat": _longlat(outlet["point"]),
+        }
+        if pending_gr:
+            task["page1DoneTime"] = to_utc_iso(arrival)
+        if rng.random() < RELOCATION_CHANCE:
+            moved = (outlet["point"][0] + rng.uniform(-0.002, 0.002), outlet["point"][1] + rng.uniform(-0.002, 0.002))
+            task["klikLokasiClient"] = _longlat(moved)
+        tasks.append(task)
+    return tasks, clock
+
+
+def build_location_history(rng, hub, driver, route, last_done_minutes, delivery_date):
+    """Satu perjalanan (start -> finish) per driver per hari."""
+    day_start = datetime.combine(delivery_date, datetime.min.time())
+    first_etd = route["trips"][0]["etd"]
+    start_minutes = int(first_etd[:2]) * 60 + int(first_etd[3:5]) + rng.randint(-15, 20)
+    finish_minutes = (last_done_minutes or start_minutes) + route["trips"][-1]["travelTime"] + rng.randint(0, 30)
+    total_distance = sum(t["distance"] for t in route["trips"]) * rng.uniform(0.95, 1.15)
+    start = day_start + timedelta(minutes=start_minutes)
+    finish = day_start + timedelta(minutes=finish_minutes)
+    return {
+        "_id": _object_id(rng),
+        "hubId": hub["_id"],
+        "_date": delivery_date.isoformat(),
+        "email": driver["email"],
+        "startTime": (start - WIB).strftime("%Y-%m-%dT%H:%M:%S"),
+        "finish": {
+            "finishTime": (finish - WIB).strftime("%Y-%m-%dT%H:%M:%S"),
+            "totalDistance": round(total_distance / 1000, 2),
+            "totalDuration": finish_minutes - start_minutes,
+            "lat": hub["center"][0], "lon": hub["center"][1], "notes": "",
+        },
+        "trackedTime": finish_minutes - start_minutes,
+    }
+
+
+def build_extra_trip(rng, history):
+    """Perjalanan tambahan yang lebih pendek (jarak dan durasi) dari perjalanan utama."""
+    extra = json.loads(json.dumps(history))
+    extra["_id"] = _object_id(rng)
+    ratio = rng.uniform(0.1, 0.6)
+    extra["finish"]["totalDistance"] = round(history["finish"]["totalDistance"] * ratio, 2)
+    extra["finish"]["totalDuration"] = max(10, int(history["finish"]["totalDuration"] * ratio))
+    extra["trackedTime"] = extra["finish"]["totalDuration"]
+    return extra
+
+
+# =============================================================================
+# GENERATOR UTAMA
+# =============================================================================
+def generate(drivers=20, stops=20, days=1, lokasi=("plck",), seed=1, start_date=None, vehicle_types=None):
+    """
+    Menghasilkan seluruh data sintetis di memori.
+
+    Args:
+        drivers (int): Jumlah driver (dan kendaraan) per hub.
+        stops (int): Jumlah kunjungan per rute.
+        days (int): Jumlah hari kirim (hari Minggu dilewati).
+        lokasi (iterable): Kode lokasi, satu hub per kode (mis. "plck").
+        seed (int): Seed generator acak.
+        start_date (date, optional): Tanggal kirim pertama (default 2024-05-01).
+        vehicle_types (list, optional): Tipe dasar kendaraan (default dari constant.json).
+
+    Returns:
+        dict: {"fixtures": {nama_endpoint: [record, ...]}, "master": {...}}
+    """
+    rng = random.Random(seed)
+    start_date = start_date or date(2024, 5, 1)
+    location_names = load_location_names()
+    if not vehicle_types:
+        try:
+            with open(CONSTANT_PATH, 'r', encoding='utf-8') as f:
+                vehicle_types = json.load(f).get("vehicle_types")
+        except (OSError, ValueError):
+            vehicle_types = None
+        vehicle_types = vehicle_types or ["L300", "CDE", "CDD", "FUSO"]
+
+    updated_at = to_utc_iso(datetime.combine(start_date - timedelta(days=7), datetime.min.time()))
+    fixtures = {name: [] for name in ("hubs", "users", "vehicles", "results", "tasks", "location-histories")}
+    master = {"driver": [], "hub_ids": {}}
+
+    for lokasi_code in lokasi:
+        hub = build_hub(rng, lokasi_code, location_names)
+        fixtures["hubs"].append({"_id": hub["_id"], "name": hub["name"], "code": hub["code"]})
+        master["hub_ids"][lokasi_code] = hub["_id"]
+
+        users, vehicles, master_rows = build_drivers(rng, hub, drivers, vehicle_types, updated_at)
+        fixtures["users"].extend(users)
+        fixtures["vehicles"].extend(vehicles)
+        master["driver"].extend(master_rows)
+        outlets = build_outlets(rng, hub, max(stops * 2, int(drivers * stops * 1.5)))
+
+        for delivery_date in delivery_dates(start_date, days):
+            routing = []
+            for driver, vehicle in zip(users, vehicles):
+                route, visits, _ = build_route(rng, hub, vehicle, driver, outlets, stops)
+                routing.append(route)
+                tasks, last_done = build_tasks(rng, hub, vehicle, driver, visits, delivery_date)
+                fixtures["tasks"].extend(tasks)
+                history = build_location_history(rng, hub, driver, route, last_done, delivery_date)
+                fixtures["location-histories"].append(history)
+                if rng.random() < EXTRA_TRIP_CHANCE:
+                    fixtures["location-histories"].append(build_extra_trip(rng, history))
+
+            fixtures["results"].append({
+                "_id": _object_id(rng),
+                "hubId": hub["_id"],
+                "_date": planning_date(delivery_date).isoformat(),
+                "dispatchStatus": "done",
+                "result": {"routing": routing},
+            })
+
+    return {"fixtures": fixtures, "master": master}
+
+
+def write_fixtures(data, out_dir):
+    """Menulis hasil generate() ke <out_dir>/<endpoint>.json dan <out_dir>/master.json."""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for name, records in data["fixtures"].items():
+        path = os.path.join(out_dir, f"{name}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(records, f, ensure_ascii=False)
+        paths.append(path)
+    path = os.path.join(out_dir, "master.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data["master"], f, ensure_ascii=False, indent=4)
+    paths.append(path)
+    return paths
+
+
+# =============================================================================
+# FILE EXPORT MILEAPP (UNTUK LAPORAN BERBASIS UPLOAD)
+# =============================================================================
+TASK_EXPORT_COLUMNS = [
+    "flow", "title", "label", "Status GR", "assignee", "assignedVehicle",
+    "Alasan Tidak Bisa Dikunjungi", "Alasan Batal", "Open Time", "Close Time", "eta", "etd",
+    "Klik Jika Sudah Sampai", "doneTime", "page1DoneTime", "Visit Time", "routePlannedOrder",
+    "Klik Lokasi Client", "Longlat", "startTime",
+]
+
+ROUTING_EXPORT_COLUMNS = [
+    "Vehicle Name", "Assignee", "Weight Percentage", "Volume Percentage",
+    "Total Distance (m)", "Total Visits", "Total Spent Time (mins)",
+]
+
+
+def _local_text(utc_iso):
+    """String ISO UTC -> "YYYY-MM-DD HH:MM" WIB seperti pada file export."""
+    if not utc_iso:
+        return ""
+    return (datetime.strptime(utc_iso[:19], "%Y-%m-%dT%H:%M:%S") + WIB).strftime("%Y-%m-%d %H:%M")
+
+
+def write_task_export(tasks, path):
+    """Menulis task ke file Excel berformat export task MileApp (sheet "Main")."""
+    import openpyxl
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Main")
+    ws.append(TASK_EXPORT_COLUMNS)
+    for task in tasks:
+        alasan = task.get("alasan", "")
+        labels = task.get("label") or []
+        ws.append([
+            task.get("flow", ""), task.get("title", ""), "; ".join(labels),
+            "; ".join(task.get("statusGr") or []),
+            task["assignedTo"]["email"], task["assignedVehicle"]["name"],
+            alasan if "PENDING" in labels else "", alasan if "BATAL" in labels else "",
+            task.get("openTime", ""), task.get("closeTime", ""), task.get("eta", ""), task.get("etd", ""),
+            _local_text(task.get("klikJikaSudahSampai")), _local_text(task.get("doneTime")),
+            _local_text(task.get("page1DoneTime")), task.get("visitTime", ""),
+            task.get("routePlannedOrder", ""), task.get("klikLokasiClient", ""), task.get("longlat", ""),
+            _local_text(task.get("klikJikaSudahSampai")),
+        ])
+    wb.save(path)
+    return path
+
+
+def write_routing_export(results, path):
+    """Menulis hasil routing ke file Excel berformat export routing MileApp."""
+    import openpyxl
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Routing")
+    ws.append(ROUTING_EXPORT_COLUMNS)
+    created_dates = []
+    for result in results:
+        created_dates.append(datetime.strptime(result["_date"], "%Y-%m-%d").strftime("%d/%m/%Y"))
+        for route in result["result"]["routing"]:
+            trips = route["trips"]
+            weight = sum(t["weight"] for t in trips)
+            volume = sum(t["volume"] for t in trips)
+            ws.append([
+                route["vehicleName"], route["assignee"],
+                f"{weight / route['vehicleMaxWeight'] * 100:.1f}%",
+                f"{volume / route['vehicleMaxVolume'] * 100:.1f}%",
+                sum(t["distance"] for t in trips),
+                sum(1 for t in trips if not t["isHub"]),
+                sum(t["travelTime"] + t["visitTime"] + t["waitingTime"] for t in trips),
+            ])
+    others = wb.create_sheet("Others")
+    others.append(["Created Date"])
+    for created_date in created_dates[:1]:
+        others.append([created_date])
+    wb.save(path)
+    return path
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generator data MileApp sintetis untuk tools/fake_server.py.")
+    parser.add_argument("--out", default="fixtures", help="Folder tujuan fixture")
+    parser.add_argument("--drivers", type=int, default=20, help="Jumlah driver per hub")
+    parser.add_argument("--stops", type=int, default=20, help="Jumlah kunjungan per rute")
+    parser.add_argument("--days", type=int, default=1, help="Jumlah hari kirim")
+    parser.add_argument("--lokasi", nargs="+", default=["plck"], help="Kode lokasi (satu hub per kode)")
+    parser.add_argument("--start-date", default="2024-05-01", help="Tanggal kirim pertama (YYYY-MM-DD)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    data = generate(
+        drivers=args.drivers, stops=args.stops, days=args.days, lokasi=args.lokasi, seed=args.seed,
+        start_date=datetime.strptime(args.start_date, '%Y-%m-%d').date(),
+    )
+    write_fixtures(data, args.out)
+    counts = ", ".join(f"{name}={len(records)}" for name, records in data["fixtures"].items())
+    print(f"Fixture ditulis ke {args.out}: {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,666 @@
+# utils/api_client.py
+
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+import math
+import os
+import random
+import threading
+import time
+import warnings
+import requests
+from requests.adapters import HTTPAdapter
+from utils.function import load_constants, load_secret
+from utils import day_archive, perf, response_cache
+from utils.json_stream import iter_json_array
+
+# =============================================================================
+# KONFIGURASI KLIEN MILEAPP
+# =============================================================================
+
+# Jumlah koneksi keep-alive yang disimpan di pool (cukup untuk fetch paralel)
+POOL_SIZE = 10
+
+# Timeout (detik) per endpoint, endpoint lain memakai DEFAULT_TIMEOUT
+DEFAULT_TIMEOUT = 30
+ENDPOINT_TIMEOUTS = {
+    "/hubs": 30,
+    "/users": 30,
+    "/vehicles": 30,
+    "/location-histories": 30,
+    "/tasks": 60,
+    "/results": 60,
+}
+
+# Endpoint referensi yang jarang berubah: dikirim dengan header bersyarat
+# (If-None-Match / If-Modified-Since) dan body dari cache dipakai saat 304
+CONDITIONAL_ENDPOINTS = ("/hubs", "/users", "/vehicles")
+
+_session = None
+_base_url = ""
+_session_lock = threading.Lock()
+
+_conditional_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+# =============================================================================
+# KONFIGURASI RETRY DAN RATE LIMIT
+# =============================================================================
+
+# Batas request per detik ke API (dibagi semua thread); turun otomatis saat
+# server membalas 429 dan naik kembali perlahan setelah request berhasil
+RATE_LIMIT_PER_SECOND = 10.0
+RATE_LIMIT_MIN = 1.0
+RATE_LIMIT_BURST = 10
+
+# Retry untuk GET (idempoten) dengan exponential backoff + jitter
+RETRY_STATUS = (429, 500, 502, 503, 504)
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 20.0
+
+# Jumlah retry maksimal untuk satu laporan (lihat reset_retry_budget)
+RETRY_BUDGET = 20
+
+
+class _TokenBucket:
+    """Token bucket thread-safe dengan laju adaptif (AIMD) dan jeda global."""
+
+    def __init__(self, rate, burst):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Menunggu sampai satu token tersedia."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                wait = self.paused_until - now
+                if wait <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def throttle(self, pause=None):
+        """Dipanggil saat 429: laju dipotong setengah dan semua thread dijeda."""
+        with self.lock:
+            self.rate = max(RATE_LIMIT_MIN, self.rate / 2)
+            if pause:
+                self.paused_until = max(self.paused_until, time.monotonic() + pause)
+
+    def recover(self):
+        """Dipanggil saat request berhasil: laju naik perlahan ke batas maksimal."""
+        with self.lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + 0.5)
+
+
+_limiter = _TokenBucket(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+_retry_budget = RETRY_BUDGET
+_retry_lock = threading.Lock()
+
+
+# =============================================================================
+# SESSION BERSAMA
+# =============================================================================
+def get_session():
+    """
+    Mengembalikan Session bersama untuk semua panggilan ke API MileApp.
+    Session dibuat sekali (lazy) dengan header default dari secret.json dan
+    base_url dari constant.json, sehingga koneksi TCP+TLS dipakai ulang.
+    """
+    global _session, _base_url
+    with _session_lock:
+        if _session is None:
+            constants = load_constants() or {}
+            secrets = load_secret() or {}
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({
+                "Authorization": f"Bearer {secrets.get('token', '')}",
+                "Content-Type": "application/json",
+            })
+
+            _base_url = (constants.get("base_url") or "").rstrip("/")
+            _session = session
+        return _session
+
+
+def reset_session():
+    """
+    Menutup Session bersama agar dibuat ulang pada panggilan berikutnya,
+    mis. setelah base_url di constant.json diarahkan ke server lain.
+    """
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+# =============================================================================
+# RETRY
+# =============================================================================
+def reset_retry_budget(budget=RETRY_BUDGET):
+    """Mengisi ulang jatah retry; dipanggil di awal setiap laporan/sinkronisasi."""
+    global _retry_budget
+    with _retry_lock:
+        _retry_budget = budget
+
+
+def _take_retry(attempt):
+    """True jika request boleh diulang (batas per request dan jatah laporan)."""
+    global _retry_budget
+    if attempt >= MAX_RETRIES:
+        return False
+    with _retry_lock:
+        if _retry_budget <= 0:
+            return False
+        _retry_budget -= 1
+        return True
+
+
+def _parse_retry_after(value):
+    """Header Retry-After (detik atau HTTP-date) dalam detik, None jika tidak valid."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff_delay(attempt, retry_after=None):
+    """Jeda sebelum percobaan ulang: full jitter, atau Retry-After dari server."""
+    if retry_after is not None:
+        return min(retry_after, BACKOFF_MAX * 3) + random.uniform(0, BACKOFF_BASE)
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def _send(session, url, **kwargs):
+    """
+    session.get dengan rate limit bersama dan retry untuk timeout, gagal koneksi,
+    429 dan 5xx. Response terakhir dikembalikan apa adanya jika retry habis.
+    """
+    attempt = 0
+    while True:
+        _limiter.acquire()
+        try:
+            response = session.get(url, **kwargs)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            if not _take_retry(attempt):
+                raise
+            time.sleep(_backoff_delay(attempt))
+            attempt += 1
+            continue
+
+        if response.status_code not in RETRY_STATUS:
+            _limiter.recover()
+            return response
+
+        retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+        if response.status_code == 429:
+            _limiter.throttle(retry_after)
+        if not _take_retry(attempt):
+            return response
+        response.close()
+        time.sleep(_backoff_delay(attempt, retry_after))
+        attempt += 1
+
+
+@perf.timed("fetch")
+def api_get(endpoint, params=None, timeout=None, conditional=None, **kwargs):
+    """
+    GET ke endpoint MileApp (mis. "/tasks") memakai Session bersama.
+    Melempar requests.exceptions.* seperti requests.get + raise_for_status,
+    sehingga pemanggil tetap bisa memakai handle_requests_error. Timeout,
+    gagal koneksi, 429 dan 5xx diulang otomatis (lihat _send).
+
+    Untuk endpoint di CONDITIONAL_ENDPOINTS (atau conditional=True), validator
+    ETag / Last-Modified disimpan per URL+params. Request berikutnya dikirim
+    bersyarat dan jika server membalas 304, body tersimpan yang dikembalikan.
+    """
+    if day_archive.is_offline():
+        # Mode offline (lihat utils.day_archive): data hanya dari arsip
+        raise day_archive.ArchiveMiss(endpoint)
+    session = get_session()
+    if timeout is None:
+        timeout = ENDPOINT_TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT)
+    if conditional is None:
+        conditional = endpoint in CONDITIONAL_ENDPOINTS
+    if not conditional:
+        response = _send(session, f"{_base_url}{endpoint}", params=params, timeout=timeout, **kwargs)
+        response.raise_for_status()
+        return response
+
+    stored = response_cache.get_validated(endpoint, params)
+    headers = dict(kwargs.pop("headers", None) or {})
+    if stored:
+        if stored.get("etag"):
+            headers["If-None-Match"] = stored["etag"]
+        if stored.get("last_modified"):
+            headers["If-Modified-Since"] = stored["last_modified"]
+
+    response = _send(session, f"{_base_url}{endpoint}", params=params, timeout=timeout,
+                     headers=headers or None, **kwargs)
+    if response.status_code == 304 and stored:
+        _count_conditional("hits")
+        return _response_from_stored(response, stored)
+
+    response.raise_for_status()
+    _count_conditional("misses")
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        response_cache.put_validated(endpoint, params, etag, last_modified, response.text)
+    return response
+
+
+def _response_from_stored(not_modified, stored):
+    """Membuat Response 200 dari body tersimpan untuk balasan 304."""
+    response = requests.Response()
+    response.status_code = 200
+    response._content = stored["body"].encode("utf-8")
+    response.encoding = "utf-8"
+    response.headers.update(not_modified.headers)
+    response.url = not_modified.url
+    response.request = not_modified.request
+    return response
+
+
+def _count_conditional(kind):
+    with _stats_lock:
+        _conditional_stats[kind] += 1
+
+
+def get_conditional_stats():
+    """Jumlah hit (304, body dari cache) dan miss (body diunduh) request bersyarat."""
+    with _stats_lock:
+        return dict(_conditional_stats)
+
+
+# =============================================================================
+# PROYEKSI FIELD
+# =============================================================================
+
+# Set MILEAPP_DEBUG_FIELDS=1 untuk memberi peringatan saat kode membaca field
+# yang tidak ikut diminta lewat parameter 'fields'
+DEBUG_PROJECTION = os.environ.get("MILEAPP_DEBUG_FIELDS", "").lower() in ("1", "true", "yes")
+
+_warned_fields = set()
+
+
+class ProjectedRecord(dict):
+    """
+    Record hasil query berproyeksi (hanya dipakai di mode debug).
+    Membaca key top-level yang tidak diproyeksikan memunculkan warning sekali
+    per endpoint+field, karena nilainya pasti kosong dari server.
+    """
+
+    def __init__(self, data, endpoint, fields):
+        super().__init__(data)
+        self._endpoint = endpoint
+        self._fields = fields
+
+    def _check(self, key):
+        if key not in self._fields and (self._endpoint, key) not in _warned_fields:
+            _warned_fields.add((self._endpoint, key))
+            warnings.warn(
+                f"Field '{key}' dibaca dari {self._endpoint} tetapi tidak ada di daftar fields "
+                f"({', '.join(self._fields)})",
+                stacklevel=3
+            )
+
+    def __getitem__(self, key):
+        self._check(key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self._check(key)
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        self._check(key)
+        return super().__contains__(key)
+
+
+def _apply_fields(params, fields):
+    """Menambahkan parameter 'fields' (proyeksi server) ke params."""
+    if fields:
+        params["fields"] = ",".join(fields)
+    return params
+
+
+def _project(items, endpoint, fields):
+    """Membungkus item dengan ProjectedRecord jika mode debug proyeksi aktif."""
+    if not (DEBUG_PROJECTION and fields):
+        return items
+    field_set = frozenset(fields)
+    return [ProjectedRecord(item, endpoint, field_set) if isinstance(item, dict) else item for item in items]
+
+
+# =============================================================================
+# PAGINASI
+# =============================================================================
+def _extract_page(payload, data_key):
+    """
+    Memisahkan list item dan metadata paginasi dari response MileApp.
+    Contoh: /tasks -> {"tasks": {"data": [...], "last_page": 3}}
+            /results -> {"data": {"data": [...], "last_page": 3}}
+    """
+    container = (payload or {}).get(data_key) or {}
+    if isinstance(container, list):
+        return container, {}
+    return container.get("data") or [], container
+
+
+def _has_next_page(count, container, page, limit):
+    """Menentukan apakah masih ada halaman setelah `page` (count = jumlah item halaman ini)."""
+    if not count:
+        return False
+    last_page = container.get("last_page")
+    if last_page is not None:
+        try:
+            return page < int(last_page)
+        except (TypeError, ValueError):
+            pass
+    return count >= limit
+
+
+def _record_cache_hit(stats, items, limit):
+    """Mengisi stats untuk data yang dilayani dari cache (tanpa request)."""
+    if stats is None:
+        return
+    stats["pages"] = stats.get("pages", 0) + max(1, math.ceil(len(items) / limit))
+    stats["rows"] = stats.get("rows", 0) + len(items)
+    stats["cached"] = True
+
+
+def iter_pages(endpoint, params, data_key, stats=None, use_cache=False, force_refresh=False, fields=None):
+    """
+    Generator yang menelusuri semua halaman endpoint sampai habis dan
+    menghasilkan list item per halaman. Halaman berikutnya sudah diminta
+    (prefetch) selagi pemanggil masih memproses halaman saat ini.
+
+    Args:
+        endpoint (str): Endpoint MileApp, mis. "/tasks".
+        params (dict): Parameter query; 'limit' dipakai sebagai ukuran halaman.
+        data_key (str): Key pembungkus data di response ("tasks" atau "data").
+        stats (dict, optional): Diisi jumlah 'pages' dan 'rows' yang diambil.
+        use_cache (bool): Pakai cache disk (utils.response_cache) untuk query ini.
+        force_refresh (bool): Abaikan isi cache dan ambil ulang dari server.
+        fields (tuple, optional): Field top-level yang dibaca pemanggil; hanya
+            field ini yang diminta dari server.
+    """
+    base_params = _apply_fields(dict(params or {}), fields)
+    limit = int(base_params.get("limit") or 100)
+    page = int(base_params.pop("page", 1) or 1)
+    if stats is not None:
+        stats.setdefault("pages", 0)
+        stats.setdefault("rows", 0)
+
+    if use_cache and not force_refresh:
+        cached_items = response_cache.get(endpoint, base_params)
+        if cached_items is not None:
+            _record_cache_hit(stats, cached_items, limit)
+            for start in range(0, len(cached_items), limit):
+                yield _project(cached_items[start:start + limit], endpoint, fields)
+            return
+    collected = [] if use_cache else None
+
+    def fetch(page_no):
+        return api_get(endpoint, params={**base_params, "page": page_no}).json()
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        pending = executor.submit(fetch, page)
+        while pending is not None:
+            with perf.span("fetch"):
+                payload = pending.result()
+            items, container = _extract_page(payload, data_key)
+            pending = None
+            if _has_next_page(len(items), container, page, limit):
+                pending = executor.submit(fetch, page + 1)
+
+            if stats is not None:
+                stats["pages"] += 1
+                stats["rows"] += len(items)
+            if collected is not None:
+                collected.extend(items)
+            if items:
+                yield _project(items, endpoint, fields)
+            page += 1
+
+        # Hanya disimpan jika semua halaman berhasil ditelusuri
+        if collected is not None:
+            response_cache.put(endpoint, base_params, collected)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Jumlah maksimal halaman yang diambil bersamaan oleh fetch_all_pages
+MAX_PAGE_WORKERS = 4
+
+
+def _total_pages(container, limit):
+    """Membaca total halaman dari metadata paginasi, None jika tidak tersedia."""
+    try:
+        if container.get("last_page") is not None:
+            return int(container["last_page"])
+        if container.get("total") is not None:
+            return max(1, math.ceil(int(container["total"]) / limit))
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+def _fetch_all_pages(endpoint, base_params, data_key, max_workers, stats):
+    """Mengambil semua halaman dari server (tanpa cache), lihat fetch_all_pages."""
+    limit = int(base_params.get("limit") or 100)
+
+    def fetch(page_no):
+        payload = api_get(endpoint, params={**base_params, "page": page_no}).json()
+        return _extract_page(payload, data_key)[0]
+
+    first_payload = api_get(endpoint, params={**base_params, "page": 1}).json()
+    first_items, container = _extract_page(first_payload, data_key)
+    all_items = list(first_items)
+    pages = 1
+
+    total_pages = _total_pages(container, limit)
+    if total_pages is None:
+        if len(first_items) >= limit:
+            for items in iter_pages(endpoint, {**base_params, "page": 2}, data_key):
+                all_items.extend(items)
+                pages += 1
+    elif total_pages > 1:
+        workers = max(1, min(max_workers, total_pages - 1))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # executor.map mengembalikan hasil sesuai urutan halaman
+            for items in executor.map(fetch, range(2, total_pages + 1)):
+                all_items.extend(items)
+                pages += 1
+
+    if stats is not None:
+        stats["pages"] = stats.get("pages", 0) + pages
+        stats["rows"] = stats.get("rows", 0) + len(all_items)
+    return all_items
+
+
+@perf.timed("fetch")
+def fetch_all_pages(endpoint, params, data_key, max_workers=MAX_PAGE_WORKERS, stats=None,
+                    use_cache=False, force_refresh=False, fields=None):
+    """
+    Mengambil semua halaman endpoint dan mengembalikan gabungan item-nya
+    dengan urutan halaman tetap terjaga.
+
+    Halaman pertama diambil lebih dulu untuk membaca total halaman, lalu
+    halaman sisanya diambil paralel di thread pool berukuran terbatas.
+    Jika server tidak mengirim total, halaman diambil berurutan lewat
+    iter_pages selama halaman masih penuh.
+
+    Dengan use_cache=True, hasil gabungan disimpan di cache memori dan disk
+    sehingga laporan ulang untuk tanggal yang sudah lewat tidak perlu request
+    lagi, dan laporan lain yang meminta query sama secara bersamaan cukup
+    menunggu satu request yang sedang berjalan.
+
+    `fields` berisi field top-level yang dibaca pemanggil, dikirim sebagai
+    parameter 'fields' agar server hanya mengirim field tersebut.
+    """
+    base_params = _apply_fields(dict(params or {}), fields)
+    base_params.pop("page", None)
+    limit = int(base_params.get("limit") or 100)
+
+    if not use_cache:
+        return _project(_fetch_all_pages(endpoint, base_params, data_key, max_workers, stats), endpoint, fields)
+
+    fetch_stats = {}
+
+    def load():
+        if not force_refresh:
+            cached_items = response_cache.get(endpoint, base_params)
+            if cached_items is None:
+                cached_items = day_archive.get_or_raise(endpoint, base_params)
+            if cached_items is not None:
+                return cached_items
+        items = _fetch_all_pages(endpoint, base_params, data_key, max_workers, fetch_stats)
+        response_cache.put(endpoint, base_params, items)
+        day_archive.put(endpoint, base_params, items)
+        return items
+
+    all_items = response_cache.single_flight(endpoint, base_params, load, force_refresh)
+    if not fetch_stats:
+        _record_cache_hit(stats, all_items, limit)
+    elif stats is not None:
+        stats["pages"] = stats.get("pages", 0) + fetch_stats["pages"]
+        stats["rows"] = stats.get("rows", 0) + fetch_stats["rows"]
+    return _project(all_items, endpoint, fields)
+
+
+# =============================================================================
+# STREAMING PER ITEM
+# =============================================================================
+
+# Ukuran potongan body response yang dibaca per iterasi saat streaming
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def iter_items(endpoint, params, data_key, stats=None, use_cache=False, force_refresh=False, fields=None):
+    """
+    Generator yang menghasilkan item satu per satu dari semua halaman endpoint.
+
+    Body response di-decode bertahap (utils.json_stream) selagi diunduh, jadi
+    memori puncak dibatasi oleh item yang sedang diproses, bukan seluruh
+    payload satu hari. Parameter sama dengan iter_pages; dengan use_cache=True
+    item ditulis ke cache disk secara bertahap dan dibaca ulang dengan cara
+    yang sama (cache memori tidak dipakai untuk jalur ini).
+
+    Seperti iter_pages, halaman berikutnya sudah diunduh di background selagi
+    halaman saat ini di-decode dan diproses pemanggil (paling banyak satu
+    halaman mentah di memori). Sebelum total halaman diketahui dari halaman
+    pertama, halaman kedua diminta secara spekulatif; jika ternyata tidak
+    ada, hasilnya dibuang (satu request ekstra untuk query satu halaman).
+    """
+    base_params = _apply_fields(dict(params or {}), fields)
+    limit = int(base_params.get("limit") or 100)
+    page = int(base_params.pop("page", 1) or 1)
+    if stats is None:
+        stats = {}
+    stats.setdefault("pages", 0)
+    stats.setdefault("rows", 0)
+
+    if use_cache and not force_refresh:
+        cached_items = response_cache.iter_cached_items(endpoint, base_params)
+        if cached_items is None:
+            archived = day_archive.get_or_raise(endpoint, base_params, remember=False)
+            cached_items = iter(archived) if archived is not None else None
+        if cached_items is not None:
+            stats["cached"] = True
+            for item in perf.timed_iter("decode", cached_items):
+                stats["rows"] += 1
+                stats["pages"] = math.ceil(stats["rows"] / limit)
+                yield _project([item], endpoint, fields)[0]
+            return
+
+    def prefetch(page_no):
+        response = api_get(endpoint, params={**base_params, "page": page_no}, stream=True)
+        try:
+            return response.content
+        finally:
+            response.close()
+
+    def body_chunks(body):
+        for start in range(0, len(body), STREAM_CHUNK_SIZE):
+            yield body[start:start + STREAM_CHUNK_SIZE]
+
+    writer = response_cache.ItemWriter(endpoint, base_params) if use_cache else None
+    executor = ThreadPoolExecutor(max_workers=1)
+    pending = None
+    last_page = None
+    streamed = 0
+    completed = False
+    try:
+        while True:
+            container = {}
+            count = 0
+            response = None
+            if pending is not None:
+                with perf.span("fetch"):
+                    body = pending.result()
+                pending = None
+                chunks = body_chunks(body)
+            else:
+                response = api_get(endpoint, params={**base_params, "page": page}, stream=True)
+                # Membaca chunk dicatat sebagai "fetch", sisanya (parsing JSON) sebagai "decode"
+                chunks = perf.timed_iter("fetch", response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+            if last_page is None or page < last_page:
+                pending = executor.submit(prefetch, page + 1)
+            try:
+                items = iter_json_array(chunks, (data_key, "data"), container)
+                for item in perf.timed_iter("decode", items):
+                    count += 1
+                    streamed += 1
+                    stats["rows"] += 1
+                    if writer is not None:
+                        writer.write(item)
+                    yield _project([item], endpoint, fields)[0]
+            finally:
+                if response is not None:
+                    response.close()
+            stats["pages"] += 1
+            last_page = _total_pages(container, limit)
+
+            if not _has_next_page(count, container, page, limit):
+                break
+            page += 1
+        completed = True
+    finally:
+        # Prefetch yang belum dipakai (halaman terakhir / pemanggil berhenti) dibuang
+        executor.shutdown(wait=False, cancel_futures=True)
+        # Cache hanya disimpan jika semua halaman berhasil dibaca sampai habis
+        if writer is not None:
+            if completed:
+                writer.commit()
+            else:
+                writer.abort()
+    if (writer is not None and streamed <= day_archive.MAX_STREAM_ROWS
+            and day_archive.should_archive(endpoint, base_params)):
+        # Arsip dibuat dari cache yang baru ditulis, setelah semua item diproses
+        # pemanggil; query di atas MAX_STREAM_ROWS dilewati (tetap tersimpan di cache disk)
+        day_archive.put(endpoint, base_params, list(response_cache.iter_cached_items(endpoint, base_params) or ()))
@@ -1,12 +1,15 @@
 import requests
 from utils.function import show_error_message
 from utils.messages import ERROR_MESSAGES
+from utils.day_archive import ArchiveMiss
 
 def handle_requests_error(err):
     if isinstance(err, requests.exceptions.HTTPError):
         status_code = err.response.status_code
         if status_code == 401:
             show_error_message("Akses Ditolak (401)", ERROR_MESSAGES["API_TOKEN_MISSING"])
+        elif status_code == 429:
+            show_error_message("Batas Permintaan API (429)", ERROR_MESSAGES["RATE_LIMITED"])
         elif status_code >= 500:
             show_error_message("Masalah Server API", ERROR_MESSAGES["SERVER_ERROR"].format(error_detail=status_code))
         else:
@@ -21,6 +24,9 @@ def handle_requests_error(err):
     elif isinstance(err, requests.exceptions.ConnectionError):
         show_error_message("Koneksi Gagal", ERROR_MESSAGES["CONNECTION_ERROR"].format(error_detail="Tidak dapat terhubung ke server. Periksa koneksi internet Anda."))
 
+    elif isinstance(err, ArchiveMiss):
+        show_error_message("Arsip Tidak Ditemukan", ERROR_MESSAGES["ARCHIVE_MISSING"].format(error_detail=err))
+
     elif isinstance(err, requests.exceptions.RequestException):
         show_error_message("Kesalahan API", ERROR_MESSAGES["API_REQUEST_FAILED"].format(error_detail=err))
 
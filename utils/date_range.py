@@ -0,0 +1,76 @@
+# utils/date_range.py
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+import traceback
+import requests
+from utils.function import collect_errors, show_error_message
+from utils.messages import ERROR_MESSAGES
+from utils.api_handler import handle_requests_error
+
+# =============================================================================
+# LAPORAN RENTANG TANGGAL (PARALEL PER HARI)
+# =============================================================================
+
+# Jumlah hari yang diproses bersamaan. Hasil satu hari langsung diagregasi
+# lalu dibuang, jadi memori puncak sebanding dengan angka ini, bukan dengan
+# panjang rentang. Laju request tetap dibatasi rate limiter utils.api_client.
+MAX_DAY_WORKERS = 4
+
+# Batas panjang rentang agar satu laporan tidak menghabiskan kuota API
+MAX_RANGE_DAYS = 92
+
+
+def hari_dalam_rentang(date_formats):
+    """
+    Daftar tanggal (bentuk dict yang sama dengan pemilih tanggal di utils.gui)
+    dari "ymd" sampai "ymd_akhir" inklusif; tanpa "ymd_akhir" hanya satu hari.
+    """
+    awal = datetime.strptime(date_formats["ymd"], '%Y-%m-%d').date()
+    akhir = datetime.strptime(date_formats.get("ymd_akhir") or date_formats["ymd"], '%Y-%m-%d').date()
+    force_refresh = date_formats.get("force_refresh", False)
+    return [
+        {"dmy": day.strftime('%d-%m-%Y'), "ymd": day.strftime('%Y-%m-%d'), "force_refresh": force_refresh}
+        for day in (awal + timedelta(days=i) for i in range((akhir - awal).days + 1))
+    ]
+
+
+def _proses_satu_hari(collect, day):
+    """Menjalankan collect(day) dengan pesan error ditampung; mengembalikan (data, errors)."""
+    with collect_errors() as errors:
+        try:
+            data = collect(day)
+        except requests.exceptions.RequestException as e:
+            handle_requests_error(e)
+            data = None
+        except Exception as e:
+            show_error_message("Error Tak Terduga", ERROR_MESSAGES["UNKNOWN_ERROR"].format(
+                error_detail=f"{e}\n\n{traceback.format_exc()}"
+            ))
+            data = None
+    return (data or None), errors
+
+
+def iter_per_hari(collect, days, max_workers=MAX_DAY_WORKERS):
+    """
+    Menjalankan collect(day) untuk setiap hari secara paralel dan menghasilkan
+    (day, data, errors) begitu hari tersebut selesai (urutan tidak dijamin).
+    Paling banyak max_workers hari yang sedang diproses atau menunggu
+    diambil pemanggil, sehingga hasil yang belum diagregasi tidak menumpuk.
+    """
+    pending_days = iter(days)
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        running = {}
+        for day in pending_days:
+            running[executor.submit(_proses_satu_hari, collect, day)] = day
+            if len(running) >= max_workers:
+                break
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                day = running.pop(future)
+                data, errors = future.result()
+                yield day, data, errors
+                next_day = next(pending_days, None)
+                if next_day is not None:
+                    running[executor.submit(_proses_satu_hari, collect, next_day)] = next_day
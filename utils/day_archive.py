@@ -0,0 +1,244 @@
+# utils/day_archive.py
+
+from datetime import datetime
+import copy
+import hashlib
+import importlib.util
+import json
+import math
+import os
+import threading
+import requests
+import pandas as pd
+from utils.function import BASE_DIR, get_base_url_id
+from utils import perf, response_cache
+
+# =============================================================================
+# ARSIP HARIAN (PARQUET) PER HUB DAN TANGGAL
+# =============================================================================
+
+# Hasil /tasks, /results dan /location-histories untuk hari yang sudah lewat
+# disimpan sebagai file kolom (Parquet) agar laporan historis bisa dibuat
+# ulang atau dibandingkan tanpa request API:
+#   archive/source=<server>/<endpoint>/hub=<hubId>/date=<YYYY-MM-DD>/<query>.parquet
+# <server> adalah hash base_url (server tiruan dan MileApp asli terpisah),
+# <query> adalah hash parameter lain (status, fields, timeBy, ...) sehingga
+# query berbeda untuk hari yang sama tidak saling menimpa.
+ARCHIVE_DIR = os.path.join(BASE_DIR, 'archive')
+
+ARCHIVED_ENDPOINTS = ("/tasks", "/results", "/location-histories")
+
+# Item asli (JSON) disimpan utuh agar transform laporan berjalan sama persis;
+# kolom lain hasil json_normalize dipakai untuk scan/analisis
+RAW_COLUMN = "_raw"
+
+# Hub untuk query tanpa hubId (mis. /location-histories, difilter per email)
+ALL_HUBS = "semua"
+
+# Hasil stream (api_client.iter_items) dibaca ulang utuh ke memori untuk
+# ditulis sebagai Parquet; query yang lebih besar dari ini tidak diarsip agar
+# memori puncak jalur stream tetap terbatas
+MAX_STREAM_ROWS = 50000
+
+# Parameter yang menjadi partisi atau tidak memengaruhi isi data
+_PARTITION_PARAMS = ("hubId", "page", "limit", "dateFrom", "dateTo", "timeFrom", "timeTo")
+
+_offline = threading.Event()
+
+
+class ArchiveMiss(requests.exceptions.RequestException):
+    """Mode offline: data yang diminta tidak ada di arsip (tidak ada request API)."""
+
+
+def is_available():
+    """True bila engine Parquet (pyarrow/fastparquet) terpasang; tanpa itu arsip tidak aktif."""
+    return any(importlib.util.find_spec(name) is not None for name in ("pyarrow", "fastparquet"))
+
+
+def set_offline(enabled=True):
+    """Mode offline: laporan hanya memakai arsip, request API dibatalkan (ArchiveMiss)."""
+    if enabled:
+        _offline.set()
+    else:
+        _offline.clear()
+
+
+def is_offline():
+    return _offline.is_set()
+
+
+# =============================================================================
+# KUNCI PARTISI
+# =============================================================================
+def _day_of(params):
+    """Tanggal data (akhir rentang query) dalam bentuk YYYY-MM-DD, None jika tidak ada/tidak valid."""
+    for key in ("dateTo", "timeTo"):
+        value = str((params or {}).get(key) or '')[:10]
+        if value:
+            try:
+                datetime.strptime(value, '%Y-%m-%d')
+            except ValueError:
+                return None
+            return value
+    return None
+
+
+def _query_id(params):
+    """
+    Hash parameter query selain hub/tanggal/paginasi. Batas rentang waktu
+    ditulis relatif terhadap tanggal data ("-1 00:00:00"), jadi query yang
+    sama untuk hari berbeda mendapat nama file yang sama.
+    """
+    day = datetime.strptime(_day_of(params), '%Y-%m-%d').date()
+    normalized = sorted(
+        (str(k), str(v)) for k, v in (params or {}).items()
+        if k not in _PARTITION_PARAMS and v is not None
+    )
+    for key in ("dateFrom", "dateTo", "timeFrom", "timeTo"):
+        value = str(params.get(key) or '')
+        if value:
+            offset = (datetime.strptime(value[:10], '%Y-%m-%d').date() - day).days
+            normalized.append((key, f"{offset}{value[10:]}"))
+    raw = json.dumps(normalized, ensure_ascii=False)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+
+def _endpoint_dir(endpoint):
+    return os.path.join(ARCHIVE_DIR, f"source={get_base_url_id()}", endpoint.strip('/').replace('/', '_'))
+
+
+def archive_path(endpoint, params):
+    """Path file arsip untuk satu query, None jika query bukan data harian yang diarsip."""
+    day = _day_of(params)
+    if endpoint not in ARCHIVED_ENDPOINTS or day is None:
+        return None
+    hub = str(params.get("hubId") or ALL_HUBS)
+    return os.path.join(_endpoint_dir(endpoint), f"hub={hub}", f"date={day}", f"{_query_id(params)}.parquet")
+
+
+def should_archive(endpoint, params):
+    """Hanya hari yang sudah lewat (data final, lihat response_cache.ttl_for) yang diarsip."""
+    return (is_available() and archive_path(endpoint, params) is not None
+            and response_cache.ttl_for(params) is None)
+
+
+# =============================================================================
+# BACA / TULIS
+# =============================================================================
+def _to_text(value):
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def to_frame(items):
+    """
+    Item JSON -> DataFrame kolom bertipe: field bersarang diratakan
+    ("finish.totalDistance"), list/dict dan kolom bertipe campuran disimpan
+    sebagai teks JSON, ditambah RAW_COLUMN berisi item asli.
+    """
+    df = pd.json_normalize(items, sep='.')
+    for col in df.columns:
+        if df[col].dtype == object and any(not isinstance(v, str) for v in df[col].dropna()):
+            df[col] = df[col].map(_to_text)
+    df[RAW_COLUMN] = [json.dumps(item, ensure_ascii=False) for item in items]
+    return df
+
+
+def put(endpoint, params, items):
+    """Menyimpan item satu query ke arsip (ditimpa bila sudah ada). Gagal menulis diabaikan."""
+    if not items or not should_archive(endpoint, params):
+        return
+    path = archive_path(endpoint, params)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        to_frame(items).to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except Exception:
+        # Arsip hanya pelengkap: gagal menulis (termasuk error engine Parquet
+        # untuk tipe kolom yang tidak didukung) tidak boleh menggagalkan laporan
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def get(endpoint, params, remember=True):
+    """
+    Item asli satu query dari arsip, None jika belum diarsip. Seperti hasil
+    disk di response_cache.get, hasil arsip dinaikkan ke cache memori (tanpa
+    kedaluwarsa, hari yang sudah lewat tidak berubah) sehingga pembacaan
+    berikutnya tidak men-decode Parquet lagi. remember=False untuk jalur
+    stream (api_client.iter_items) yang tidak memakai cache memori.
+    """
+    key = response_cache.make_cache_key(endpoint, params)
+    if remember:
+        items = response_cache._memory_get(key)
+        if items is not None:
+            return items
+    path = archive_path(endpoint, params)
+    if path is None or not os.path.exists(path) or not is_available():
+        return None
+    try:
+        with perf.span("decode"):
+            raw = pd.read_parquet(path, columns=[RAW_COLUMN])[RAW_COLUMN]
+            items = [json.loads(text) for text in raw]
+    except (OSError, ValueError):
+        return None
+    if not remember:
+        return items
+    response_cache._memory_put(key, items, None)
+    return copy.deepcopy(items)
+
+
+def get_or_raise(endpoint, params, remember=True):
+    """Seperti get(), tetapi di mode offline arsip yang tidak ada melempar ArchiveMiss."""
+    items = get(endpoint, params, remember)
+    if items is None and is_offline():
+        raise ArchiveMiss(f"{endpoint} {params.get('hubId') or ALL_HUBS} {_day_of(params)}")
+    return items
+
+
+def scan(endpoint, hub=None, date_from=None, date_to=None, columns=None, params=None):
+    """
+    Membaca arsip satu endpoint (server di base_url saat ini) sebagai satu
+    DataFrame tanpa request API, ditambah kolom "hub" dan "date" dari partisi.
+
+    Args:
+        hub (str | list, optional): hubId yang dibaca; default semua.
+        date_from, date_to (str, optional): Batas tanggal YYYY-MM-DD (inklusif).
+        columns (list, optional): Kolom yang dibaca; default semua kecuali RAW_COLUMN.
+        params (dict, optional): Hanya query ini (params yang dipakai laporan
+            untuk tanggal mana pun; hub dan tanggal diabaikan); default semua query.
+            Harus memuat dateTo atau timeTo seperti query laporan, karena batas
+            rentang waktu disimpan relatif terhadap tanggal tersebut (ValueError
+            bila tidak ada).
+    """
+    if params is not None and _day_of(params) is None:
+        raise ValueError("params scan harus memuat dateTo atau timeTo (YYYY-MM-DD) seperti query laporan")
+    hubs = {hub} if isinstance(hub, str) else (set(hub) if hub else None)
+    query_name = f"{_query_id(params)}.parquet" if params is not None else None
+    frames = []
+    root = _endpoint_dir(endpoint)
+    for hub_dir in sorted(os.listdir(root)) if os.path.isdir(root) else []:
+        hub_id = hub_dir.partition('=')[2]
+        if hubs is not None and hub_id not in hubs:
+            continue
+        for date_dir in sorted(os.listdir(os.path.join(root, hub_dir))):
+            day = date_dir.partition('=')[2]
+            if (date_from and day < date_from) or (date_to and day > date_to):
+                continue
+            day_dir = os.path.join(root, hub_dir, date_dir)
+            for name in sorted(os.listdir(day_dir)):
+                if not name.endswith('.parquet') or (query_name and name != query_name):
+                    continue
+                df = pd.read_parquet(os.path.join(day_dir, name), columns=columns)
+                if columns is None:
+                    df = df.drop(columns=[RAW_COLUMN], errors='ignore')
+                frames.append(df.assign(hub=hub_id, date=day))
+    if not frames:
+        return pd.DataFrame(columns=list(columns or []) + ["hub", "date"])
+    return pd.concat(frames, ignore_index=True)
@@ -2,24 +2,113 @@ import os
 import sys
 import json
 import subprocess
+import threading
+import copy
+import hashlib
+from contextlib import contextmanager
+from types import MappingProxyType
 import pandas as pd
-from tkinter import filedialog, messagebox
-import tkinter as tk
 from utils.messages import ERROR_MESSAGES
+from utils import master_store
+from utils.plate_matcher import PlateMatcher
+
 # =============================================================================
-# PENGELOLAAN PATH TERPUSAT (PYINSTALLER-COMPATIBLE)
+# DIALOG (TK) DAN MODE HEADLESS
 # =============================================================================
 
+# tkinter baru diimpor saat dialog pertama kali dibutuhkan, agar laporan yang
+# dijalankan dari CLI (lihat cli.py) tidak memuat Tk sama sekali
+messagebox = None
+filedialog = None
+
+# Mode headless: pesan dicetak ke konsol, file disimpan ke HEADLESS_OUTPUT_DIR
+# tanpa dialog dan tidak dibuka. Diaktifkan lewat enable_headless().
+HEADLESS = False
+HEADLESS_OUTPUT_DIR = None
+HEADLESS_ERRORS = []
+
+# Nilai config.json yang ditimpa untuk proses ini saja (mis. --lokasi di CLI)
+CONFIG_OVERRIDES = {}
+
+# Penimpaan config dan penampung pesan per thread (lihat config_override dan
+# collect_errors), dipakai saat beberapa hub diproses paralel
+_thread_state = threading.local()
+
+
+def _load_tk_dialogs():
+    global messagebox, filedialog
+    if messagebox is None or filedialog is None:
+        from tkinter import filedialog as tk_filedialog, messagebox as tk_messagebox
+        messagebox = messagebox or tk_messagebox
+        filedialog = filedialog or tk_filedialog
+
+
+def enable_headless(output_dir, config_overrides=None):
+    """Mengaktifkan mode headless untuk proses ini (dipakai oleh cli.py)."""
+    global HEADLESS, HEADLESS_OUTPUT_DIR
+    HEADLESS = True
+    HEADLESS_OUTPUT_DIR = output_dir
+    HEADLESS_ERRORS.clear()
+    CONFIG_OVERRIDES.clear()
+    CONFIG_OVERRIDES.update(config_overrides or {})
+
+
+@contextmanager
+def config_override(**values):
+    """Menimpa nilai config.json hanya untuk thread ini selama blok with."""
+    previous = getattr(_thread_state, "config", None)
+    _thread_state.config = {**(previous or {}), **values}
+    try:
+        yield
+    finally:
+        _thread_state.config = previous
+
+
+@contextmanager
+def collect_errors():
+    """
+    Pesan error di thread ini ditampung ke list (bukan ditampilkan) selama
+    blok with, agar pemanggil bisa menampilkannya sekaligus.
+    """
+    previous = getattr(_thread_state, "errors", None)
+    errors = []
+    _thread_state.errors = errors
+    try:
+        yield errors
+    finally:
+        _thread_state.errors = previous
+
 
 def show_error_message(title, message):
+    collected = getattr(_thread_state, "errors", None)
+    if collected is not None:
+        collected.append(f"{title}: {message}")
+        return
+    if HEADLESS:
+        HEADLESS_ERRORS.append(f"{title}: {message}")
+        print(f"[ERROR] {title}: {message}", file=sys.stderr)
+        return
+    _load_tk_dialogs()
     messagebox.showerror(title, message)
 
 def show_info_message(title, message):
+    if HEADLESS:
+        print(f"[INFO] {title}: {message}")
+        return
+    _load_tk_dialogs()
     messagebox.showinfo(title, message)
 
 def show_ask_message(title, message):
+    # Tanpa pengguna, pertanyaan ya/tidak selalu dijawab "tidak"
+    if HEADLESS:
+        return False
+    _load_tk_dialogs()
     return messagebox.askyesno(title, message)
 
+# =============================================================================
+# PENGELOLAAN PATH TERPUSAT (PYINSTALLER-COMPATIBLE)
+# =============================================================================
+
 def get_base_path():
     """
     Mendapatkan path dasar aplikasi, baik saat dijalankan sebagai skrip
@@ -58,7 +147,9 @@ SECRET_PATH = resource_path('secret.json')
 BASE_DIR = get_base_path()
 CONFIG_PATH = os.path.join(BASE_DIR, 'config.json')
 MASTER_JSON_PATH = os.path.join(BASE_DIR, 'master.json')
+MASTER_DB_PATH = os.path.join(BASE_DIR, 'master.db')
 TYPE_MAP_PATH = os.path.join(BASE_DIR, 'type_map.json')
+SYNC_STATE_PATH = os.path.join(BASE_DIR, 'sync_state.json')
 CONSTANT_PATH = resource_path('constant.json')
 
 
@@ -100,19 +191,111 @@ def save_json_data(data, file_path):
             json.dump(data, f, ensure_ascii=False, indent=4)
         return True
     except IOError as e:
-        messagebox.showerror("Gagal Menyimpan File", f"Gagal menyimpan data ke '{os.path.basename(file_path)}':\n{e}")
+        show_error_message("Gagal Menyimpan File", f"Gagal menyimpan data ke '{os.path.basename(file_path)}':\n{e}")
         return False
+    finally:
+        invalidate_json_cache(file_path)
+
+# =============================================================================
+# CACHE FILE JSON (CONFIG, CONSTANT, MASTER, TYPE MAP)
+# =============================================================================
+
+# (path, slot) -> (stamp file, data). Entri dianggap basi bila mtime/ukuran
+# file berubah (mis. ditulis proses lain) atau dibuang lewat invalidate_json_cache.
+_json_cache = {}
+_json_cache_lock = threading.Lock()
+
+def _file_stamp(file_path):
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def invalidate_json_cache(file_path=None):
+    """Membuang cache satu file (atau semua file bila file_path None)."""
+    with _json_cache_lock:
+        if file_path is None:
+            _json_cache.clear()
+        else:
+            path = os.path.abspath(file_path)
+            for key in [key for key in _json_cache if key[0] == path]:
+                del _json_cache[key]
+
+def _cached(file_path, build, loader=None, slot=None):
+    """
+    Hasil build(data) untuk file_path, dihitung ulang hanya bila file berubah.
+    data dibaca dengan loader(file_path) (default: JSON); slot membedakan
+    beberapa hasil turunan dari file yang sama. build mengembalikan None bila
+    data tidak valid (tidak di-cache).
+    """
+    path = os.path.abspath(file_path)
+    key = (path, slot)
+    stamp = _file_stamp(path)
+    if stamp is None:
+        return None
+    with _json_cache_lock:
+        entry = _json_cache.get(key)
+    if entry is not None and entry[0] == stamp:
+        return entry[1]
+    data = (loader or load_json_data)(file_path)
+    value = build(data) if data is not None else None
+    if value is not None:
+        with _json_cache_lock:
+            _json_cache[key] = (stamp, value)
+    return value
+
+def _load_json_cached(file_path):
+    """Isi file JSON dari cache; yang dikembalikan salinan agar aman diubah pemanggil."""
+    return copy.deepcopy(_cached(file_path, lambda data: data))
 
 def load_config():
-    """Memuat konfigurasi dari config.json."""
-    return load_json_data(CONFIG_PATH)
+    """Memuat konfigurasi dari config.json (ditambah CONFIG_OVERRIDES dan config_override bila ada)."""
+    config = _load_json_cached(CONFIG_PATH)
+    thread_overrides = getattr(_thread_state, "config", None)
+    if CONFIG_OVERRIDES or thread_overrides:
+        config = {**(config or {}), **CONFIG_OVERRIDES, **(thread_overrides or {})}
+    return config
 
 def load_constants():
     """Memuat konstanta dari constant.json."""
-    return load_json_data(CONSTANT_PATH)
+    return _load_json_cached(CONSTANT_PATH)
+
+def get_base_url_id():
+    """
+    Hash pendek base_url di constant.json. Ikut di kunci cache response,
+    validator HTTP dan arsip harian, agar data dari server lain (mis. server
+    tiruan tools/fake_server.py) tidak tercampur dengan data MileApp asli.
+    """
+    def build(data):
+        base_url = str(data.get("base_url") or "").rstrip("/") if isinstance(data, dict) else ""
+        return hashlib.sha1(base_url.encode('utf-8')).hexdigest()[:12]
+    return _cached(CONSTANT_PATH, build, slot="base_url_id") or build(None)
 
 def load_type_map():
-    return load_json_data(TYPE_MAP_PATH)
+    """Substitusi tipe kendaraan dari master store, bentuk {"type": {...}} seperti type_map.json."""
+    ensure_master_store()
+    return copy.deepcopy(_cached(MASTER_DB_PATH, lambda data: {"type": data}, master_store.load_type_map, slot="type_map"))
+
+def save_type_map(type_map):
+    """Menyimpan substitusi tipe kendaraan ke master store."""
+    ensure_master_store()
+    master_store.save_type_map(MASTER_DB_PATH, type_map)
+    invalidate_json_cache(MASTER_DB_PATH)
+
+def ensure_master_store():
+    """Migrasi sekali dari master.json/type_map.json bila master.db belum ada."""
+    if not os.path.exists(MASTER_DB_PATH):
+        master_store.migrate_from_json(MASTER_DB_PATH, MASTER_JSON_PATH, TYPE_MAP_PATH)
+
+def save_master_sync(drivers=(), hub_ids=None, sync_meta=None):
+    """Menyimpan hasil sync (hanya baris yang berubah) ke master store dalam satu transaksi."""
+    ensure_master_store()
+    try:
+        changed = master_store.save_sync(MASTER_DB_PATH, drivers, hub_ids, sync_meta)
+    finally:
+        invalidate_json_cache(MASTER_DB_PATH)
+    return changed
 
 def ensure_config_exists():
     """
@@ -123,43 +306,134 @@ def ensure_config_exists():
         default_config = {"lokasi": "", "user_checked": None}
         save_json_data(default_config, CONFIG_PATH)
 
-def load_master_data(lokasi_cabang=None):
-    """Memuat dan memproses master.json."""
-    data = load_json_data(MASTER_JSON_PATH)
-    if data is None:
+def get_user_hub_codes():
+    """
+    Kode lokasi hub yang boleh diakses pengguna (user_checked.hub_id di
+    config.json, dipetakan lewat hub_ids di master store), urut sesuai
+    constant.json. List kosong bila data pengguna/master belum ada.
+    """
+    config = load_config() or {}
+    constants = load_constants() or {}
+    lookups = get_master_lookups()
+    hub_id_to_code = lookups["hub_id_to_code"] if lookups else {}
+
+    user_hub_ids = (config.get('user_checked') or {}).get('hub_id') or []
+    if isinstance(user_hub_ids, str):
+        user_hub_ids = [user_hub_ids]
+    allowed = {hub_id_to_code[mongo_id] for mongo_id in user_hub_ids if mongo_id in hub_id_to_code}
+    return [kode for kode in constants.get('location_id', {}).values() if kode in allowed]
+
+def _build_master(data):
+    """DataFrame driver yang sudah dinormalisasi beserta lookup turunannya (sekali per perubahan master.db)."""
+    if 'driver' not in data:
         return None
-    
+    df = pd.DataFrame(data['driver'])  # gunakan key "driver"
+    if not df.empty:
+        df.columns = [col.strip() for col in df.columns]
+        if 'Email' not in df.columns or 'Driver' not in df.columns:
+            return None
+        df['Email'] = df['Email'].astype(str).str.strip().str.lower()
+        df['Driver'] = df['Driver'].astype(str).str.strip()
+
+    hub_ids = data.get("hub_ids", {})
+    records = df.to_dict('records') if not df.empty else []
+    lookups = {
+        # Record driver utuh per email (pengganti iterrows di laporan)
+        "email_to_record": {row['Email']: MappingProxyType(row) for row in records},
+        "email_to_driver": {row['Email']: row['Driver'] for row in records},
+        "email_to_plat": {row['Email']: row.get('Plat') for row in records},
+        "plat_to_type": {str(row.get('Plat')): row.get('Type') for row in records if 'Plat' in row},
+        "hub_code_to_id": dict(hub_ids),
+        "hub_id_to_code": {v: k for k, v in hub_ids.items()},
+    }
+    return {
+        "df": df,
+        "hub_ids": hub_ids,
+        "lookups": MappingProxyType({
+            **{name: MappingProxyType(value) for name, value in lookups.items()},
+            # Pencocokan plat di nama kendaraan -> tipe (lihat utils.plate_matcher)
+            "plate_matcher": PlateMatcher(lookups["plat_to_type"]),
+        }),
+    }
+
+def _master_error_key(data):
+    """Kunci pesan error untuk isi master store yang gagal diproses _build_master."""
     try:
         if 'driver' not in data:
-            show_error_message("Gagal Memuat Master Data", ERROR_MESSAGES["MASTER_DATA_MISSING"])
-            return None
+            return "MASTER_DATA_MISSING"
+        columns = {str(col).strip() for col in pd.DataFrame(data['driver']).columns}
+        if data['driver'] and not {'Email', 'Driver'} <= columns:
+            return "MASTER_DATA_MISSING"
+    except Exception:
+        pass
+    return "MASTER_FILE_ERROR"
 
-        df = pd.DataFrame(data['driver'])  # gunakan key "driver"
-        if not df.empty: 
-            df.columns = [col.strip() for col in df.columns]
-            if 'Email' not in df.columns or 'Driver' not in df.columns:
-                show_error_message("Gagal Memuat Master Data", ERROR_MESSAGES["MASTER_DATA_MISSING"])
-                return None
-
-            df['Email'] = df['Email'].astype(str).str.strip().str.lower()
-            df['Driver'] = df['Driver'].astype(str).str.strip()
-            if lokasi_cabang:
-                df = df[df['Email'].str.contains(lokasi_cabang, case=False, na=False)].copy()
-        
-        return {
-            "df": df,
-            "hub_ids": data.get("hub_ids", {})
-        }
+def _load_master_entry(lokasi_cabang=None):
+    ensure_master_store()
+    try:
+        if lokasi_cabang:
+            # Cabang dipilih lewat query ber-index di master store (satu hasil per cabang)
+            loader = lambda path: {**master_store.read_master_hubs(path),
+                                   "driver": master_store.drivers_for_lokasi(path, lokasi_cabang)}
+            return _cached(MASTER_DB_PATH, _build_master, loader, slot=f"lokasi:{lokasi_cabang}")
+        return _cached(MASTER_DB_PATH, _build_master, master_store.read_master)
     except Exception:
-        show_error_message("Gagal Memuat Master Data", ERROR_MESSAGES["MASTER_FILE_ERROR"])
         return None
 
-def get_save_path(base_name="Laporan", extension=".xlsx"):
-    """Membuka dialog untuk memilih folder penyimpanan."""
-    root = tk.Tk()
-    root.withdraw()
-    folder = filedialog.askdirectory(title="Pilih Lokasi Untuk Menyimpan File Laporan")
-    if not folder: return None
+def get_master_lookups():
+    """
+    Lookup siap pakai dari master store (read-only, dibangun ulang hanya bila
+    file berubah): email_to_record, email_to_driver, email_to_plat,
+    plat_to_type, plate_matcher, hub_code_to_id, hub_id_to_code. None bila
+    master tidak valid.
+    """
+    entry = _load_master_entry()
+    return entry["lookups"] if entry else None
+
+def load_master_data(lokasi_cabang=None):
+    """Memuat data driver dan hub_ids dari master store (master.db)."""
+    ensure_master_store()
+    if not os.path.exists(MASTER_DB_PATH):
+        return None
+    entry = _load_master_entry()
+    if entry is None:
+        data = master_store.read_master(MASTER_DB_PATH)
+        if data is None:
+            return None
+        show_error_message("Gagal Memuat Master Data", ERROR_MESSAGES[_master_error_key(data)])
+        return None
+
+    # Kode cabang yang terdaftar sebagai hub diambil lewat query ber-index;
+    # kode lain tetap dicocokkan ke email seperti sebelumnya
+    if lokasi_cabang and lokasi_cabang in entry["hub_ids"]:
+        entry = _load_master_entry(lokasi_cabang) or entry
+
+    # Salinan per pemanggil: DataFrame dan hub_ids di cache tidak boleh berubah
+    df = entry["df"]
+    if lokasi_cabang and not df.empty and lokasi_cabang not in entry["hub_ids"]:
+        df = df[df['Email'].str.contains(lokasi_cabang, case=False, na=False)].copy()
+    else:
+        df = df.copy()
+    return {
+        "df": df,
+        "hub_ids": dict(entry["hub_ids"])
+    }
+
+def get_save_folder():
+    """Membuka dialog untuk memilih folder penyimpanan (mode headless: HEADLESS_OUTPUT_DIR)."""
+    if HEADLESS:
+        folder = HEADLESS_OUTPUT_DIR
+        os.makedirs(folder, exist_ok=True)
+    else:
+        import tkinter as tk
+        _load_tk_dialogs()
+        root = tk.Tk()
+        root.withdraw()
+        folder = filedialog.askdirectory(title="Pilih Lokasi Untuk Menyimpan File Laporan")
+    return folder or None
+
+def unique_save_path(folder, base_name="Laporan", extension=".xlsx"):
+    """Path file di folder; diberi akhiran (1), (2), ... bila nama sudah dipakai."""
     save_path = os.path.join(folder, f"{base_name}{extension}")
     counter = 1
     while os.path.exists(save_path):
@@ -167,8 +441,17 @@ def get_save_path(base_name="Laporan", extension=".xlsx"):
         counter += 1
     return save_path
 
+def get_save_path(base_name="Laporan", extension=".xlsx"):
+    """Memilih folder lewat dialog lalu mengembalikan path file yang belum dipakai."""
+    folder = get_save_folder()
+    if not folder: return None
+    return unique_save_path(folder, base_name, extension)
+
 def open_file_externally(filepath):
     """Membuka file dengan aplikasi default sistem operasi."""
+    if HEADLESS:
+        print(f"[OK] {filepath}")
+        return
     try:
         if sys.platform.startswith('win'):
             os.startfile(filepath)
@@ -0,0 +1,45 @@
+# utils/geo.py
+
+import numpy as np
+import pandas as pd
+
+# =============================================================================
+# KOORDINAT DAN JARAK (VEKTOR)
+# =============================================================================
+
+# Radius Bumi dalam meter (sama dengan perhitungan per baris sebelumnya)
+EARTH_RADIUS_M = 6371000
+
+
+def parse_latlon(values):
+    """
+    Mengurai kumpulan string "lat,lon" sekaligus menjadi dua array float.
+    Nilai kosong, '-', jumlah bagian selain dua, atau angka yang tidak valid
+    menjadi NaN.
+    """
+    text = pd.Series(values, dtype='string')
+    # extract selalu menghasilkan dua kolom string (NaN bila tidak cocok),
+    # juga ketika tidak ada satu nilai pun yang memuat koma
+    parts = text.str.extract(r'^\s*([^,]*?)\s*,\s*([^,]*?)\s*$')
+
+    def to_float(series):
+        numbers = pd.to_numeric(series.astype(object), errors='coerce')
+        return np.asarray(numbers, dtype=float)
+
+    return to_float(parts[0]), to_float(parts[1])
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Jarak great-circle (meter) antar array koordinat derajat; NaN bila salah satu NaN."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat / 2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2)**2
+    return EARTH_RADIUS_M * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def latlon_distance(coords1, coords2):
+    """Jarak (meter, float) antara dua kolom string "lat,lon" baris per baris; NaN bila tidak valid."""
+    lat1, lon1 = parse_latlon(coords1)
+    lat2, lon2 = parse_latlon(coords2)
+    return haversine(lat1, lon1, lat2, lon2)
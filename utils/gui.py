@@ -6,8 +6,15 @@ import threading
 import tkinter as tk
 import time
 from utils.function import show_error_message, show_info_message
+from utils.messages import ERROR_MESSAGES
+from utils.api_client import reset_retry_budget
+from utils import perf
 
-def create_date_picker_window(title, process_callback):
+# Jeda sebelum jendela laporan ditutup otomatis, agar ringkasan waktu per
+# tahap (lihat utils.perf) sempat terbaca
+CLOSE_DELAY_MS = 3000
+
+def create_date_picker_window(title, process_callback, range_mode=False):
     """
     Membuat dan menampilkan jendela GUI pemilih tanggal yang dapat digunakan kembali,
     termasuk label status, progress bar, dan timer.
@@ -15,6 +22,8 @@ def create_date_picker_window(title, process_callback):
     Args:
         title (str): Judul untuk jendela GUI.
         process_callback (function): Fungsi yang akan dipanggil dengan tanggal yang dipilih.
+        range_mode (bool): Tampilkan tanggal awal dan akhir; tanggal akhir dikirim
+            sebagai "dmy_akhir"/"ymd_akhir" (lihat utils.date_range).
     """
     
     class DatePickerApp(tk.Tk):
@@ -24,7 +33,7 @@ def create_date_picker_window(title, process_callback):
             
             # Pengaturan Geometri Window
             window_width = 350
-            window_height = 250
+            window_height = 330 if range_mode else 280
             screen_width = self.winfo_screenwidth()
             screen_height = self.winfo_screenheight()
             center_x = int(screen_width/2 - window_width / 2)
@@ -42,7 +51,7 @@ def create_date_picker_window(title, process_callback):
             main_frame = tk.Frame(self, bg='SystemButtonFace')
             main_frame.pack(expand=True, pady=20)
 
-            label = ttk.Label(main_frame, text="Pilih Tanggal Pengiriman")
+            label = ttk.Label(main_frame, text="Pilih Rentang Tanggal" if range_mode else "Pilih Tanggal Pengiriman")
             label.pack(pady=(0, 10))
 
             # Widget DateEntry
@@ -52,6 +61,22 @@ def create_date_picker_window(title, process_callback):
             self.cal.pack(pady=10, ipady=5)
             self.cal.bind("<Button-1>", self._on_date_click)
 
+            # Tanggal akhir (mode rentang); sama dengan tanggal awal = laporan harian
+            self.cal_akhir = None
+            if range_mode:
+                ttk.Label(main_frame, text="sampai", font=("Helvetica", 10)).pack()
+                self.cal_akhir = DateEntry(main_frame, date_pattern='dd-MM-yyyy', font=("Helvetica", 16),
+                                           width=12, justify='center', borderwidth=2, relief="solid",
+                                           style='TEntry')
+                self.cal_akhir.pack(pady=(0, 10), ipady=5)
+                self.cal_akhir.bind("<Button-1>", lambda event: self.cal_akhir.drop_down())
+
+            # Opsi abaikan cache response API (data diambil ulang dari server)
+            self.force_refresh_var = tk.BooleanVar(value=False)
+            self.force_refresh_check = ttk.Checkbutton(main_frame, text="Ambil ulang data dari server",
+                                                       variable=self.force_refresh_var)
+            self.force_refresh_check.pack()
+
             # Tombol Proses
             self.run_button = ttk.Button(main_frame, text="Proses", command=self.run_process_thread, style="TButton")
             self.run_button.pack(pady=10)
@@ -61,7 +86,7 @@ def create_date_picker_window(title, process_callback):
             self.status_label.pack(pady=(5, 0))
 
             # Widget Timer baru
-            self.timer_label = ttk.Label(main_frame, text="", font=("Arial", 9), foreground="gray")
+            self.timer_label = ttk.Label(main_frame, text="", font=("Arial", 9), foreground="gray", wraplength=320)
             self.timer_label.pack()
 
             # Progress Bar (disembunyikan secara default)
@@ -73,6 +98,10 @@ def create_date_picker_window(title, process_callback):
 
         def run_process_thread(self):
             """Menjalankan proses di thread terpisah agar GUI tidak freeze."""
+            if self.cal_akhir is not None and self.cal_akhir.get_date() < self.cal.get_date():
+                show_error_message("Rentang Tanggal Salah", ERROR_MESSAGES["DATE_RANGE_INVALID"])
+                return
+
             # Sembunyikan tombol dan tampilkan progress bar
             self.run_button.pack_forget()
             self.progress.pack(pady=(10, 5))
@@ -81,25 +110,44 @@ def create_date_picker_window(title, process_callback):
             selected_date_obj = self.cal.get_date()
             date_formats = {
                 "dmy": selected_date_obj.strftime('%d-%m-%Y'),
-                "ymd": selected_date_obj.strftime('%Y-%m-%d')
+                "ymd": selected_date_obj.strftime('%Y-%m-%d'),
+                "force_refresh": self.force_refresh_var.get()
             }
+            if self.cal_akhir is not None:
+                end_date_obj = self.cal_akhir.get_date()
+                date_formats["dmy_akhir"] = end_date_obj.strftime('%d-%m-%Y')
+                date_formats["ymd_akhir"] = end_date_obj.strftime('%Y-%m-%d')
+                self.cal_akhir.config(state='disabled')
             
             # Nonaktifkan kalender
             self.cal.config(state='disabled')
+            self.force_refresh_check.config(state='disabled')
             
             # Mulai timer
             self.start_time = time.time()
             self.timer_running = True
             self.update_timer()
 
+            # Jatah retry API dihitung per laporan
+            reset_retry_budget()
+
             # Buat thread untuk menjalankan fungsi callback
+            self.perf_summary = ""
             self.process_thread = threading.Thread(
-                target=process_callback,
-                args=(date_formats, self)
+                target=self._run_with_perf,
+                args=(date_formats,)
             )
             self.process_thread.start()
             self.after(100, self.check_thread)
 
+        def _run_with_perf(self, date_formats):
+            """Menjalankan callback di thread pemroses sambil mencatat waktu per tahap."""
+            run = perf.start_run(title)
+            try:
+                process_callback(date_formats, self)
+            finally:
+                self.perf_summary = perf.finish_run(run)
+
         def check_thread(self):
             """Memeriksa apakah thread sudah selesai."""
             if self.process_thread.is_alive():
@@ -109,8 +157,12 @@ def create_date_picker_window(title, process_callback):
                 self.progress.stop()
                 self.progress.pack_forget()
                 self.status_label.config(text="")
-                self.timer_label.config(text="")
+                # Rincian waktu per tahap tetap tampil sampai proses berikutnya
+                self.timer_label.config(text=self.perf_summary)
                 self.cal.config(state='normal')
+                if self.cal_akhir is not None:
+                    self.cal_akhir.config(state='normal')
+                self.force_refresh_check.config(state='normal')
                 self.run_button.pack(pady=10)
 
         def update_status(self, message):
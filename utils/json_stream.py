@@ -0,0 +1,130 @@
+# utils/json_stream.py
+
+import codecs
+import json
+import re
+
+# =============================================================================
+# DECODE JSON BERTAHAP (STREAMING)
+# =============================================================================
+
+_WS = re.compile(r'[ \t\n\r]*')
+_decoder = json.JSONDecoder()
+
+# Buffer dipangkas setelah bagian yang sudah dibaca melebihi ukuran ini
+_COMPACT_AT = 1 << 16
+
+
+class _Reader:
+    """Buffer teks di atas iterator chunk (bytes/str) yang diisi sesuai kebutuhan."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Menambah satu chunk ke buffer. False jika stream sudah habis."""
+        if self.eof:
+            return False
+        if self.pos > _COMPACT_AT:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        for chunk in self._chunks:
+            if isinstance(chunk, bytes):
+                chunk = self._utf8.decode(chunk)
+            if chunk:
+                self.buf += chunk
+                return True
+        self.buf += self._utf8.decode(b"", final=True)
+        self.eof = True
+        return False
+
+    def peek(self):
+        """Karakter non-spasi berikutnya (tanpa mengonsumsi), "" jika habis."""
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars):
+        ch = self.peek()
+        if not ch or ch not in chars:
+            raise ValueError(f"JSON tidak valid: diharapkan {chars!r}, ditemukan {ch!r} di posisi {self.pos}")
+        self.pos += 1
+        return ch
+
+    def value(self):
+        """Men-decode satu nilai JSON utuh mulai dari posisi saat ini."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # Angka/literal di ujung buffer bisa saja belum lengkap
+            if end == len(self.buf) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(chunks, path, meta=None):
+    """
+    Menghasilkan elemen array JSON satu per satu tanpa memuat seluruh dokumen.
+
+    Args:
+        chunks (iterable): Potongan body response (bytes atau str), mis.
+            response.iter_content(chunk_size=...).
+        path (tuple): Urutan key menuju array, mis. ("tasks", "data").
+        meta (dict, optional): Diisi key lain yang setingkat dengan array
+            (mis. "last_page", "total") begitu terbaca.
+
+    Jika key pada path tidak ada, generator selesai tanpa menghasilkan apa pun.
+    """
+    reader = _Reader(chunks)
+    yield from _walk_object(reader, tuple(path), meta)
+
+
+def _walk_object(reader, path, meta):
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == path[0]:
+            if len(path) == 1:
+                if reader.peek() == "[":
+                    yield from _walk_array(reader)
+                else:
+                    # Null / bukan array: tidak ada item
+                    reader.value()
+            elif reader.peek() == "{":
+                yield from _walk_object(reader, path[1:], meta)
+            else:
+                reader.value()
+        else:
+            value = reader.value()
+            if meta is not None and len(path) == 1:
+                meta[key] = value
+        if reader.expect(",}") == "}":
+            return
+
+
+def _walk_array(reader):
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield reader.value()
+        if reader.expect(",]") == "]":
+            return
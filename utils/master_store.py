@@ -0,0 +1,272 @@
+# utils/master_store.py
+
+from contextlib import closing, contextmanager
+import json
+import os
+import sqlite3
+import threading
+
+# =============================================================================
+# MASTER DATA LOKAL (SQLITE)
+# =============================================================================
+
+# Pengganti master.json + type_map.json: driver (beserta plat dan tipe
+# kendaraannya), hub, substitusi tipe dan metadata sync disimpan di satu file
+# SQLite di folder aplikasi. Filter cabang memakai index kolom lokasi; lookup
+# per email/plat untuk laporan tetap dibangun sekali di memori dari
+# read_master() (lihat get_master_lookups di utils.function), karena laporan
+# memetakan seluruh kolom sekaligus, bukan satu baris per query.
+# Modul ini tidak memuat konfigurasi sendiri; path database diberikan oleh
+# pemanggil (lihat MASTER_DB_PATH di utils.function).
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS drivers (
+    email   TEXT PRIMARY KEY,
+    driver  TEXT NOT NULL DEFAULT '',
+    plat    TEXT NOT NULL DEFAULT '',
+    type    TEXT NOT NULL DEFAULT '',
+    lokasi  TEXT,
+    extra   TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_drivers_lokasi ON drivers(lokasi);
+
+CREATE TABLE IF NOT EXISTS hubs (
+    code    TEXT PRIMARY KEY,
+    hub_id  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_hubs_hub_id ON hubs(hub_id);
+
+CREATE TABLE IF NOT EXISTS type_map (
+    original    TEXT PRIMARY KEY,
+    substitute  TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key     TEXT PRIMARY KEY,
+    value   TEXT
+);
+"""
+
+# Kolom driver yang punya kolom sendiri; field lain dari master.json lama
+# disimpan sebagai JSON di kolom extra agar tidak hilang saat migrasi
+DRIVER_COLUMNS = {"Email": "email", "Driver": "driver", "Plat": "plat", "Type": "type"}
+
+_migrate_lock = threading.Lock()
+
+
+def connect(db_path):
+    """Koneksi baru ke database (skema dibuat bila belum ada). Satu koneksi per pemanggilan/thread."""
+    conn = sqlite3.connect(db_path, timeout=10)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+@contextmanager
+def transaction(db_path):
+    """Satu transaksi: commit bila blok selesai, rollback bila terjadi error."""
+    with closing(connect(db_path)) as conn:
+        with conn:
+            yield conn
+
+
+def _normalize_email(email):
+    return str(email or '').strip().lower()
+
+
+def lokasi_dari_email(email, hub_codes):
+    """Kode hub yang muncul di email driver (kode terpanjang menang), None bila tidak ada."""
+    for code in sorted(hub_codes, key=len, reverse=True):
+        if code and code.lower() in email:
+            return code
+    return None
+
+
+def _hub_codes(conn):
+    return [row["code"] for row in conn.execute("SELECT code FROM hubs")]
+
+
+# =============================================================================
+# MIGRASI SEKALI DARI FILE JSON
+# =============================================================================
+def migrate_from_json(db_path, master_json_path, type_map_path):
+    """
+    Mengisi database dari master.json dan type_map.json bila database belum
+    ada. File JSON tidak dihapus (tetap bisa dipakai versi lama aplikasi).
+    Mengembalikan True bila migrasi dijalankan.
+    """
+    with _migrate_lock:
+        if os.path.exists(db_path):
+            return False
+        master = _read_json(master_json_path)
+        type_map = _read_json(type_map_path)
+        if master is None and type_map is None:
+            return False
+
+        tmp_path = f"{db_path}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        with transaction(tmp_path) as conn:
+            if master:
+                _upsert_hubs(conn, master.get("hub_ids") or {})
+                _upsert_drivers(conn, master.get("driver") or [])
+                if master.get("sync_meta") is not None:
+                    _set_meta(conn, "sync_meta", master["sync_meta"])
+            if type_map:
+                _replace_type_map(conn, type_map.get("type") or {})
+            _set_meta(conn, "migrated_from_json", True)
+        # Database baru dipakai setelah migrasi lengkap
+        os.replace(tmp_path, db_path)
+        return True
+
+
+def _read_json(path):
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return None
+
+
+# =============================================================================
+# BACA
+# =============================================================================
+def _driver_record(row):
+    record = {"Email": row["email"], "Driver": row["driver"], "Plat": row["plat"], "Type": row["type"]}
+    if row["extra"]:
+        record.update(json.loads(row["extra"]))
+    return record
+
+
+def read_master(db_path):
+    """
+    Isi master dalam bentuk yang sama dengan master.json lama:
+    {"driver": [...], "hub_ids": {...}, "sync_meta": ...}; None bila database belum ada.
+    """
+    if not os.path.exists(db_path):
+        return None
+    with closing(connect(db_path)) as conn:
+        drivers = [_driver_record(row) for row in conn.execute("SELECT * FROM drivers ORDER BY email")]
+        hub_ids = {row["code"]: row["hub_id"] for row in conn.execute("SELECT code, hub_id FROM hubs ORDER BY code")}
+        sync_meta = _get_meta(conn, "sync_meta")
+    return {"driver": drivers, "hub_ids": hub_ids, "sync_meta": sync_meta}
+
+
+def read_master_hubs(db_path):
+    """{"hub_ids": {kode: id hub}} saja, tanpa membaca tabel driver."""
+    with closing(connect(db_path)) as conn:
+        return {"hub_ids": {row["code"]: row["hub_id"] for row in conn.execute("SELECT code, hub_id FROM hubs ORDER BY code")}}
+
+
+def drivers_for_lokasi(db_path, lokasi_code):
+    """
+    Driver milik satu cabang (query ber-index pada kolom lokasi). Seperti
+    pencocokan email lama, cabang yang kodenya memuat kode ini ikut terpilih.
+    """
+    with closing(connect(db_path)) as conn:
+        codes = [code for code in _hub_codes(conn) if lokasi_code.lower() in code.lower()] or [lokasi_code]
+        placeholders = ", ".join("?" * len(codes))
+        rows = conn.execute(f"SELECT * FROM drivers WHERE lokasi IN ({placeholders}) ORDER BY email", codes).fetchall()
+    return [_driver_record(row) for row in rows]
+
+
+def load_type_map(db_path):
+    """Substitusi tipe kendaraan {tipe asli: tipe pengganti}."""
+    if not os.path.exists(db_path):
+        return {}
+    with closing(connect(db_path)) as conn:
+        return {row["original"]: row["substitute"] for row in conn.execute("SELECT * FROM type_map ORDER BY original")}
+
+
+# =============================================================================
+# TULIS (HANYA BARIS YANG BERUBAH)
+# =============================================================================
+def _upsert_drivers(conn, records):
+    """Insert/update driver; baris yang isinya sama tidak disentuh. Mengembalikan jumlah baris berubah."""
+    hub_codes = _hub_codes(conn)
+    changed = 0
+    for record in records:
+        email = _normalize_email(record.get("Email"))
+        if not email:
+            continue
+        # Kolom kosong (None/NaN dari DataFrame) tidak ikut disimpan
+        extra = {k: v for k, v in record.items() if k not in DRIVER_COLUMNS and v is not None and v == v}
+        values = (
+            email, str(record.get("Driver") or ''), str(record.get("Plat") or ''), str(record.get("Type") or ''),
+            lokasi_dari_email(email, hub_codes), json.dumps(extra, ensure_ascii=False) if extra else None,
+        )
+        cursor = conn.execute(
+            """
+            INSERT INTO drivers (email, driver, plat, type, lokasi, extra) VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(email) DO UPDATE SET
+                driver = excluded.driver, plat = excluded.plat, type = excluded.type,
+                lokasi = excluded.lokasi, extra = excluded.extra
+            WHERE drivers.driver IS NOT excluded.driver OR drivers.plat IS NOT excluded.plat
+               OR drivers.type IS NOT excluded.type OR drivers.lokasi IS NOT excluded.lokasi
+               OR drivers.extra IS NOT excluded.extra
+            """,
+            values,
+        )
+        changed += cursor.rowcount
+    return changed
+
+
+def _upsert_hubs(conn, hub_ids):
+    changed = 0
+    for code, hub_id in hub_ids.items():
+        cursor = conn.execute(
+            """
+            INSERT INTO hubs (code, hub_id) VALUES (?, ?)
+            ON CONFLICT(code) DO UPDATE SET hub_id = excluded.hub_id WHERE hubs.hub_id IS NOT excluded.hub_id
+            """,
+            (code, hub_id),
+        )
+        changed += cursor.rowcount
+    if changed:
+        # Kode hub baru bisa mengubah cabang driver yang sudah tersimpan
+        hub_codes = _hub_codes(conn)
+        for row in conn.execute("SELECT email, lokasi FROM drivers").fetchall():
+            lokasi = lokasi_dari_email(_normalize_email(row["email"]), hub_codes)
+            if lokasi != row["lokasi"]:
+                conn.execute("UPDATE drivers SET lokasi = ? WHERE email = ?", (lokasi, row["email"]))
+    return changed
+
+
+def _replace_type_map(conn, type_map):
+    existing = {row["original"]: row["substitute"] for row in conn.execute("SELECT * FROM type_map")}
+    for original in set(existing) - set(type_map):
+        conn.execute("DELETE FROM type_map WHERE original = ?", (original,))
+    for original, substitute in type_map.items():
+        if existing.get(original) != substitute:
+            conn.execute("INSERT OR REPLACE INTO type_map (original, substitute) VALUES (?, ?)", (original, substitute))
+
+
+def _get_meta(conn, key):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return json.loads(row["value"]) if row and row["value"] is not None else None
+
+
+def _set_meta(conn, key, value):
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value, ensure_ascii=False)))
+
+
+def save_sync(db_path, drivers=(), hub_ids=None, sync_meta=None):
+    """
+    Menyimpan hasil sync dalam satu transaksi: hub dulu (menentukan cabang),
+    lalu driver yang berubah, lalu metadata sync.
+    Mengembalikan jumlah baris driver/hub yang berubah.
+    """
+    with transaction(db_path) as conn:
+        changed = _upsert_hubs(conn, hub_ids or {})
+        changed += _upsert_drivers(conn, drivers)
+        if sync_meta is not None:
+            _set_meta(conn, "sync_meta", sync_meta)
+    return changed
+
+
+def save_type_map(db_path, type_map):
+    """Mengganti isi substitusi tipe (hanya baris yang berubah yang ditulis)."""
+    with transaction(db_path) as conn:
+        _replace_type_map(conn, type_map)
@@ -1,10 +1,14 @@
 ERROR_MESSAGES = {
     "API_REQUEST_FAILED": "Gagal menghubungi API: {error_detail}\n\nSilakan hubungi admin!",
     "API_TOKEN_MISSING": "Token API tidak ditemukan.\n\nSilakan hubungi admin!",
+    "ARCHIVE_MISSING": "Data {error_detail} belum ada di arsip lokal.\n\nJalankan laporan tanpa --offline sekali agar data diarsipkan.",
     "CONFIG_FILE_ERROR": "File konfigurasi (config) gagal dimuat.\n\nSilakan hubungi admin!",    
     "CONNECTION_ERROR": "Gagal terhubung ke API: \n{error_detail}\n\nSilakan hubungi admin!",
     "CONSTANT_FILE_ERROR": "File konfigurasi (constant) gagal dimuat.\n\nSilakan hubungi admin!",
     "DATA_NOT_FOUND": "Data tidak ditemukan! \n\nPeriksa kembali data Anda!",
+    "DATE_RANGE_FAILED": "Sebagian hari gagal diproses dan tidak masuk rekap:\n\n{details}",
+    "DATE_RANGE_INVALID": "Tanggal akhir tidak boleh sebelum tanggal awal!",
+    "DATE_RANGE_TOO_LONG": "Rentang tanggal maksimal {max_days} hari.",
     "FAILED_OPENING_FILE": "Gagal membuka file: {error_detail}",
     "HTTP_ERROR_GENERIC": "Gagal mengambil data dari API (HTTP Status: {status_code}).\nPastikan Token atau Hub ID sudah benar.\n\nSilakan hubungi admin!",
     "HUB_ID_MISSING": "Hub ID tidak ditemukan.\n\nSilakan hubungi admin!",
@@ -12,6 +16,9 @@ ERROR_MESSAGES = {
     "LOCATION_CODE_MISSING": "Kode lokasi tidak ditemukan atau tidak sesuai. Silakan atur lokasi terlebih dahulu!",
     "MASTER_DATA_MISSING": "File atau data dari master data tidak ditemukan.\n\nSilakan hubungi admin!",
     "MASTER_FILE_ERROR": "File master gagal dimuat.\n\nSilakan hubungi admin!",
+    "MULTI_HUB_FAILED": "Sebagian hub gagal diproses:\n\n{details}",
+    "NO_USER_HUBS": "Tidak ada hub yang terdaftar untuk user ini.\n\nSilakan hubungi admin!",
+    "RATE_LIMITED": "Server API membatasi jumlah permintaan (HTTP 429) dan percobaan ulang sudah habis. Coba lagi beberapa saat lagi!",
     "SECRET_FILE_ERROR": "File token (secret) gagal dimuat.\n\nSilakan hubungi admin!",
     "SERVER_ERROR": "Terjadi masalah pada server API (Status Code: {error_detail}). Coba lagi nanti!",
     "SETUP_CANCELED": "Setup akun tidak lengkap. Proses dibatalkan!",
@@ -32,6 +39,7 @@ INFO_MESSAGES = {
 
 ASK_MESSAGES = {
     "ASK_ANOTHER_FILE": "Apakah ada file lain yang ingin diproses?",
+    "ASK_COMBINE_HUBS": "Gabungkan semua hub dalam satu file?\n\nPilih \"No\" untuk membuat satu file per hub.",
     "CONFIRM_CANCEL_SETUP": "Apakah Anda yakin untuk membatalkan setup akun?",
     "CONFIRM_SAVE_USER": "Pengguna yang dipilih tidak dapat diganti lagi. Apakah Anda yakin untuk menyimpan `{name}`?",
 }
\ No newline at end of file
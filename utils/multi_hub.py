@@ -0,0 +1,178 @@
+# utils/multi_hub.py
+
+from concurrent.futures import ThreadPoolExecutor
+import importlib
+import re
+import traceback
+import pandas as pd
+import requests
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+from utils.function import (
+    collect_errors,
+    config_override,
+    get_save_folder,
+    get_user_hub_codes,
+    load_constants,
+    open_file_externally,
+    show_error_message,
+    show_info_message,
+    unique_save_path,
+)
+from utils.messages import ERROR_MESSAGES, INFO_MESSAGES
+from utils.api_handler import handle_requests_error
+from utils import perf
+
+# =============================================================================
+# LAPORAN SEMUA HUB (PARALEL PER HUB)
+# =============================================================================
+
+# Laporan yang mendukung mode semua hub. Modul laporan wajib menyediakan
+# kumpulkan_data(dates, app_instance), tulis_laporan(data, path) dan SHEET_UTAMA.
+LAPORAN = {
+    "routing-summary": {"module": "modules.Auto_Routing_Summary.report", "judul": "Routing Summary"},
+    "delivery-summary": {"module": "modules.Auto_Delivery_Summary.report", "judul": "Delivery Summary"},
+    "start-finish-time": {"module": "modules.Start_Finish_Time.report", "judul": "Time Summary"},
+}
+
+# Jumlah hub yang diambil bersamaan; laju request tetap dibatasi oleh
+# rate limiter bersama di utils.api_client
+MAX_HUB_WORKERS = 4
+
+SHEET_KONSOLIDASI = 'Konsolidasi'
+KOLOM_CABANG = 'Cabang'
+
+
+def _kumpulkan_satu_hub(module, dates, lokasi_code):
+    """Menjalankan kumpulkan_data untuk satu hub; mengembalikan (data, daftar error)."""
+    with config_override(lokasi=lokasi_code), collect_errors() as errors:
+        try:
+            data = module.kumpulkan_data(dates, None)
+        except requests.exceptions.RequestException as e:
+            handle_requests_error(e)
+            data = None
+        except Exception as e:
+            show_error_message("Error Tak Terduga", ERROR_MESSAGES["UNKNOWN_ERROR"].format(
+                error_detail=f"{e}\n\n{traceback.format_exc()}"
+            ))
+            data = None
+    return (data or None), errors
+
+
+def kumpulkan_semua_hub(module, dates, hub_codes, max_workers=MAX_HUB_WORKERS):
+    """
+    Mengambil data laporan untuk setiap hub secara paralel.
+    Mengembalikan (hasil, gagal): hasil = {kode: data} sesuai urutan hub_codes,
+    gagal = {kode: [pesan error]} untuk hub yang tidak menghasilkan data.
+    """
+    workers = max(1, min(max_workers, len(hub_codes)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        outcomes = list(executor.map(lambda code: _kumpulkan_satu_hub(module, dates, code), hub_codes))
+
+    hasil, gagal = {}, {}
+    for code, (data, errors) in zip(hub_codes, outcomes):
+        if data:
+            hasil[code] = data
+        else:
+            gagal[code] = errors or [ERROR_MESSAGES["DATA_NOT_FOUND"]]
+    return hasil, gagal
+
+
+def _nama_sheet(nama, terpakai):
+    """Nama sheet Excel yang valid (maks. 31 karakter, tanpa []:*?/\\) dan unik."""
+    dasar = re.sub(r'[\[\]:*?/\\]', ' ', str(nama)).strip()[:31] or "Hub"
+    kandidat, counter = dasar, 1
+    while kandidat.lower() in terpakai:
+        akhiran = f" ({counter})"
+        kandidat = dasar[:31 - len(akhiran)] + akhiran
+        counter += 1
+    terpakai.add(kandidat.lower())
+    return kandidat
+
+
+def _rapikan_sheet(worksheet):
+    """Header tebal, baris header dibekukan, dan lebar kolom mengikuti isi."""
+    for cell in worksheet[1]:
+        cell.font = Font(bold=True)
+    worksheet.freeze_panes = 'A2'
+    for col_idx, column in enumerate(worksheet.iter_cols(), start=1):
+        max_len = max((len(str(cell.value)) for cell in column if cell.value is not None), default=0)
+        worksheet.column_dimensions[get_column_letter(col_idx)].width = min(max_len + 2, 60)
+
+
+@perf.timed("write_excel")
+def tulis_gabungan(hasil, sheet_utama, save_path):
+    """
+    Satu workbook: sheet Konsolidasi (semua hub, kolom Cabang di depan)
+    lalu satu sheet per hub berisi sheet utama laporan hub tersebut.
+    """
+    frames = []
+    for data in hasil.values():
+        df = data["sheets"][sheet_utama]
+        if not df.empty:
+            frames.append(df.assign(**{KOLOM_CABANG: data["lokasi_name"]}))
+    if frames:
+        df_konsolidasi = pd.concat(frames, ignore_index=True)
+        df_konsolidasi = df_konsolidasi[[KOLOM_CABANG] + [c for c in df_konsolidasi.columns if c != KOLOM_CABANG]]
+    else:
+        df_konsolidasi = pd.DataFrame({KOLOM_CABANG: []})
+
+    terpakai = {SHEET_KONSOLIDASI.lower()}
+    with pd.ExcelWriter(save_path, engine='openpyxl') as writer:
+        df_konsolidasi.to_excel(writer, sheet_name=SHEET_KONSOLIDASI, index=False)
+        for data in hasil.values():
+            nama = _nama_sheet(data["lokasi_name"], terpakai)
+            data["sheets"][sheet_utama].to_excel(writer, sheet_name=nama, index=False)
+        with perf.span("style"):
+            for worksheet in writer.sheets.values():
+                _rapikan_sheet(worksheet)
+
+
+def buat_laporan_semua_hub(report_key, dates, gabung=True, hub_codes=None):
+    """
+    Membuat laporan report_key (lihat LAPORAN) untuk semua hub pengguna.
+    gabung=True -> satu workbook berisi sheet Konsolidasi + sheet per hub;
+    gabung=False -> satu file per hub di folder yang dipilih.
+    Mengembalikan True bila minimal satu hub berhasil disimpan.
+    """
+    spec = LAPORAN[report_key]
+    perf.phase("load_config")
+    module = importlib.import_module(spec["module"])
+    hub_codes = list(hub_codes) if hub_codes else get_user_hub_codes()
+    if not hub_codes:
+        show_error_message("Gagal", ERROR_MESSAGES["NO_USER_HUBS"])
+        return False
+
+    # Waktu tunggu seluruh hub (API + olah data di thread hub) dicatat sebagai "fetch"
+    perf.phase("fetch")
+    hasil, gagal = kumpulkan_semua_hub(module, dates, hub_codes)
+
+    perf.phase("other")
+    if gagal:
+        constants = load_constants() or {}
+        kode_ke_nama = {code: name for name, code in constants.get('location_id', {}).items()}
+        details = "\n".join(
+            f"- {kode_ke_nama.get(code, code)}: {errors[0].splitlines()[0]}" for code, errors in gagal.items()
+        )
+        show_error_message("Sebagian Hub Gagal", ERROR_MESSAGES["MULTI_HUB_FAILED"].format(details=details))
+    if not hasil:
+        return False
+
+    folder = get_save_folder()
+    if not folder:
+        show_info_message("Dibatalkan", INFO_MESSAGES["CANCELED_BY_USER"])
+        return False
+
+    tanggal = dates["dmy"].replace('-', '.')
+    if gabung:
+        save_path = unique_save_path(folder, f"{spec['judul']} - {tanggal} - Semua Hub")
+        tulis_gabungan(hasil, module.SHEET_UTAMA, save_path)
+        perf.phase("open")
+        open_file_externally(save_path)
+    else:
+        perf.phase("write_excel")
+        for data in hasil.values():
+            module.tulis_laporan(data, unique_save_path(folder, data["file_basename"]))
+        perf.phase("open")
+        open_file_externally(folder)
+    return True
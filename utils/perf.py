@@ -0,0 +1,230 @@
+# utils/perf.py
+
+from contextlib import contextmanager
+from datetime import datetime
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+from utils.function import BASE_DIR
+
+# =============================================================================
+# PENCATATAN WAKTU PER TAHAP LAPORAN
+# =============================================================================
+
+# Log performa lokal, dirotasi agar tidak membesar tanpa batas
+PERF_LOG_PATH = os.path.join(BASE_DIR, 'perf.log')
+PERF_LOG_MAX_BYTES = 512 * 1024
+PERF_LOG_BACKUPS = 3
+
+# Tahap standar beserta label yang ditampilkan ke pengguna (sesuai urutan)
+STAGE_LABELS = {
+    "load_config": "Config",
+    "fetch": "API",
+    "decode": "Decode",
+    "transform": "Olah data",
+    "write_excel": "Tulis Excel",
+    "style": "Format",
+    "open": "Buka file",
+    "other": "Lain-lain",
+}
+
+# Satu run aktif per thread pemroses laporan. Span dari thread lain (mis.
+# thread pool pengambil halaman) diabaikan karena waktunya sudah tercakup
+# oleh span di thread pemilik yang sedang menunggu.
+_runs = {}
+_runs_lock = threading.Lock()
+_logger = None
+
+
+class PerfRun:
+    """
+    Waktu satu kali proses laporan. Waktu yang dicatat per tahap adalah
+    waktu "milik sendiri": span bersarang dikurangkan dari span induknya, dan
+    waktu di luar span mana pun masuk ke fase yang sedang aktif (lihat phase).
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.stages = {}
+        self.stack = []
+        self.started_wall = time.perf_counter()
+        self.started_cpu = time.thread_time()
+        self.total_wall = None
+        self.total_cpu = None
+        self._phase = "other"
+        self._phase_mark = (self.started_wall, self.started_cpu)
+
+    def _add(self, stage, wall, cpu, calls=0):
+        stat = self.stages.setdefault(stage, {"wall": 0.0, "cpu": 0.0, "calls": 0})
+        stat["wall"] += wall
+        stat["cpu"] += cpu
+        stat["calls"] += calls
+
+    def _flush_phase(self, now_wall, now_cpu):
+        mark_wall, mark_cpu = self._phase_mark
+        if now_wall > mark_wall:
+            self._add(self._phase, now_wall - mark_wall, now_cpu - mark_cpu)
+        self._phase_mark = (now_wall, now_cpu)
+
+    def summary(self):
+        """Teks ringkas, mis. "Total 12.3 dtk | API 8.1 | Olah data 2.0 | ..."."""
+        parts = [f"Total {self.total_wall or 0:.1f} dtk"]
+        ordered = [s for s in STAGE_LABELS if s in self.stages]
+        ordered += sorted(s for s in self.stages if s not in STAGE_LABELS)
+        for stage in ordered:
+            wall = self.stages[stage]["wall"]
+            if wall >= 0.05:
+                parts.append(f"{STAGE_LABELS.get(stage, stage)} {wall:.1f}")
+        return " | ".join(parts)
+
+    def to_dict(self):
+        return {
+            "time": datetime.now().isoformat(timespec='seconds'),
+            "report": self.name,
+            "total_wall": round(self.total_wall or 0, 4),
+            "total_cpu": round(self.total_cpu or 0, 4),
+            "stages": {
+                stage: {k: round(v, 4) if isinstance(v, float) else v for k, v in stat.items()}
+                for stage, stat in self.stages.items()
+            },
+        }
+
+
+def _current():
+    return _runs.get(threading.get_ident())
+
+
+def start_run(name):
+    """Memulai pencatatan untuk thread saat ini (thread yang menjalankan laporan)."""
+    run = PerfRun(name)
+    with _runs_lock:
+        _runs[threading.get_ident()] = run
+    return run
+
+
+def finish_run(run, log=True):
+    """Menutup run, menulis satu baris ke perf log, dan mengembalikan ringkasannya."""
+    now_wall, now_cpu = time.perf_counter(), time.thread_time()
+    run._flush_phase(now_wall, now_cpu)
+    run.total_wall = now_wall - run.started_wall
+    run.total_cpu = now_cpu - run.started_cpu
+    with _runs_lock:
+        if _runs.get(threading.get_ident()) is run:
+            del _runs[threading.get_ident()]
+    if log:
+        _write_log(run)
+    return run.summary()
+
+
+def phase(stage):
+    """
+    Menandai tahap yang sedang berjalan di thread ini. Waktu di luar span
+    dihitung ke tahap ini sampai phase() dipanggil lagi; cocok untuk blok
+    kode panjang yang tidak praktis dibungkus `with span(...)`.
+    """
+    run = _current()
+    if run is None:
+        return
+    if not run.stack:
+        run._flush_phase(time.perf_counter(), time.thread_time())
+    run._phase = stage
+
+
+@contextmanager
+def span(stage):
+    """Mengukur blok kode sebagai tahap `stage`; tidak melakukan apa pun tanpa run aktif."""
+    run = _current()
+    if run is None:
+        yield
+        return
+    start_wall, start_cpu = time.perf_counter(), time.thread_time()
+    if not run.stack:
+        run._flush_phase(start_wall, start_cpu)
+    # [durasi span anak (wall), durasi span anak (cpu)]
+    frame = [0.0, 0.0]
+    run.stack.append(frame)
+    try:
+        yield
+    finally:
+        end_wall, end_cpu = time.perf_counter(), time.thread_time()
+        run.stack.pop()
+        wall, cpu = end_wall - start_wall, end_cpu - start_cpu
+        run._add(stage, wall - frame[0], cpu - frame[1], calls=1)
+        if run.stack:
+            run.stack[-1][0] += wall
+            run.stack[-1][1] += cpu
+        else:
+            run._phase_mark = (end_wall, end_cpu)
+
+
+def timed(stage):
+    """Decorator: setiap pemanggilan fungsi diukur sebagai tahap `stage`."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def recorded(name):
+    """
+    Decorator untuk laporan tanpa jendela progres: satu pemanggilan fungsi
+    dicatat sebagai satu run (hanya ke perf log).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            run = start_run(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                finish_run(run)
+        return wrapper
+    return decorator
+
+
+def timed_iter(stage, iterable):
+    """Membungkus iterator; waktu mengambil setiap item diukur sebagai `stage`."""
+    iterator = iter(iterable)
+    while True:
+        with span(stage):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+# =============================================================================
+# PERF LOG
+# =============================================================================
+def _get_logger():
+    global _logger
+    if _logger is None:
+        logger = logging.getLogger("mileapp.perf")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        try:
+            handler = logging.handlers.RotatingFileHandler(
+                PERF_LOG_PATH, maxBytes=PERF_LOG_MAX_BYTES, backupCount=PERF_LOG_BACKUPS, encoding='utf-8'
+            )
+        except OSError:
+            handler = logging.NullHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        _logger = logger
+    return _logger
+
+
+def _write_log(run):
+    # Log hanya alat bantu diagnosis: gagal menulis tidak boleh menggagalkan laporan
+    try:
+        _get_logger().info(json.dumps(run.to_dict(), ensure_ascii=False))
+    except Exception:
+        pass
@@ -0,0 +1,89 @@
+# utils/plate_matcher.py
+
+# =============================================================================
+# PENCOCOKAN PLAT NOMOR DI NAMA KENDARAAN (AHO-CORASICK)
+# =============================================================================
+
+# Nama kendaraan di file/API sering berisi plat plus teks lain
+# ("B 1234 XYZ - CDD DRY"). Semua plat dimasukkan sekali ke satu automaton,
+# sehingga satu nama cukup dipindai sekali (sebanding dengan panjang nama),
+# bukan dicek substring terhadap setiap plat di master.
+
+_NO_MATCH = float('inf')
+
+
+class PlateMatcher:
+    """
+    Mencari plat yang muncul sebagai substring nama kendaraan.
+
+    Jika beberapa plat cocok, yang menang adalah plat yang paling awal pada
+    urutan input (sama dengan loop `for plat in plat_map: if plat in name`).
+    Hasil per nama disimpan, karena nama yang sama biasanya muncul berulang.
+    """
+
+    def __init__(self, plat_map):
+        """plat_map: dict {plat: nilai} (mis. plat_to_type) atau iterable plat, dengan urutan prioritas."""
+        self._values = dict(plat_map) if isinstance(plat_map, dict) else dict.fromkeys(plat_map)
+        self._plates = list(self._values)
+        self._memo = {}
+        self._build()
+
+    def _build(self):
+        # goto[node] = {karakter: node}; best[node] = peringkat plat terbaik yang
+        # berakhir di node ini atau di sufiksnya (lewat fail link)
+        self._goto = [{}]
+        self._fail = [0]
+        self._best = [_NO_MATCH]
+        for rank, plate in enumerate(self._plates):
+            node = 0
+            for ch in plate:
+                next_node = self._goto[node].get(ch)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][ch] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(_NO_MATCH)
+                node = next_node
+            self._best[node] = min(self._best[node], rank)
+
+        # Fail link dibangun per level (BFS); anak root selalu kembali ke root
+        queue = list(self._goto[0].values())
+        for child in queue:
+            self._best[child] = min(self._best[child], self._best[0])
+        for node in queue:
+            for ch, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                self._best[child] = min(self._best[child], self._best[self._fail[child]])
+                queue.append(child)
+
+    def match(self, name):
+        """Plat pertama (urutan prioritas) yang muncul di name, None bila tidak ada."""
+        name = str(name)
+        if name in self._memo:
+            return self._memo[name]
+        goto, fail, best = self._goto, self._fail, self._best
+        node = 0
+        rank = best[0]
+        for ch in name:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if best[node] < rank:
+                rank = best[node]
+                if rank == 0:
+                    break
+        plate = self._plates[rank] if rank != _NO_MATCH else None
+        self._memo[name] = plate
+        return plate
+
+    def get(self, name, default=None):
+        """Nilai (mis. tipe kendaraan) untuk plat yang cocok dengan name, default bila tidak ada."""
+        plate = self.match(name)
+        return self._values[plate] if plate is not None else default
+
+    def __len__(self):
+        return len(self._plates)
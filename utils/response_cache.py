@@ -0,0 +1,416 @@
+# utils/response_cache.py
+
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import date, datetime
+import copy
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from utils.function import BASE_DIR, get_base_url_id
+from utils.json_stream import iter_json_array
+
+# =============================================================================
+# KONFIGURASI CACHE RESPONSE API (DI DISK)
+# =============================================================================
+
+# Disimpan di samping master.db agar ikut folder aplikasi
+CACHE_DIR = os.path.join(BASE_DIR, 'cache')
+
+# Batas total ukuran cache; file yang paling lama tidak dipakai dihapus lebih dulu
+CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# Data hari ini (atau yang akan datang) masih bisa berubah, jadi cepat kedaluwarsa.
+# Data hari yang sudah lewat dianggap final dan tidak pernah kedaluwarsa.
+TODAY_TTL_SECONDS = 5 * 60
+
+# Parameter paginasi tidak memengaruhi isi data gabungan
+_IGNORED_PARAMS = ("page", "limit")
+
+# Jumlah response yang disimpan di memori selama aplikasi berjalan
+MEMORY_MAX_ENTRIES = 32
+
+_evict_lock = threading.Lock()
+
+# Cache memori (LRU) dan request yang sedang berjalan, dipakai bersama semua laporan
+_memory = OrderedDict()
+_inflight = {}  # key -> (Future, force_refresh)
+_memory_lock = threading.Lock()
+
+
+# =============================================================================
+# KUNCI DAN ATURAN TTL
+# =============================================================================
+def make_cache_key(endpoint, params):
+    """
+    Kunci cache dari server asal (base_url), endpoint + parameter query
+    (hubId, rentang tanggal, fields, dst.) yang sudah dinormalisasi.
+    """
+    normalized = {
+        str(k): str(v) for k, v in (params or {}).items()
+        if k not in _IGNORED_PARAMS and v is not None
+    }
+    raw = json.dumps([get_base_url_id(), endpoint, sorted(normalized.items())], ensure_ascii=False)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def _range_end_date(params):
+    """Tanggal akhir rentang query (dateTo / timeTo), None jika tidak ada."""
+    for key in ("dateTo", "timeTo", "dateFrom", "timeFrom"):
+        value = (params or {}).get(key)
+        if value:
+            try:
+                return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+            except ValueError:
+                continue
+    return None
+
+
+def ttl_for(params):
+    """TTL (detik) untuk sebuah query; None berarti tidak pernah kedaluwarsa."""
+    end_date = _range_end_date(params)
+    if end_date is not None and end_date < date.today():
+        return None
+    return TODAY_TTL_SECONDS
+
+
+def _path_for(key):
+    return os.path.join(CACHE_DIR, f"{key}.json.gz")
+
+
+# =============================================================================
+# CACHE MEMORI (LRU) DAN SINGLE-FLIGHT
+# =============================================================================
+def _memory_get(key):
+    """Payload dari cache memori (salinan), None jika tidak ada/kedaluwarsa."""
+    with _memory_lock:
+        entry = _memory.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at is not None and time.time() > expires_at:
+            del _memory[key]
+            return None
+        _memory.move_to_end(key)
+    # Salinan agar pemanggil bebas mengubah data tanpa merusak isi cache
+    return copy.deepcopy(payload)
+
+
+def _memory_peek(key):
+    """Payload di cache memori tanpa salinan (hanya untuk dibaca), None jika tidak ada."""
+    with _memory_lock:
+        entry = _memory.get(key)
+    return entry[1] if entry is not None else None
+
+
+def _memory_put(key, payload, expires_at):
+    with _memory_lock:
+        _memory[key] = (expires_at, payload)
+        _memory.move_to_end(key)
+        while len(_memory) > MEMORY_MAX_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def single_flight(endpoint, params, loader, force_refresh=False):
+    """
+    Menjalankan loader() sekali untuk setiap query yang sama.
+
+    Jika query yang sama sedang diambil oleh laporan lain, pemanggil kedua
+    menunggu hasil request tersebut alih-alih mengirim request duplikat.
+    Hasil yang sudah selesai disimpan di cache memori (lihat get/put).
+    force_refresh=True melewati cache memori dan hanya ikut menunggu load
+    lain yang juga force_refresh; load biasa yang sedang berjalan bisa saja
+    dilayani dari cache disk/arsip, jadi loader() dijalankan sendiri.
+
+    loader() harus mengembalikan data milik pemanggil (mis. hasil get(),
+    yang sudah berupa salinan); data itu dikembalikan apa adanya ke pemanggil
+    pertama. Setiap pemanggil lain mendapat satu salinan dari isi cache memori.
+    """
+    key = make_cache_key(endpoint, params)
+    if not force_refresh:
+        payload = _memory_get(key)
+        if payload is not None:
+            return payload
+
+    with _memory_lock:
+        inflight = _inflight.get(key)
+        is_owner = inflight is None or (force_refresh and not inflight[1])
+        if is_owner:
+            future = Future()
+            _inflight[key] = (future, force_refresh)
+        else:
+            future = inflight[0]
+
+    if not is_owner:
+        # Exception dari request asal ikut dilempar ke pemanggil ini
+        return copy.deepcopy(future.result())
+
+    try:
+        payload = loader()
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        # Pemanggil yang menunggu menyalin dari isi cache memori (tidak pernah
+        # diubah), bukan dari payload yang kini dipegang pemanggil pertama
+        shared = _memory_peek(key)
+        future.set_result(shared if shared is not None else copy.deepcopy(payload))
+        return payload
+    finally:
+        with _memory_lock:
+            # Load paksa bisa menggantikan load biasa di _inflight; hanya hapus milik sendiri
+            if _inflight.get(key, (None,))[0] is future:
+                del _inflight[key]
+
+
+# =============================================================================
+# BACA / TULIS
+# =============================================================================
+def get(endpoint, params):
+    """
+    Mengembalikan payload yang tersimpan (memori lalu disk), atau None jika
+    tidak ada/kedaluwarsa. Hasil dari disk dinaikkan ke cache memori.
+    """
+    key = make_cache_key(endpoint, params)
+    payload = _memory_get(key)
+    if payload is not None:
+        return payload
+
+    path = _path_for(key)
+    entry = _read_entry(path)
+    if entry is None:
+        return None
+
+    expires_at = entry.get("expires_at")
+    if expires_at is not None and time.time() > expires_at:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+    payload = entry.get("payload")
+    if payload is not None:
+        _memory_put(key, payload, expires_at)
+    return copy.deepcopy(payload)
+
+
+def put(endpoint, params, payload):
+    """Menyimpan payload ke memori dan disk lalu memangkas cache disk jika melebihi batas."""
+    ttl = ttl_for(params)
+    key = make_cache_key(endpoint, params)
+    expires_at = (time.time() + ttl) if ttl is not None else None
+    _memory_put(key, copy.deepcopy(payload), expires_at)
+
+    entry = {
+        "endpoint": endpoint,
+        "params": {k: v for k, v in (params or {}).items() if k not in _IGNORED_PARAMS},
+        "created_at": time.time(),
+        "expires_at": expires_at,
+        "payload": payload,
+    }
+    _write_entry(_path_for(key), entry)
+
+
+def _read_entry(path):
+    """Membaca entry cache dari disk dan menandainya sebagai baru dipakai."""
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # Sentuh mtime sebagai penanda "terakhir dipakai" untuk eviction LRU
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+    return entry
+
+
+def _write_entry(path, entry):
+    """Menulis entry cache secara atomik lalu memangkas cache disk jika perlu."""
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Cache hanya optimasi: gagal menulis tidak boleh menggagalkan laporan
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return
+    _evict()
+
+
+# =============================================================================
+# VALIDATOR HTTP (ETag / Last-Modified)
+# =============================================================================
+def _validator_path(endpoint, params):
+    # Berbeda dengan make_cache_key, page/limit ikut menentukan isi response
+    normalized = sorted((str(k), str(v)) for k, v in (params or {}).items() if v is not None)
+    raw = json.dumps([get_base_url_id(), endpoint, normalized], ensure_ascii=False)
+    key = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+    return os.path.join(CACHE_DIR, f"cond_{key}.json.gz")
+
+
+def get_validated(endpoint, params):
+    """
+    Mengembalikan response tersimpan untuk request bersyarat:
+    {"etag", "last_modified", "body"}, atau None jika belum ada.
+    """
+    return _read_entry(_validator_path(endpoint, params))
+
+
+def put_validated(endpoint, params, etag, last_modified, body):
+    """Menyimpan body response beserta validator ETag / Last-Modified-nya."""
+    _write_entry(_validator_path(endpoint, params), {
+        "endpoint": endpoint,
+        "etag": etag,
+        "last_modified": last_modified,
+        "body": body,
+    })
+
+
+def _evict():
+    """Menghapus file yang paling lama tidak dipakai sampai di bawah CACHE_MAX_BYTES."""
+    with _evict_lock:
+        try:
+            names = [n for n in os.listdir(CACHE_DIR) if n.endswith('.json.gz')]
+        except OSError:
+            return
+        entries = []
+        total = 0
+        for name in names:
+            path = os.path.join(CACHE_DIR, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= CACHE_MAX_BYTES:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
+# =============================================================================
+# CACHE BERTAHAP (UNTUK DATA YANG DIBACA SECARA STREAMING)
+# =============================================================================
+_NO_ITEM = object()
+
+
+def iter_cached_items(endpoint, params):
+    """
+    Mengembalikan generator item payload dari cache disk yang dibaca bertahap
+    (tanpa memuat seluruh payload ke memori), atau None jika tidak ada/kedaluwarsa.
+    """
+    path = _path_for(make_cache_key(endpoint, params))
+    try:
+        f = gzip.open(path, 'rt', encoding='utf-8')
+    except OSError:
+        return None
+
+    # "expires_at" selalu ditulis sebelum "payload", jadi sudah terbaca
+    # ketika item pertama tersedia
+    meta = {}
+    items = iter_json_array(iter(lambda: f.read(1 << 16), ""), ("payload",), meta)
+    try:
+        first = next(items, _NO_ITEM)
+    except (OSError, ValueError, EOFError):
+        f.close()
+        return None
+
+    expires_at = meta.get("expires_at")
+    if expires_at is not None and time.time() > expires_at:
+        f.close()
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+    def generate():
+        try:
+            if first is not _NO_ITEM:
+                yield first
+            yield from items
+        finally:
+            f.close()
+    return generate()
+
+
+class ItemWriter:
+    """
+    Menulis payload berupa list ke cache disk item demi item, dengan format
+    yang sama seperti put(). File baru terlihat setelah commit().
+    """
+
+    def __init__(self, endpoint, params):
+        ttl = ttl_for(params)
+        header = {
+            "endpoint": endpoint,
+            "params": {k: v for k, v in (params or {}).items() if k not in _IGNORED_PARAMS},
+            "created_at": time.time(),
+            "expires_at": (time.time() + ttl) if ttl is not None else None,
+        }
+        self._path = _path_for(make_cache_key(endpoint, params))
+        self._tmp_path = f"{self._path}.{threading.get_ident()}.tmp"
+        self._count = 0
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            self._file = gzip.open(self._tmp_path, 'wt', encoding='utf-8')
+            self._file.write(json.dumps(header, ensure_ascii=False)[:-1] + ', "payload": [')
+        except OSError:
+            self._file = None
+
+    def write(self, item):
+        if self._file is None:
+            return
+        try:
+            if self._count:
+                self._file.write(",")
+            self._file.write(json.dumps(item, ensure_ascii=False))
+            self._count += 1
+        except OSError:
+            self.abort()
+
+    def commit(self):
+        if self._file is None:
+            return
+        try:
+            self._file.write("]}")
+            self._file.close()
+            self._file = None
+            os.replace(self._tmp_path, self._path)
+        except OSError:
+            self.abort()
+            return
+        _evict()
+
+    def abort(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+        try:
+            os.remove(self._tmp_path)
+        except OSError:
+            pass
@@ -0,0 +1,77 @@
+# utils/vehicle_types.py
+
+import re
+import numpy as np
+import pandas as pd
+
+# =============================================================================
+# KLASIFIKASI TAG KENDARAAN (DRY/FROZEN x TIPE)
+# =============================================================================
+
+# Urutan kategori di tabel pemakaian; tag yang memuat keduanya dihitung DRY
+CATEGORIES = ("DRY", "FROZEN")
+
+
+class VehicleTypeClassifier:
+    """
+    Mengelompokkan tag kendaraan (mis. "CDD-LONG DRY") ke kategori DRY/FROZEN
+    dan tipe dari constant.json "vehicle_types", satu pass regex per kolom.
+
+    Tag lebih dulu disubstitusi lewat type_map (kunci harus sama persis).
+    Bila beberapa tipe muncul di tag, tipe terpanjang yang menang (CDD-LONG
+    sebelum CDD); panjang sama mengikuti urutan vehicle_types.
+    """
+
+    def __init__(self, vehicle_types, type_map=None):
+        self.vehicle_types = list(vehicle_types)
+        self.type_map = dict(type_map or {})
+        self._by_priority = sorted(self.vehicle_types, key=len, reverse=True)
+        # Satu lookahead per tipe dari posisi awal: alternatif pertama yang cocok
+        # di mana pun dalam tag = tipe dengan prioritas tertinggi
+        lookaheads = "|".join(f"(?=.*?({re.escape(v_type)}))" for v_type in self._by_priority)
+        self._pattern = re.compile(f"^(?:{lookaheads})", re.DOTALL) if self._by_priority else None
+
+    def classify(self, tags, upper=False):
+        """
+        DataFrame per tag: "Tag" (setelah substitusi type_map, huruf besar bila
+        upper=True), "Kategori" (DRY/FROZEN/None) dan "Tipe" (None bila tidak ada).
+        """
+        tags = pd.Series(tags, dtype=object)
+        substituted = tags.map(lambda tag: self.type_map.get(tag, tag) if pd.notna(tag) else tag)
+        text = substituted.astype('string')
+        if upper:
+            text = text.str.upper()
+
+        is_dry = text.str.contains("DRY", regex=False).fillna(False).to_numpy(dtype=bool)
+        is_frozen = text.str.contains("FROZEN", regex=False).fillna(False).to_numpy(dtype=bool)
+        category = np.select([is_dry, is_frozen], list(CATEGORIES), default=None)
+
+        if self._pattern is not None and len(text):
+            v_type = text.str.extract(self._pattern).bfill(axis=1).iloc[:, 0].astype(object)
+        else:
+            v_type = pd.Series(np.nan, index=text.index, dtype=object)
+        return pd.DataFrame({
+            "Tag": text.astype(object),
+            "Kategori": category,
+            "Tipe": v_type.where(v_type.notna(), None),
+        })
+
+    def usage_counts(self, tags, upper=False):
+        """{tipe: {"DRY": n, "FROZEN": n}} untuk semua vehicle_types (urutan constant.json)."""
+        classified = self.classify(tags, upper=upper).dropna(subset=["Kategori", "Tipe"])
+        counts = classified.groupby(["Tipe", "Kategori"]).size()
+        return {
+            v_type: {category: int(counts.get((v_type, category), 0)) for category in CATEGORIES}
+            for v_type in self.vehicle_types
+        }
+
+    def usage_table(self, tags, upper=False):
+        """Tabel sheet "Truck Usage": jumlah 0 ditulis kosong (None)."""
+        return pd.DataFrame([
+            {
+                'Tipe Kendaraan': v_type,
+                'Jumlah (DRY)': counts['DRY'] if counts['DRY'] > 0 else None,
+                'Jumlah (FROZEN)': counts['FROZEN'] if counts['FROZEN'] > 0 else None,
+            }
+            for v_type, counts in self.usage_counts(tags, upper=upper).items()
+        ])